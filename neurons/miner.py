@@ -16,21 +16,52 @@
 # DEALINGS IN THE SOFTWARE.
 
 import time
+
+# Start of the imports, for the startup timeline.
+IMPORT_START = time.perf_counter()
+
 import typing
+import functools
 import bittensor as bt
+from bittensor.core.errors import PriorityException
+from starlette.types import Send
 
 # Bittensor Miner Quant:
 import quant
 
-# Import the subnet_query function from BitQuant client
-# from quant.BitQuant.subnet.subnet_methods import subnet_query
+# Non-blocking client for the Quant agent server
+from quant.miner import (
+    AgentClient,
+    AnswerCache,
+    PrewarmScheduler,
+    AdmissionController,
+    AdmissionRejected,
+)
 
 # import base miner class which takes care of most of the boilerplate
 from quant.base.miner import BaseMinerNeuron
+from quant.utils import metrics
+from quant.utils.startup import startup_profiler, write_startup_report
 
 # Import the shared Quant agent server module
 from neurons import quant_agent_server
 
+startup_profiler.record("imports", IMPORT_START)
+
+REQUESTS = metrics.counter(
+    "quant_miner_requests_total", "Requests answered by the miner, by protocol and outcome.", ("protocol", "outcome")
+)
+FORWARD_SECONDS = metrics.histogram(
+    "quant_miner_forward_seconds", "Duration of answering a request, by protocol.", ("protocol",)
+)
+BLACKLIST = metrics.counter(
+    "quant_miner_blacklist_total", "Blacklist decisions, by result.", ("result",)
+)
+PRIORITY = metrics.counter(
+    "quant_miner_priority_total", "Priority lookups, by how they were resolved.", ("lookup",)
+)
+
+
 class Miner(BaseMinerNeuron):
     """
     Your miner neuron class. You should use this class to define your miner's behavior. In particular, you should replace the forward function with your own logic. You may also want to override the blacklist and priority functions according to your needs.
@@ -40,17 +71,78 @@ class Miner(BaseMinerNeuron):
     This class provides reasonable default behavior for a miner such as blacklisting unrecognized hotkeys, prioritizing requests based on stake, and forwarding requests to the forward function. If you need to define custom
     """
 
-    def __init__(self, config=None):
+    def __init__(self, config=None, agent_urls=None, standby_urls=None):
+        """
+        Args:
+            config (bt.Config, optional): The miner config.
+            agent_urls (List[str], optional): The URLs of the agent server workers that were
+                started, see `quant_agent_server.pool_urls`. Defaults to the configured ports.
+            standby_urls (List[str], optional): The URLs of the warm standbys that were started.
+        """
         super(Miner, self).__init__(config=config)
 
+        # Pooled, non-blocking client for the Quant agent server.
+        if not agent_urls:
+            agent_urls = [
+                quant_agent_server.agent_server_url(port)
+                for port in quant_agent_server.worker_ports(
+                    self.config.agent.workers, self.config.agent.base_port
+                )
+            ]
+            standby_urls = [
+                quant_agent_server.agent_server_url(self.config.agent.base_port + self.config.agent.workers)
+            ] if self.config.agent.standby else None
+        self.agent_client = AgentClient.from_config(
+            self.config, default_url=agent_urls, standby_url=standby_urls or None
+        )
+        bt.logging.info(f"Agent client: {self.agent_client.pool}")
+
+        # Cache of agent answers, validators repeatedly ask the same questions.
+        self.answer_cache = None
+        if not self.config.cache.off:
+            # A request that is not admitted leaves the requests sharing its agent call to
+            # try on their own, with their own priority.
+            self.answer_cache = AnswerCache.from_config(self.config, caller_errors=(AdmissionRejected,))
+
+        # Bounds the agent work in flight, queueing requests by caller stake.
+        self.admission = AdmissionController.from_config(self.config)
+
+        # Report the admission queue at scrape time.
+        metrics.gauge(
+            "quant_miner_admission_active", "Requests currently running on the agent."
+        ).set_function(lambda: self.admission.active)
+        metrics.gauge(
+            "quant_miner_admission_waiting", "Requests waiting for an agent slot."
+        ).set_function(lambda: self.admission.waiting)
+
+        # Serve the streaming variant of the protocol next to QuantSynapse.
+        self.axon.attach(
+            forward_fn=self.forward_stream,
+            blacklist_fn=self.blacklist_stream,
+            priority_fn=self.priority_stream,
+        )
+
+        # Background pre-warming of answers to the public validator question bank.
+        self.prewarm = None
+        if self.config.prewarm.enable:
+            if self.answer_cache is None:
+                bt.logging.warning("Pre-warming requires the answer cache, ignoring --prewarm.enable.")
+            else:
+                self.prewarm = PrewarmScheduler.from_config(
+                    self.config,
+                    self.answer_cache,
+                    self.agent_client,
+                    is_busy=lambda: self.admission.active > 0,
+                )
+
         # TODO(developer): Anything specific to your use case you can do here
 
     async def forward(
         self, synapse: quant.protocol.QuantSynapse
     ) -> quant.protocol.QuantSynapse:
         """
-        Processes the incoming 'QuantSynapse' request by forwarding it to the BitQuant subnet
-        using the subnet_query function.
+        Processes the incoming 'QuantSynapse' request by forwarding it to the Quant agent
+        server through the non-blocking agent client.
 
         Args:
             synapse (quant.protocol.QuantSynapse): The synapse object containing the query.
@@ -58,10 +150,13 @@ class Miner(BaseMinerNeuron):
         Returns:
             quant.protocol.QuantSynapse: The synapse object with the response set.
         """
+        start_time = time.perf_counter()
+        outcome = "ok"
         try:
             # Check if query is properly set
             if not hasattr(synapse, 'query') or synapse.query is None:
                 bt.logging.warning("Received synapse with no query")
+                outcome = "invalid"
                 response = quant.protocol.QuantResponse(
                     response="Error: No query provided",
                     signature=b"error",
@@ -74,10 +169,20 @@ class Miner(BaseMinerNeuron):
                 bt.logging.info(f"Metadata: {synapse.query.metadata}")
                 
                 # TODO(developer): Developers deploying miner nodes can add their own custom mining logic here.
-                # Replace or extend this call to 'subnet_query' with your own implementation as needed.
-                response = subnet_query(synapse.query)
+                # Replace or extend this call to the agent client with your own implementation as needed.
+                fetch = functools.partial(
+                    self.query_agent,
+                    # The axon already counted this lookup in priority().
+                    priority=self._priority_of(synapse)[0],
+                    deadline=self.admission.deadline(synapse.timeout),
+                )
+                if self.answer_cache is not None:
+                    response = await self.answer_cache.get_or_fetch(synapse.query, fetch)
+                else:
+                    response = await fetch(synapse.query)
                 
                 if response is None:
+                    outcome = "error"
                     response = quant.protocol.QuantResponse(
                         response="Error: Failed to communicate with quant agent",
                         signature=b"error",
@@ -96,7 +201,16 @@ class Miner(BaseMinerNeuron):
                     }
                     synapse.response = response_dict
             return synapse
+        except AdmissionRejected as e:
+            outcome = "rejected"
+            # Shed load cheaply, the axon answers with 503 and this message.
+            bt.logging.debug(f"Rejecting request: {e}")
+            if synapse.axon is not None:
+                synapse.axon.status_code = 503
+                synapse.axon.status_message = str(e)
+            raise PriorityException(str(e), synapse=synapse)
         except Exception as e:
+            outcome = "error"
             bt.logging.error(f"Error in forward: {e}")
             # Provide a fallback response in case of error
             error_response = {
@@ -108,49 +222,202 @@ class Miner(BaseMinerNeuron):
             # Set the response as a dictionary
             synapse.response = error_response
             return synapse
+        finally:
+            REQUESTS.inc(protocol="synapse", outcome=outcome)
+            FORWARD_SECONDS.observe(time.perf_counter() - start_time, protocol="synapse")
+
+    def forward_stream(
+        self, synapse: quant.protocol.QuantStreamingSynapse
+    ) -> bt.StreamingSynapse.BTStreamingResponse:
+        """
+        Processes the incoming 'QuantStreamingSynapse' request by streaming the agent's
+        answer back as it is produced.
+
+        Args:
+            synapse (quant.protocol.QuantStreamingSynapse): The synapse object containing the query.
+
+        Returns:
+            bt.StreamingSynapse.BTStreamingResponse: The streaming response.
+        """
+        return synapse.create_streaming_response(
+            functools.partial(self._stream_answer, synapse)
+        )
+
+    async def _stream_answer(self, synapse: quant.protocol.QuantStreamingSynapse, send: Send):
+        """
+        Sends the answer to a streaming request as newline-delimited JSON events.
+
+        Cached answers are sent at once. Otherwise the agent is queried through the
+        admission controller and its output relayed chunk by chunk. The headers are
+        already sent at this point, so failures, including admission rejections, end
+        the stream with an error response instead of an HTTP error status.
+        """
+        async def emit(body: bytes):
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+
+        start_time = time.perf_counter()
+        outcome = "ok"
+        query = synapse.query
+        response = None
+        try:
+            if query is None:
+                bt.logging.warning("Received streaming synapse with no query")
+                response = quant.protocol.QuantResponse(
+                    response="Error: No query provided",
+                    signature=b"error",
+                    proofs=[b"error"],
+                    metadata={}
+                )
+            else:
+                bt.logging.info(f"Streaming query: {query.query}")
+                priority, _ = self._priority_of(synapse)
+                deadline = self.admission.deadline(synapse.timeout)
+                if self.answer_cache is not None:
+                    response, state = self.answer_cache.lookup(query)
+                    if state == "fresh":
+                        self.answer_cache.stats["hits"] += 1
+                    elif state == "stale":
+                        self.answer_cache.stats["stale_hits"] += 1
+                        self.answer_cache.refresh_in_background(
+                            query,
+                            functools.partial(self.query_agent, priority=priority, deadline=deadline),
+                        )
+                    else:
+                        self.answer_cache.stats["misses"] += 1
+
+                if response is not None:
+                    await emit(quant.protocol.encode_stream_chunk(response.response))
+                else:
+                    async with self.admission.slot(priority, deadline=deadline):
+                        async for item in self.agent_client.stream(query):
+                            if isinstance(item, str):
+                                await emit(quant.protocol.encode_stream_chunk(item))
+                            else:
+                                response = item
+                    if response is not None and self.answer_cache is not None:
+                        self.answer_cache.put(query, response)
+
+                if response is None:
+                    outcome = "error"
+                    response = quant.protocol.QuantResponse(
+                        response="Error: Failed to communicate with quant agent",
+                        signature=b"error",
+                        proofs=[b"error"],
+                        metadata=query.metadata or {}
+                    )
+        except Exception as e:
+            outcome = "rejected" if isinstance(e, AdmissionRejected) else "error"
+            bt.logging.error(f"Error in forward_stream: {e}")
+            response = quant.protocol.QuantResponse(
+                response=f"Error processing request: {str(e)}",
+                signature=b"error",
+                proofs=[b"error"],
+                metadata={}
+            )
+
+        response.metadata["miner_id"] = self.wallet.hotkey.ss58_address
+        await emit(quant.protocol.encode_stream_final(response))
+        REQUESTS.inc(protocol="stream", outcome=outcome)
+        FORWARD_SECONDS.observe(time.perf_counter() - start_time, protocol="stream")
+
+    async def query_agent(
+        self,
+        query: quant.protocol.QuantQuery,
+        priority: float = 0.0,
+        deadline: typing.Optional[float] = None,
+    ) -> typing.Optional[quant.protocol.QuantResponse]:
+        """
+        Queries the agent once admitted by the admission controller.
+
+        Args:
+            query (quant.protocol.QuantQuery): The query to answer.
+            priority (float): The caller's priority (stake).
+            deadline (float, optional): When to stop waiting for a slot, see `AdmissionController.deadline`.
+
+        Raises:
+            AdmissionRejected: If the miner is saturated.
+        """
+        async with self.admission.slot(priority, deadline=deadline):
+            return await self.agent_client.query(query)
+
+    def __enter__(self):
+        super().__enter__()
+        if self.prewarm is not None:
+            self.prewarm.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.prewarm is not None:
+            self.prewarm.stop()
+        super().__exit__(exc_type, exc_value, traceback)
 
     async def blacklist(
         self, synapse: quant.protocol.QuantSynapse
     ) -> typing.Tuple[bool, str]:
         """
         Determines whether an incoming request should be blacklisted and thus ignored.
+
+        Decisions for registered hotkeys are memoized on the hotkey index until the next
+        metagraph resync.
         """
         if synapse.dendrite is None or synapse.dendrite.hotkey is None:
             bt.logging.warning(
                 "Received a request without a dendrite or hotkey."
             )
+            BLACKLIST.inc(result="missing_hotkey")
             return True, "Missing dendrite or hotkey"
 
+        # Read the index once, a resync may swap it while we are deciding.
+        index = self.hotkey_index
+        hotkey = synapse.dendrite.hotkey
+        decision = index.blacklist.get(hotkey)
+        if decision is not None:
+            BLACKLIST.inc(result="blocked" if decision[0] else "allowed")
+            return decision
+
         # TODO(developer): Define how miners should blacklist requests.
-        uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)
-        if (
-            not self.config.blacklist.allow_non_registered
-            and synapse.dendrite.hotkey not in self.metagraph.hotkeys
-        ):
-            # Ignore requests from un-registered entities.
-            bt.logging.trace(
-                f"Blacklisting un-registered hotkey {synapse.dendrite.hotkey}"
-            )
-            return True, "Unrecognized hotkey"
+        uid = index.uid(hotkey)
+        if uid is None:
+            if not self.config.blacklist.allow_non_registered:
+                # Ignore requests from un-registered entities.
+                bt.logging.trace(
+                    f"Blacklisting un-registered hotkey {hotkey}"
+                )
+                BLACKLIST.inc(result="unregistered")
+                return True, "Unrecognized hotkey"
+            if self.config.blacklist.force_validator_permit:
+                # Un-registered entities cannot hold a validator permit.
+                BLACKLIST.inc(result="blocked")
+                return True, "Non-validator hotkey"
+            BLACKLIST.inc(result="allowed")
+            return False, "Hotkey allowed"
 
+        decision = (False, "Hotkey recognized!")
         if self.config.blacklist.force_validator_permit:
             # If the config is set to force validator permit, then we should only allow requests from validators.
-            if not self.metagraph.validator_permit[uid]:
+            if not index.has_validator_permit(uid):
                 bt.logging.warning(
-                    f"Blacklisting a request from non-validator hotkey {synapse.dendrite.hotkey}"
+                    f"Blacklisting a request from non-validator hotkey {hotkey}"
                 )
-                return True, "Non-validator hotkey"
+                decision = (True, "Non-validator hotkey")
 
-        bt.logging.trace(
-            f"Not Blacklisting recognized hotkey {synapse.dendrite.hotkey}"
-        )
-        return False, "Hotkey recognized!"
+        if not decision[0]:
+            bt.logging.trace(
+                f"Not Blacklisting recognized hotkey {hotkey}"
+            )
+        index.blacklist[hotkey] = decision
+        BLACKLIST.inc(result="blocked" if decision[0] else "allowed")
+        return decision
 
-    async def priority(
+    def _priority_of(
         self, synapse: quant.protocol.QuantSynapse
-    ) -> float:
+    ) -> typing.Tuple[float, typing.Optional[str]]:
         """
-        The priority function determines the order in which requests are handled.
+        Looks up the priority of the caller of a request, without counting the lookup.
+
+        Returns:
+            Tuple[float, str or None]: The priority and how it was resolved: "memoized",
+                "unregistered" or "computed", None if the request has no hotkey.
         """
         # Get the dendrite.hotkey from axon_info if it exists
         hotkey = None
@@ -158,51 +425,128 @@ class Miner(BaseMinerNeuron):
             hotkey = synapse.dendrite.hotkey
         elif hasattr(synapse, 'axon_info') and synapse.axon_info is not None:
             hotkey = synapse.axon_info.hotkey
-            
+
         if hotkey is None:
-            bt.logging.warning(
-                "Received a request without a dendrite or hotkey."
-            )
-            return 0.0
+            return 0.0, None
+
+        index = self.hotkey_index
+        priority = index.priority.get(hotkey)
+        if priority is not None:
+            return priority, "memoized"
 
         # TODO(developer): Define how miners should prioritize requests.
-        try:
-            caller_uid = self.metagraph.hotkeys.index(hotkey)
-            priority = float(self.metagraph.S[caller_uid])  # Return the stake as the priority.
-        except (ValueError, KeyError, IndexError) as e:
-            # If the hotkey is not in the metagraph or any other indexing error, return 0 priority
-            bt.logging.trace(f"Error getting priority for {hotkey}: {e}")
-            priority = 0.0
-            
+        uid = index.uid(hotkey)
+        if uid is None:
+            # Un-registered callers get the lowest priority.
+            return 0.0, "unregistered"
+        priority = index.stake_of(uid)  # Return the stake as the priority.
+        index.priority[hotkey] = priority
+
         bt.logging.trace(
             f"Prioritizing {hotkey} with value: {priority}"
         )
+        return priority, "computed"
+
+    async def priority(
+        self, synapse: quant.protocol.QuantSynapse
+    ) -> float:
+        """
+        The priority function determines the order in which requests are handled.
+        """
+        priority, lookup = self._priority_of(synapse)
+        if lookup is None:
+            bt.logging.warning(
+                "Received a request without a dendrite or hotkey."
+            )
+            return priority
+        PRIORITY.inc(lookup=lookup)
         return priority
 
+    async def blacklist_stream(
+        self, synapse: quant.protocol.QuantStreamingSynapse
+    ) -> typing.Tuple[bool, str]:
+        """Applies the blacklist to streaming requests."""
+        return await self.blacklist(synapse)
+
+    async def priority_stream(
+        self, synapse: quant.protocol.QuantStreamingSynapse
+    ) -> float:
+        """Applies the priority to streaming requests."""
+        return await self.priority(synapse)
+
 # This is the main function, which runs the miner.
 if __name__ == "__main__":
     try:
-        # Set up and start the Quant agent server using the shared module
-        quant_agent_server_process = quant_agent_server.setup_quant_agent_server()
-        
-        # Log whether we're using an existing server or started a new one
-        if quant_agent_server_process is None:
-            bt.logging.info("Using an existing Quant agent server or continuing without one.")
-        else:
-            bt.logging.info(f"Started a new Quant agent server with PID: {quant_agent_server_process.pid}")
+        with startup_profiler.phase("parse_args"):
+            config = Miner.config()
+
+        # Start the pool of Quant agent server workers using the shared module, unless the
+        # agent is reached through an explicit URL. The workers boot while the miner connects
+        # to the chain, and are waited for before the axon starts serving.
+        quant_agent_server_pool = {}
+        agent_urls, standby_urls = None, None
+        if not config.agent.url:
+            quant_agent_server.configure_agent_server_logs(
+                log_dir=config.agent.log_dir,
+                max_bytes=config.agent.log_max_bytes,
+                backup_count=config.agent.log_backups,
+                ready_pattern=config.agent.ready_pattern,
+            )
+            with startup_profiler.phase("agent_servers_spawn"):
+                quant_agent_server_pool = quant_agent_server.setup_quant_agent_pool(
+                    workers=config.agent.workers,
+                    base_port=config.agent.base_port,
+                    pin_cpus=config.agent.pin_cpus,
+                    wait=False,
+                    standby=1 if config.agent.standby else 0,
+                )
+            # Route to the ports the pool holds, not the ones another application took.
+            agent_urls, standby_urls = quant_agent_server.pool_urls(
+                quant_agent_server_pool, config.agent.workers, config.agent.base_port
+            )
+
+        with startup_profiler.phase("neuron"):
+            miner = Miner(config=config, agent_urls=agent_urls, standby_urls=standby_urls)
+        supervisor = None
+        if not config.agent.url:
+            # Restart crashed workers, the client routes around them (to the standby, if
+            # any) until they are back.
+            supervisor = quant_agent_server.AgentServerSupervisor(
+                quant_agent_server_pool,
+                cpus=quant_agent_server.pool_cpus(sorted(quant_agent_server_pool), config.agent.pin_cpus),
+                initial_backoff=config.agent.restart_backoff,
+                max_backoff=config.agent.max_restart_backoff,
+                crash_loop_restarts=config.agent.crash_loop_restarts,
+                crash_loop_window=config.agent.crash_loop_window,
+                on_exit=lambda port: miner.agent_client.pool.eject(quant_agent_server.agent_server_url(port)),
+                on_ready=lambda port: miner.agent_client.pool.reinstate(quant_agent_server.agent_server_url(port)),
+                max_rss_mb=config.agent.max_rss_mb,
+                max_cpu_percent=config.agent.max_cpu_percent,
+                max_fds=config.agent.max_fds,
+                cpu_window=config.agent.cpu_window,
+                drain_timeout=config.agent.drain_timeout,
+                outstanding=lambda port: miner.agent_client.pool.outstanding(quant_agent_server.agent_server_url(port)),
+            )
+            with startup_profiler.phase("agent_servers_ready"):
+                quant_agent_server_pool = quant_agent_server.wait_for_quant_agent_pool(
+                    quant_agent_server_pool, timeout=config.agent.ready_timeout
+                )
+            supervisor.start()
+
+        # Log whether we're using existing servers or started new ones
+        for port, process in quant_agent_server_pool.items():
+            if process is None:
+                bt.logging.info(f"Using an existing Quant agent server on port {port}.")
+            else:
+                bt.logging.info(f"Started a new Quant agent server on port {port} with PID: {process.pid}")
             
-        with Miner() as miner:
+        start = startup_profiler.clock()
+        with miner:
+            startup_profiler.record("start", start)
+            write_startup_report(miner.config)
             bt.logging.info("Starting miner...")
             while True:
                 bt.logging.info(f"Miner running... {time.time()}")
-                
-                # Check if Quant agent server is still running (only if we're managing it)
-                if quant_agent_server_process is not None and not quant_agent_server.check_quant_agent_server(quant_agent_server_process):
-                    bt.logging.error("Quant agent server is no longer running.")
-                    bt.logging.warning("Continuing miner operation, but queries may fail.")
-                    # Set to None so we don't keep checking
-                    quant_agent_server_process = None
-                
                 time.sleep(5)
     except KeyboardInterrupt:
         bt.logging.info("Keyboard interrupt received. Exiting miner.")
@@ -20,18 +20,205 @@ import sys
 import time
 import signal
 import socket
+import logging
+import threading
 import subprocess
 import atexit
+import re
+import random
 import requests
 import bittensor as bt
 import traceback
 
-# Global variable to store the Quant agent server process
-quant_agent_process = None
+from collections import deque, namedtuple
+from logging.handlers import RotatingFileHandler
+from typing import Callable, Dict, Optional
 
-# Default Flask server port
+from quant.utils import metrics
+
+WORKER_STARTS = metrics.counter(
+    "quant_agent_server_starts_total", "Quant agent server processes started by this process."
+)
+WORKER_EXITS = metrics.counter(
+    "quant_agent_server_exits_total", "Quant agent server processes that exited unexpectedly."
+)
+WORKERS = metrics.gauge(
+    "quant_agent_server_workers", "Quant agent server workers currently in the managed pool."
+)
+WORKER_RESTARTS = metrics.counter(
+    "quant_agent_server_restarts_total", "Crashed Quant agent server workers restarted by the supervisor."
+)
+WORKER_CRASH_LOOPS = metrics.counter(
+    "quant_agent_server_crash_loops_total", "Times a Quant agent server worker was detected crash-looping."
+)
+WORKER_RECYCLES = metrics.counter(
+    "quant_agent_server_recycles_total", "Quant agent server workers recycled by the watchdog, by reason.", ("reason",)
+)
+WORKER_RSS = metrics.gauge(
+    "quant_agent_server_rss_bytes", "Resident memory of a Quant agent server worker.", ("port",)
+)
+WORKER_CPU = metrics.gauge(
+    "quant_agent_server_cpu_seconds", "CPU time used by a Quant agent server worker process.", ("port",)
+)
+WORKER_CPU_PERCENT = metrics.gauge(
+    "quant_agent_server_cpu_percent", "CPU use of a Quant agent server worker over the last watchdog window.", ("port",)
+)
+WORKER_FDS = metrics.gauge(
+    "quant_agent_server_open_fds", "Open file descriptors of a Quant agent server worker.", ("port",)
+)
+
+# Resource use of a process: resident memory in bytes, user + system CPU seconds, open file descriptors
+ProcessStats = namedtuple("ProcessStats", ["rss_bytes", "cpu_seconds", "open_fds"])
+
+# The Quant agent server processes started by this process, by port
+quant_agent_processes: Dict[int, subprocess.Popen] = {}
+
+# Default Flask server port, workers of a pool use consecutive ports from here
 QUANT_AGENT_SERVER_PORT = 5000
 
+# Whether the cleanup and signal handlers are installed
+_handlers_installed = False
+
+# Set once the servers are being shut down, so crashed workers are no longer restarted
+_shutting_down = threading.Event()
+
+# The output pumps of the processes started by this process, by port
+quant_agent_pumps: Dict[int, "OutputPump"] = {}
+
+# Where and how the output of the Quant agent servers is logged, see configure_agent_server_logs
+agent_server_log_settings = {
+    "log_dir": os.path.expanduser("~/.bittensor/quant/agent_server_logs"),
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "tail_lines": 200,
+    "ready_pattern": None,
+}
+
+# How long a newly started Quant agent server may take to become ready, in seconds
+READY_TIMEOUT = 30.0
+
+class AgentServerPortError(RuntimeError):
+    """Raised when a Quant agent server worker listens on another port than the one it was given."""
+
+def configure_agent_server_logs(log_dir=None, max_bytes=None, backup_count=None, tail_lines=None, ready_pattern=None):
+    """
+    Configure where the output of Quant agent servers started afterwards is logged.
+
+    Args:
+        log_dir (str, optional): The directory of the log files.
+        max_bytes (int, optional): The size at which a log file is rotated.
+        backup_count (int, optional): The number of rotated log files to keep.
+        tail_lines (int, optional): The number of recent lines kept in memory for crash reports.
+        ready_pattern (str, optional): A regex matching the output line a server prints once
+            it accepts connections, used to detect readiness without waiting for the next probe.
+    """
+    for key, value in (
+        ("log_dir", log_dir),
+        ("max_bytes", max_bytes),
+        ("backup_count", backup_count),
+        ("tail_lines", tail_lines),
+        ("ready_pattern", ready_pattern),
+    ):
+        if value is not None:
+            agent_server_log_settings[key] = os.path.expanduser(value) if key == "log_dir" else value
+
+class OutputPump:
+    """
+    Drains the stdout and stderr of a Quant agent server.
+
+    A background thread per stream reads every line as soon as it is written, so the
+    server never blocks on a full pipe, and writes it to a size-rotated log file. The
+    most recent lines are also kept in memory to report why a server died.
+    """
+
+    def __init__(self, process, name, log_dir, max_bytes, backup_count, tail_lines=200, ready_pattern=None):
+        """
+        Args:
+            process (subprocess.Popen): The process, started with text-mode stdout and stderr pipes.
+            name (str): The name of the log file, without extension.
+            log_dir (str): The directory of the log file.
+            max_bytes (int): The size at which the log file is rotated.
+            backup_count (int): The number of rotated log files to keep.
+            tail_lines (int): The number of recent lines kept in memory.
+            ready_pattern (str, optional): A regex; `ready` is set when an output line matches it.
+        """
+        os.makedirs(log_dir, exist_ok=True)
+        self.path = os.path.join(log_dir, f"{name}.log")
+        self.lines = deque(maxlen=tail_lines)
+        self.ready_pattern = re.compile(ready_pattern) if ready_pattern else None
+        # Set on the readiness line, and when the output ends so waiters wake up on exit.
+        self.ready = threading.Event()
+        self.closed = threading.Event()
+        self._handler = RotatingFileHandler(
+            self.path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        self.threads = []
+        for stream_name, stream in (("stdout", process.stdout), ("stderr", process.stderr)):
+            if stream is None:
+                continue
+            logger = logging.getLogger(f"quant_agent_server.{name}.{stream_name}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            logger.handlers = [self._handler]
+            thread = threading.Thread(
+                target=self._pump,
+                args=(stream, stream_name, logger),
+                daemon=True,
+                name=f"{name}-{stream_name}",
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def _pump(self, stream, stream_name, logger):
+        try:
+            for line in iter(stream.readline, ""):
+                line = line.rstrip("\n")
+                self.lines.append(f"[{stream_name}] {line}")
+                logger.info(line)
+                if self.ready_pattern is not None and not self.ready.is_set() and self.ready_pattern.search(line):
+                    self.ready.set()
+        except (OSError, ValueError) as e:
+            # The pipe was closed under us, the process is gone.
+            logger.info(f"Stopped reading {stream_name}: {e}")
+        finally:
+            stream.close()
+            self.closed.set()
+
+    def tail(self, timeout=1.0):
+        """
+        Return the most recent output lines.
+
+        Args:
+            timeout (float): How long to wait for the readers to drain what is left in the pipes.
+
+        Returns:
+            str: The recent lines, oldest first.
+        """
+        deadline = time.time() + timeout
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.time()))
+        return "\n".join(self.lines)
+
+    def close(self):
+        """Wait for the readers to finish and close the log file."""
+        for thread in self.threads:
+            thread.join(1)
+        self._handler.close()
+
+def agent_server_output(port=QUANT_AGENT_SERVER_PORT):
+    """
+    Get the recent output of a Quant agent server started by this process.
+
+    Args:
+        port (int): The port of the server.
+
+    Returns:
+        str: The recent output lines, empty if the server was not started by this process.
+    """
+    pump = quant_agent_pumps.get(port)
+    return pump.tail() if pump is not None else ""
+
 def is_port_in_use(port):
     """
     Check if a port is already in use.
@@ -45,50 +232,273 @@ def is_port_in_use(port):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
 
-def is_quant_agent_server_running():
+def agent_server_url(port=QUANT_AGENT_SERVER_PORT):
+    """
+    Get the URL of the Quant agent server listening on a port.
+
+    Args:
+        port (int): The port of the server.
+
+    Returns:
+        str: The server URL.
+    """
+    return f"http://localhost:{port}"
+
+def worker_ports(workers, base_port=QUANT_AGENT_SERVER_PORT):
+    """
+    Get the ports of a pool of Quant agent server workers.
+
+    Args:
+        workers (int): The number of workers.
+        base_port (int): The port of the first worker.
+
+    Returns:
+        List[int]: One port per worker.
+    """
+    return [base_port + i for i in range(max(1, workers))]
+
+def pool_urls(pool, workers, base_port=QUANT_AGENT_SERVER_PORT):
+    """
+    Get the URLs of the workers and warm standbys of a pool that was set up.
+
+    Only the ports the pool actually holds are used, ports `setup_quant_agent_pool`
+    skipped because another application listens on them are left out.
+
+    Args:
+        pool (Dict[int, subprocess.Popen or None]): The pool returned by `setup_quant_agent_pool`.
+        workers (int): The number of workers the pool was set up with.
+        base_port (int): The port of the first worker.
+
+    Returns:
+        Tuple[List[str], List[str]]: The worker URLs and the standby URLs.
+    """
+    regular = set(worker_ports(workers, base_port))
+    urls = [agent_server_url(port) for port in sorted(pool) if port in regular]
+    standby_urls = [agent_server_url(port) for port in sorted(pool) if port not in regular]
+    if not urls:
+        # Only standbys came up, they are all there is to route to.
+        urls, standby_urls = standby_urls, []
+    return urls, standby_urls
+
+def worker_cpus(index, workers):
+    """
+    Get the CPUs a pool worker should be pinned to, splitting the available CPUs evenly.
+
+    Args:
+        index (int): The index of the worker in the pool.
+        workers (int): The number of workers in the pool.
+
+    Returns:
+        Set[int] or None: The CPUs of the worker, or None if affinity is not supported.
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    share = max(1, len(cpus) // max(1, workers))
+    start = (index * share) % len(cpus)
+    return set(cpus[start:start + share])
+
+def probe_quant_agent_server(port=QUANT_AGENT_SERVER_PORT, timeout=1.0):
+    """
+    Check once, without logging, whether the Quant agent server answers its health check.
+
+    Args:
+        port (int): The port of the server.
+        timeout (float): The timeout of the health request, in seconds.
+
+    Returns:
+        bool: True if the server answered as a Quant agent server.
+    """
+    try:
+        response = requests.get(f"{agent_server_url(port)}/health", timeout=timeout)
+        return response.status_code == 200 and response.json().get('service') == 'quant-agent-server'
+    except (requests.RequestException, ValueError, AttributeError):
+        return False
+
+def backoff_delays(initial=0.01, maximum=0.5, factor=2.0):
+    """
+    Yield exponentially growing delays, capped at `maximum`.
+
+    Args:
+        initial (float): The first delay, in seconds.
+        maximum (float): The largest delay, in seconds.
+        factor (float): The growth factor between two delays.
+    """
+    delay = initial
+    while True:
+        yield delay
+        delay = min(maximum, delay * factor)
+
+def read_process_stats(pid):
+    """
+    Read the resource use of a process from /proc.
+
+    Args:
+        pid (int): The process id.
+
+    Returns:
+        ProcessStats or None: The resource use, or None if /proc is unavailable (e.g. on
+            macOS) or the process is gone.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces, the fields after it are fixed.
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        open_fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except (OSError, IndexError, ValueError):
+        return None
+    # utime and stime are fields 14 and 15 of stat, the list starts at field 3
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    return ProcessStats(resident_pages * os.sysconf("SC_PAGE_SIZE"), cpu_seconds, open_fds)
+
+def _child_pids(pid):
+    """Get the descendants of a process from /proc, empty where the kernel does not list children."""
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children += [int(child) for child in f.read().split()]
+    except (OSError, ValueError):
+        return children
+    return children + [grandchild for child in children for grandchild in _child_pids(child)]
+
+def listening_ports(pid):
+    """
+    Get the TCP ports a process and its descendants listen on, from /proc.
+
+    Args:
+        pid (int): The process id.
+
+    Returns:
+        Set[int] or None: The ports, or None if /proc is unavailable (e.g. on macOS) or the
+            process is gone.
+    """
+    inodes = set()
+    try:
+        for process_id in [pid] + _child_pids(pid):
+            for fd in os.listdir(f"/proc/{process_id}/fd"):
+                try:
+                    target = os.readlink(f"/proc/{process_id}/fd/{fd}")
+                except OSError:
+                    continue
+                if target.startswith("socket:["):
+                    inodes.add(target[len("socket:["):-1])
+    except OSError:
+        return None
+
+    ports = set()
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as f:
+                lines = f.readlines()[1:]
+        except OSError:
+            continue
+        for line in lines:
+            # sl, local_address, rem_address, st (0A is LISTEN), ..., inode is the 10th field
+            fields = line.split()
+            if len(fields) > 9 and fields[3] == "0A" and fields[9] in inodes:
+                ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+    return ports
+
+def listens_on_own_port(process, port):
+    """
+    Check that the Quant agent server answering on a port is the worker started for it.
+
+    Workers are told their port through $PORT. A BitQuant server that ignores it binds its
+    default port instead, where another worker may answer in its place.
+
+    Args:
+        process (subprocess.Popen): The worker started for the port.
+        port (int): The port of the worker.
+
+    Returns:
+        bool: True if the worker listens on the port, or if this cannot be checked without
+            /proc. False if it does not listen on any port yet.
+
+    Raises:
+        AgentServerPortError: If the worker listens on other ports only.
+    """
+    ports = listening_ports(process.pid)
+    if ports is None or port in ports:
+        return True
+    if ports:
+        raise AgentServerPortError(
+            f"The Quant agent server started for port {port} (PID {process.pid}) listens on port(s) "
+            f"{', '.join(map(str, sorted(ports)))} instead. The BitQuant server must bind to the port "
+            f"given in $PORT; run a single worker (--agent.workers 1 --agent.base_port <its port>) otherwise."
+        )
+    return False
+
+def pool_cpus(ports, pin_cpus=False):
+    """
+    Get the CPUs to pin the workers of a pool to.
+
+    Args:
+        ports (List[int]): The ports of the workers.
+        pin_cpus (bool): Whether the workers are pinned at all.
+
+    Returns:
+        Dict[int, Set[int] or None]: The CPUs of each worker by port, None for unpinned workers.
+    """
+    return {
+        port: worker_cpus(index, len(ports)) if pin_cpus else None
+        for index, port in enumerate(ports)
+    }
+
+def is_quant_agent_server_running(port=QUANT_AGENT_SERVER_PORT):
     """
     Check if the Quant agent server is already running.
     
+    Args:
+        port (int): The port of the server.
+
     Returns:
         bool: True if the server is running, False otherwise.
     """
     # First check if the port is in use
-    if not is_port_in_use(QUANT_AGENT_SERVER_PORT):
+    if not is_port_in_use(port):
         return False
     
     # Then try to make a request to the server's health endpoint
     try:
-        response = requests.get(f"http://localhost:{QUANT_AGENT_SERVER_PORT}/health", timeout=2)
+        response = requests.get(f"{agent_server_url(port)}/health", timeout=2)
         # If we get a successful response with the expected content, it's our server
         if response.status_code == 200:
             try:
                 data = response.json()
                 if data.get('service') == 'quant-agent-server':
-                    bt.logging.info("Found existing Quant agent server running.")
+                    bt.logging.info(f"Found existing Quant agent server running on port {port}.")
                     return True
             except ValueError:
                 pass  # Not JSON or not our expected format
         
         # Port is in use but not by our server, or server gave unexpected response
-        bt.logging.warning(f"Port {QUANT_AGENT_SERVER_PORT} is in use, but it doesn't appear to be our Quant agent server.")
+        bt.logging.warning(f"Port {port} is in use, but it doesn't appear to be our Quant agent server.")
         bt.logging.warning("Another service (possibly AirPlay Receiver on macOS) may be using this port.")
         return False
     except requests.RequestException:
         # If we can connect to the port but can't get a response from the server,
         # something else might be using the port.
-        bt.logging.warning(f"Port {QUANT_AGENT_SERVER_PORT} is in use, but it might not be the Quant agent server.")
+        bt.logging.warning(f"Port {port} is in use, but it might not be the Quant agent server.")
         bt.logging.warning("Another service may be using this port.")
         return False
 
-def start_quant_agent_server():
+def start_quant_agent_server(port=QUANT_AGENT_SERVER_PORT, cpus=None):
     """
     Start the Quant agent server as a subprocess.
+
+    BitQuant's main.py takes the port to listen on from $PORT. Whether it did is checked
+    once the server answers, see `listens_on_own_port`.
     
+    Args:
+        port (int): The port the server listens on, passed to it as $PORT.
+        cpus (Set[int], optional): The CPUs to pin the server to.
+
     Returns:
         subprocess.Popen: The process object for the Quant agent server.
     """
-    global quant_agent_process
-    
     # Get the directory of the current script
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
@@ -97,50 +507,77 @@ def start_quant_agent_server():
     # BitQuant directory (to be used as working directory)
     quant_agent_dir = os.path.join(base_dir, "quant", "BitQuant")
     
-    bt.logging.info(f"Starting Quant agent server from: {quant_agent_script}")
+    bt.logging.info(f"Starting Quant agent server from: {quant_agent_script} on port {port}")
     bt.logging.info(f"Using working directory: {quant_agent_dir}")
+
+    env = dict(os.environ, PORT=str(port))
+    preexec_fn = None
+    if cpus:
+        bt.logging.info(f"Pinning Quant agent server on port {port} to CPUs {sorted(cpus)}")
+        preexec_fn = lambda: os.sched_setaffinity(0, cpus)
     
     # Start the Quant agent server as a subprocess
-    quant_agent_process = subprocess.Popen(
+    process = subprocess.Popen(
         [sys.executable, quant_agent_script],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
+        errors="replace",
         bufsize=1,
-        cwd=quant_agent_dir  # Set the working directory to the BitQuant directory
+        cwd=quant_agent_dir,  # Set the working directory to the BitQuant directory
+        env=env,
+        preexec_fn=preexec_fn,
     )
+    quant_agent_processes[port] = process
+
+    # Drain the pipes continuously, a full pipe would block the server on its next write.
+    previous = quant_agent_pumps.pop(port, None)
+    if previous is not None:
+        previous.close()
+    settings = agent_server_log_settings
+    quant_agent_pumps[port] = OutputPump(
+        process,
+        f"agent_server_{port}",
+        settings["log_dir"],
+        settings["max_bytes"],
+        settings["backup_count"],
+        settings["tail_lines"],
+        settings["ready_pattern"],
+    )
+    bt.logging.info(f"Quant agent server output is logged to {quant_agent_pumps[port].path}")
+    WORKER_STARTS.inc()
     
-    bt.logging.info(f"Quant agent server started with PID: {quant_agent_process.pid}")
-    
-    # Give the server a moment to start up
-    time.sleep(2)
+    bt.logging.info(f"Quant agent server started with PID: {process.pid}")
     
-    return quant_agent_process
+    return process
 
 def cleanup_quant_agent_server():
     """
-    Clean up the Quant agent server process by terminating it gracefully.
-    If it doesn't respond to SIGTERM, force kill it.
+    Clean up the Quant agent server processes by terminating them gracefully.
+    If they don't respond to SIGTERM, force kill them.
     """
-    global quant_agent_process
-    
-    if quant_agent_process:
-        bt.logging.info(f"Stopping Quant agent server (PID: {quant_agent_process.pid})")
-        
-        # Try to terminate gracefully
-        if quant_agent_process.poll() is None:  # If process is still running
+    _shutting_down.set()
+    # Signal every worker first so they shut down in parallel
+    for port, process in quant_agent_processes.items():
+        if process.poll() is None:  # If process is still running
+            bt.logging.info(f"Stopping Quant agent server on port {port} (PID: {process.pid})")
             # Send SIGTERM
-            quant_agent_process.terminate()
-            
-            # Wait for a bit to allow for graceful shutdown
-            try:
-                quant_agent_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                # If it doesn't shut down within timeout, force kill
-                bt.logging.warning("Quant agent server did not terminate gracefully, forcing shutdown")
-                quant_agent_process.kill()
-        
-        bt.logging.info("Quant agent server stopped")
+            process.terminate()
+
+    deadline = time.time() + 5
+    for port, process in list(quant_agent_processes.items()):
+        # Wait for a bit to allow for graceful shutdown
+        try:
+            process.wait(timeout=max(0.0, deadline - time.time()))
+        except subprocess.TimeoutExpired:
+            # If it doesn't shut down within timeout, force kill
+            bt.logging.warning(f"Quant agent server on port {port} did not terminate gracefully, forcing shutdown")
+            process.kill()
+        quant_agent_processes.pop(port, None)
+        pump = quant_agent_pumps.pop(port, None)
+        if pump is not None:
+            pump.close()
+        bt.logging.info(f"Quant agent server on port {port} stopped")
 
 def signal_handler(sig, frame):
     """
@@ -154,76 +591,140 @@ def signal_handler(sig, frame):
     cleanup_quant_agent_server()
     sys.exit(0)
 
-def get_quant_agent_server():
+def wait_for_quant_agent_server(process, port=QUANT_AGENT_SERVER_PORT, timeout=READY_TIMEOUT):
+    """
+    Wait for a newly started Quant agent server to accept connections.
+
+    The health check is probed with exponential backoff starting at a few milliseconds, so
+    a fast server is picked up almost as soon as it listens. If a readiness line is
+    configured, the wait also ends early as soon as the server prints it.
+
+    Args:
+        process (subprocess.Popen): The server process.
+        port (int): The port of the server.
+        timeout (float): The maximum time to wait, in seconds.
+
+    Returns:
+        bool: True if the server is ready, False if it exited or did not become healthy.
+
+    Raises:
+        AgentServerPortError: If the server listens on another port. It is terminated first.
+    """
+    start_time = time.monotonic()
+    deadline = start_time + timeout
+    pump = quant_agent_pumps.get(port)
+    delays = backoff_delays()
+    probes = 0
+    while True:
+        # Check if the server is still starting
+        if process.poll() is not None:
+            bt.logging.error(f"Quant agent server on port {port} failed to start! Exit code: {process.returncode}")
+            bt.logging.error(f"Recent output:\n{agent_server_output(port)}")
+            return False
+
+        probes += 1
+        if probe_quant_agent_server(port) and _listens_or_terminate(process, port):
+            bt.logging.info(
+                f"Quant agent server on port {port} is now running and accepting connections "
+                f"({time.monotonic() - start_time:.2f}s, {probes} probes)."
+            )
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        delay = min(next(delays), remaining)
+        if pump is not None and pump.ready_pattern is not None and not pump.ready.is_set():
+            # Wake up as soon as the readiness line is printed
+            pump.ready.wait(delay)
+        elif pump is not None:
+            # Wake up as soon as the output ends, the process is exiting
+            pump.closed.wait(delay)
+        else:
+            time.sleep(delay)
+
+    bt.logging.warning(f"Quant agent server on port {port} started but health check is not responding after {timeout:.0f}s.")
+    bt.logging.warning("Continuing anyway, but the server may not be fully functional.")
+    return False
+
+def _listens_or_terminate(process, port):
+    try:
+        return listens_on_own_port(process, port)
+    except AgentServerPortError as e:
+        bt.logging.error(str(e))
+        process.terminate()
+        raise
+
+def get_quant_agent_server(port=QUANT_AGENT_SERVER_PORT, cpus=None, wait=True):
     """
     Get a Quant agent server process - either use an existing one or start a new one.
     
+    Args:
+        port (int): The port of the server.
+        cpus (Set[int], optional): The CPUs to pin a newly started server to.
+        wait (bool): Wait for a newly started server to become ready.
+
     Returns:
         subprocess.Popen or None: The process object for the Quant agent server if newly started,
                                   or None if using an existing server.
     """
-    global quant_agent_process
-    
     # Check if a server is already running
-    if is_quant_agent_server_running():
-        bt.logging.info("Quant agent server is already running. Using the existing server.")
+    if is_quant_agent_server_running(port):
+        bt.logging.info(f"Quant agent server is already running on port {port}. Using the existing server.")
         return None
     
     # Check if port is in use by something else before trying to start our server
-    if is_port_in_use(QUANT_AGENT_SERVER_PORT):
-        bt.logging.error(f"Port {QUANT_AGENT_SERVER_PORT} is already in use by another application.")
+    if is_port_in_use(port):
+        bt.logging.error(f"Port {port} is already in use by another application.")
         bt.logging.error("Cannot start Quant agent server. Please free up the port and try again.")
         bt.logging.error("On macOS, try disabling the 'AirPlay Receiver' service from System Preferences -> General -> AirDrop & Handoff.")
-        raise RuntimeError(f"Port {QUANT_AGENT_SERVER_PORT} is already in use by another application.")
+        raise RuntimeError(f"Port {port} is already in use by another application.")
     
     # If no server is running and port is free, start a new one
     bt.logging.info("Starting a new Quant agent server...")
-    server_process = start_quant_agent_server()
-    
-    # Check if the server started successfully
-    if server_process.poll() is not None:
-        bt.logging.error(f"Quant agent server failed to start! Exit code: {server_process.returncode}")
-        stdout_output = server_process.stdout.read()
-        stderr_output = server_process.stderr.read()
-        bt.logging.error(f"STDOUT: {stdout_output}")
-        bt.logging.error(f"STDERR: {stderr_output}")
-        return None
-    
-    # Server started successfully, wait a bit more to ensure it's ready
-    server_running = False
-    for i in range(10):  # Try for longer (10 seconds)
-        if is_quant_agent_server_running():
-            bt.logging.info("Quant agent server is now running and accepting connections.")
-            server_running = True
-            break
-        bt.logging.info(f"Waiting for server to start... ({i+1}/10)")
-        time.sleep(1)
-    
-    if not server_running:
-        bt.logging.warning("Quant agent server started but health check is not responding.")
-        bt.logging.warning("Continuing anyway, but the server may not be fully functional.")
+    server_process = start_quant_agent_server(port, cpus)
+
+    if wait:
+        if not wait_for_quant_agent_server(server_process, port) and server_process.poll() is not None:
+            return None
     
     return server_process
 
-def setup_quant_agent_server():
+def install_handlers():
+    """Register the cleanup function and signal handlers, once per process."""
+    global _handlers_installed
+    if _handlers_installed:
+        return
+    _handlers_installed = True
+
+    # Register cleanup function to be called when program exits
+    atexit.register(cleanup_quant_agent_server)
+    
+    # Register signal handlers
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+def setup_quant_agent_server(port=QUANT_AGENT_SERVER_PORT, cpus=None):
     """
     Set up the Quant agent server, including signal handlers and cleanup.
     
+    Args:
+        port (int): The port of the server.
+        cpus (Set[int], optional): The CPUs to pin a newly started server to.
+
     Returns:
         subprocess.Popen or None: The process object for the Quant agent server,
                                   or None if using an existing server.
     """
-    # Register cleanup function to be called when program exits
-    atexit.register(cleanup_quant_agent_server)
-    
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    install_handlers()
     
     try:
         # Get or start the Quant agent server
-        quant_agent_server = get_quant_agent_server()
+        quant_agent_server = get_quant_agent_server(port, cpus)
         return quant_agent_server
+    except AgentServerPortError:
+        # A misconfigured server, not a busy port: continuing would hide it.
+        raise
     except RuntimeError as e:
         # Handle the case where the port is already in use
         bt.logging.error(f"Failed to set up Quant agent server: {e}")
@@ -237,28 +738,377 @@ def setup_quant_agent_server():
         bt.logging.info("Continuing without a Quant agent server. Some functionality may be limited.")
         return None
 
-def check_quant_agent_server(quant_agent_server):
+def setup_quant_agent_pool(workers=1, base_port=QUANT_AGENT_SERVER_PORT, pin_cpus=False, wait=True, standby=0):
+    """
+    Set up a pool of Quant agent server workers on consecutive ports.
+
+    The workers are started together and then waited for, so the pool is ready about
+    as fast as a single server. Ports where a Quant agent server is already running are
+    reused, ports taken by another application are skipped.
+
+    Args:
+        workers (int): The number of workers.
+        base_port (int): The port of the first worker.
+        pin_cpus (bool): Pin each worker to its own share of the available CPUs.
+        wait (bool): Wait for the workers to become ready. Otherwise return right after
+            starting them and call `wait_for_quant_agent_pool` later, e.g. once the neuron
+            is constructed, so both start up in parallel.
+        standby (int): The number of warm standby workers to start on the ports after the workers.
+
+    Returns:
+        Dict[int, subprocess.Popen or None]: The usable workers by port, with the process
+            object for newly started workers or None for existing servers.
+    """
+    install_handlers()
+
+    ports = worker_ports(workers + standby, base_port)
+    pool = {}
+    for port, cpus in pool_cpus(ports, pin_cpus).items():
+        try:
+            pool[port] = get_quant_agent_server(port, cpus, wait=False)
+        except RuntimeError as e:
+            bt.logging.error(f"Failed to set up Quant agent server worker: {e}")
+        except Exception as e:
+            bt.logging.error(f"Unexpected error setting up Quant agent server on port {port}: {e}")
+            bt.logging.debug(f"Stack trace: {traceback.format_exc()}")
+
+    if not wait:
+        return pool
+    return wait_for_quant_agent_pool(pool)
+
+def wait_for_quant_agent_pool(pool, timeout=READY_TIMEOUT):
+    """
+    Wait for the newly started workers of a pool to become ready.
+
+    Args:
+        pool (Dict[int, subprocess.Popen or None]): The pool returned by `setup_quant_agent_pool`.
+        timeout (float): The maximum time to wait for all workers, in seconds.
+
+    Returns:
+        Dict[int, subprocess.Popen or None]: The usable workers, without those that exited.
+
+    Raises:
+        AgentServerPortError: If a worker listens on another port than its own.
+    """
+    pool = dict(pool)
+    started = {port: process for port, process in pool.items() if process is not None}
+    deadline = time.monotonic() + timeout
+    # The workers boot in parallel, so waiting for them in turn costs the slowest one.
+    for port, process in started.items():
+        remaining = max(0.0, deadline - time.monotonic())
+        if not wait_for_quant_agent_server(process, port, timeout=remaining) and process.poll() is not None:
+            del pool[port]
+
+    WORKERS.set(len(pool))
+    if not pool:
+        bt.logging.info("Continuing without a Quant agent server. Some functionality may be limited.")
+    else:
+        bt.logging.info(f"Quant agent server pool ready on ports {sorted(pool)}")
+    return pool
+
+def check_quant_agent_pool(pool):
+    """
+    Check which workers of a Quant agent server pool are still running.
+
+    Args:
+        pool (Dict[int, subprocess.Popen or None]): The pool returned by `setup_quant_agent_pool`.
+
+    Returns:
+        Dict[int, subprocess.Popen or None]: The workers that are still running.
+    """
+    running = {
+        port: process
+        for port, process in pool.items()
+        # Only check the processes we started, existing servers are the client's concern.
+        if process is None or check_quant_agent_server(process, port)
+    }
+    WORKERS.set(len(running))
+    return running
+
+def check_quant_agent_server(quant_agent_server, port=QUANT_AGENT_SERVER_PORT):
     """
     Check if the Quant agent server is still running.
     
     Args:
         quant_agent_server (subprocess.Popen or None): The process object for the Quant agent server,
                                                      or None if using an existing server.
+        port (int): The port of the server.
         
     Returns:
         bool: True if the server is running, False if it has stopped.
     """
     # If we're using an existing server, just check if it's still running
     if quant_agent_server is None:
-        return is_quant_agent_server_running()
+        return is_quant_agent_server_running(port)
     
     # Otherwise, check the process we started
     if quant_agent_server.poll() is not None:
-        bt.logging.error(f"Quant agent server exited unexpectedly with code {quant_agent_server.returncode}")
-        stdout_output = quant_agent_server.stdout.read()
-        stderr_output = quant_agent_server.stderr.read()
-        bt.logging.error(f"STDOUT: {stdout_output}")
-        bt.logging.error(f"STDERR: {stderr_output}")
+        WORKER_EXITS.inc()
+        bt.logging.error(f"Quant agent server on port {port} exited unexpectedly with code {quant_agent_server.returncode}")
+        bt.logging.error(f"Recent output:\n{agent_server_output(port)}")
         return False
     
-    return True 
\ No newline at end of file
+    return True 
+
+class AgentServerSupervisor:
+    """
+    Restarts crashed Quant agent server workers and recycles unhealthy ones.
+
+    A background thread checks the workers of a pool every `interval` seconds. A worker
+    that exited is restarted after an exponential backoff with jitter, growing with the
+    number of crashes within `crash_loop_window` seconds. A worker crashing more than
+    `crash_loop_restarts` times within the window is crash-looping: it is only retried
+    every `max_backoff` seconds, so it does not burn CPU that the healthy workers need.
+
+    The watchdog samples the resident memory, CPU time and open file descriptors of every
+    worker from /proc. A worker above `max_rss_mb`, above `max_fds`, or using more than
+    `max_cpu_percent` of a core over `cpu_window` seconds is recycled: it is taken out of
+    rotation, given up to `drain_timeout` seconds to finish its requests, then stopped and
+    restarted right away. Only one worker is recycled at a time, so the others keep
+    serving.
+
+    The `on_exit` and `on_ready` callbacks receive the port of a worker when it exits or
+    starts draining, and once its restarted process answers its health check, so clients
+    can route around it, e.g. to a warm standby, and take it back. `outstanding` returns
+    the number of requests in flight on a worker and ends its drain early.
+
+    Workers that were already running when the pool was set up are not supervised.
+    """
+
+    def __init__(
+        self,
+        pool: Dict[int, Optional[subprocess.Popen]],
+        cpus: Optional[Dict[int, set]] = None,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        crash_loop_restarts: int = 5,
+        crash_loop_window: float = 300.0,
+        interval: float = 1.0,
+        on_exit: Optional[Callable[[int], None]] = None,
+        on_ready: Optional[Callable[[int], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_rss_mb: float = 0,
+        max_cpu_percent: float = 0,
+        max_fds: int = 0,
+        cpu_window: float = 60.0,
+        drain_timeout: float = 30.0,
+        outstanding: Optional[Callable[[int], int]] = None,
+        read_stats: Callable[[int], Optional[ProcessStats]] = read_process_stats,
+    ):
+        """
+        Args:
+            pool (Dict[int, subprocess.Popen or None]): The pool returned by `setup_quant_agent_pool`.
+            cpus (Dict[int, Set[int]], optional): The CPUs to pin each restarted worker to, by port.
+            initial_backoff (float): Seconds before the first restart of a worker.
+            max_backoff (float): Upper bound of the backoff, and the retry period of crash-looping workers.
+            crash_loop_restarts (int): Crashes within the window after which a worker is crash-looping.
+            crash_loop_window (float): Seconds over which crashes are counted.
+            interval (float): Seconds between two checks of the workers.
+            on_exit (Callable[[int], None], optional): Called with the port of a worker that exited or is draining.
+            on_ready (Callable[[int], None], optional): Called with the port of a restarted worker once it is ready.
+            clock (Callable[[], float]): Monotonic time source.
+            max_rss_mb (float): Recycle a worker above this resident memory in MiB, 0 to disable.
+            max_cpu_percent (float): Recycle a worker above this CPU use over `cpu_window`, 0 to disable.
+            max_fds (int): Recycle a worker above this number of open file descriptors, 0 to disable.
+            cpu_window (float): Seconds over which the CPU use is measured.
+            drain_timeout (float): Maximum seconds a recycled worker gets to finish its requests.
+            outstanding (Callable[[int], int], optional): Returns the requests in flight on a worker.
+            read_stats (Callable[[int], ProcessStats or None]): Reads the resource use of a pid.
+        """
+        self.processes = {port: process for port, process in pool.items() if process is not None}
+        self.external = [port for port, process in pool.items() if process is None]
+        self.cpus = cpus or {}
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.crash_loop_restarts = crash_loop_restarts
+        self.crash_loop_window = crash_loop_window
+        self.interval = interval
+        self.on_exit = on_exit
+        self.on_ready = on_ready
+        self.clock = clock
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu_percent = max_cpu_percent
+        self.max_fds = max_fds
+        self.cpu_window = cpu_window
+        self.drain_timeout = drain_timeout
+        self.outstanding = outstanding
+        self.read_stats = read_stats
+        self.crashes: Dict[int, deque] = {port: deque() for port in self.processes}
+        self.restart_at: Dict[int, float] = {}
+        self.booting = set()
+        # Recycling workers, by port: [phase, deadline] with phase "draining" or "stopping"
+        self.recycling: Dict[int, list] = {}
+        # CPU reference of each worker, by port: (time, cpu seconds)
+        self.cpu_reference: Dict[int, tuple] = {}
+        self.should_exit = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def backoff(self, port: int) -> float:
+        """
+        Return the delay before restarting a worker, given its recent crashes.
+
+        Args:
+            port (int): The port of the worker.
+
+        Returns:
+            float: The delay in seconds, with jitter.
+        """
+        crashes = len(self.crashes[port])
+        if crashes > self.crash_loop_restarts:
+            return self.max_backoff
+        delay = min(self.max_backoff, self.initial_backoff * 2 ** max(0, crashes - 1))
+        # Jitter so workers crashing together (e.g. on a shared dependency) restart apart.
+        return delay * random.uniform(0.5, 1.0)
+
+    def _exited(self, port: int, process: subprocess.Popen, now: float):
+        self.booting.discard(port)
+        self.cpu_reference.pop(port, None)
+        if self.recycling.pop(port, None) is not None:
+            # A planned stop, restart right away without counting a crash.
+            bt.logging.info(f"Recycled Quant agent server on port {port} stopped, restarting")
+            self.restart_at[port] = now
+            return
+        WORKER_EXITS.inc()
+        crashes = self.crashes[port]
+        crashes.append(now)
+        while crashes and crashes[0] < now - self.crash_loop_window:
+            crashes.popleft()
+        delay = self.backoff(port)
+        self.restart_at[port] = now + delay
+        bt.logging.error(
+            f"Quant agent server on port {port} exited with code {process.returncode}, "
+            f"restarting in {delay:.1f}s"
+        )
+        bt.logging.error(f"Recent output:\n{agent_server_output(port)}")
+        if len(crashes) == self.crash_loop_restarts + 1:
+            WORKER_CRASH_LOOPS.inc()
+            bt.logging.error(
+                f"Quant agent server on port {port} crashed {len(crashes)} times in "
+                f"{self.crash_loop_window:.0f}s, retrying only every {self.max_backoff:.0f}s"
+            )
+        if self.on_exit is not None:
+            self.on_exit(port)
+
+    def overloaded(self, port: int, process: subprocess.Popen, now: float) -> Optional[str]:
+        """
+        Sample the resource use of a worker and export it.
+
+        Args:
+            port (int): The port of the worker.
+            process (subprocess.Popen): The worker process.
+            now (float): The current time.
+
+        Returns:
+            str or None: The reason to recycle the worker ("rss", "cpu" or "fds"), or None.
+        """
+        stats = self.read_stats(process.pid)
+        if stats is None:
+            return None
+        WORKER_RSS.set(stats.rss_bytes, port=port)
+        WORKER_CPU.set(stats.cpu_seconds, port=port)
+        WORKER_FDS.set(stats.open_fds, port=port)
+
+        reason = None
+        if self.max_rss_mb and stats.rss_bytes > self.max_rss_mb * 1024 * 1024:
+            reason = "rss"
+        elif self.max_fds and stats.open_fds > self.max_fds:
+            reason = "fds"
+
+        cpu_percent = None
+        reference = self.cpu_reference.setdefault(port, (now, stats.cpu_seconds))
+        if now - reference[0] >= self.cpu_window:
+            cpu_percent = 100 * (stats.cpu_seconds - reference[1]) / (now - reference[0])
+            WORKER_CPU_PERCENT.set(cpu_percent, port=port)
+            self.cpu_reference[port] = (now, stats.cpu_seconds)
+            if reason is None and self.max_cpu_percent and cpu_percent > self.max_cpu_percent:
+                reason = "cpu"
+        if reason is not None:
+            usage = f"rss {stats.rss_bytes / 1024 / 1024:.0f} MiB, {stats.open_fds} fds"
+            if cpu_percent is not None:
+                usage += f", cpu {cpu_percent:.0f}% over {now - reference[0]:.0f}s"
+            bt.logging.warning(
+                f"Quant agent server on port {port} exceeds its {reason} limit ({usage}), recycling it"
+            )
+        return reason
+
+    def _recycle(self, port: int, process: subprocess.Popen, now: float):
+        """Advance the recycling of a worker: drain it, then stop it."""
+        phase, deadline = self.recycling[port]
+        if phase == "draining":
+            drained = self.outstanding is not None and self.outstanding(port) == 0
+            if drained or now >= deadline:
+                process.terminate()
+                self.recycling[port] = ["stopping", now + 10]
+        elif now >= deadline:
+            bt.logging.warning(f"Quant agent server on port {port} did not stop after recycling, killing it")
+            process.kill()
+
+    def check(self):
+        """Check every worker once: detect exits, recycle, restart when due and report readiness."""
+        if _shutting_down.is_set():
+            return
+        now = self.clock()
+        for port, process in list(self.processes.items()):
+            if port in self.restart_at:
+                if now < self.restart_at[port]:
+                    continue
+                del self.restart_at[port]
+                try:
+                    self.processes[port] = process = start_quant_agent_server(port, self.cpus.get(port))
+                except Exception as e:
+                    bt.logging.error(f"Failed to restart Quant agent server on port {port}: {e}")
+                    self.restart_at[port] = now + self.max_backoff
+                    continue
+                WORKER_RESTARTS.inc()
+                self.booting.add(port)
+            if process.poll() is not None:
+                self._exited(port, process, now)
+            elif port in self.recycling:
+                self._recycle(port, process, now)
+            elif port in self.booting:
+                try:
+                    ready = probe_quant_agent_server(port, timeout=0.5) and _listens_or_terminate(process, port)
+                except AgentServerPortError:
+                    # Terminated, restarted like a crash and eventually seen crash-looping.
+                    continue
+                if ready:
+                    self.booting.discard(port)
+                    bt.logging.info(f"Restarted Quant agent server on port {port} is ready")
+                    if self.on_ready is not None:
+                        self.on_ready(port)
+            else:
+                reason = self.overloaded(port, process, now)
+                # Recycle one worker at a time, and not while another one is (re)starting.
+                if reason is not None and not self.recycling and not self.booting and not self.restart_at:
+                    WORKER_RECYCLES.inc(reason=reason)
+                    self.recycling[port] = ["draining", now + self.drain_timeout]
+                    if self.on_exit is not None:
+                        self.on_exit(port)
+                    self._recycle(port, process, now)
+        WORKERS.set(
+            len(self.external) + len(self.processes)
+            - len(self.restart_at) - len(self.booting) - len(self.recycling)
+        )
+
+    def _run(self):
+        while not self.should_exit.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                bt.logging.error(f"Quant agent server supervisor check failed: {e}")
+                bt.logging.debug(f"Stack trace: {traceback.format_exc()}")
+
+    def start(self):
+        """Start supervising in a background thread."""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.should_exit.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="agent-supervisor")
+        self.thread.start()
+
+    def stop(self):
+        """Stop supervising. The workers keep running."""
+        self.should_exit.set()
+        if self.thread is not None:
+            self.thread.join(5)
+            self.thread = None
@@ -17,6 +17,10 @@
 
 
 import time
+
+# Start of the imports, for the startup timeline.
+IMPORT_START = time.perf_counter()
+
 import sys
 
 # Bittensor
@@ -27,10 +31,16 @@ from quant.base.validator import BaseValidatorNeuron
 
 # Bittensor Validator Quant:
 from quant.validator import forward
+from quant.validator.attestation.verifier import AttestationVerifier
+from quant.validator.attestation.periodic import PeriodicAttestationService
+from quant.validator.archive import ForwardArchive
+from quant.utils.startup import startup_profiler, write_startup_report
 
 # Import the shared Quant agent server module
 from neurons import quant_agent_server
 
+startup_profiler.record("imports", IMPORT_START)
+
 class Validator(BaseValidatorNeuron):
     """
     Your validator neuron class. You should use this class to define your validator's behavior. In particular, you should replace the forward function with your own logic.
@@ -44,10 +54,38 @@ class Validator(BaseValidatorNeuron):
         super(Validator, self).__init__(config=config)
 
         bt.logging.info("load_state()")
-        self.load_state()
+        with startup_profiler.phase("load_state"):
+            self.load_state()
+
+        # Hourly check of the attestation endpoint, started with the validator.
+        self.periodic_attestation = PeriodicAttestationService(
+            max_jitter=self.config.neuron.attestation_jitter
+        )
+
+        # Verifies the miners' TEE attestations, if required.
+        self.attestation_verifier = None
+        if self.config.neuron.attestation_port:
+            self.attestation_verifier = AttestationVerifier.from_config(self.config)
+
+        # Columnar record of the forward results, for analytics.
+        self.forward_archive = None
+        if not self.config.neuron.archive_off:
+            self.forward_archive = ForwardArchive.from_config(self.config)
 
         # TODO(developer): Anything specific to your use case you can do here
 
+    def __enter__(self):
+        self.periodic_attestation.start()
+        if self.forward_archive is not None:
+            self.forward_archive.start()
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.periodic_attestation.stop()
+        super().__exit__(exc_type, exc_value, traceback)
+        if self.forward_archive is not None:
+            self.forward_archive.stop()
+
     async def forward(self):
         """
         Validator forward pass. Consists of:
@@ -73,7 +111,15 @@ if __name__ == "__main__":
         else:
             bt.logging.info(f"Started a new Quant agent server with PID: {quant_agent_server_process.pid}")
             
-        with Validator() as validator:
+        with startup_profiler.phase("parse_args"):
+            config = Validator.config()
+        with startup_profiler.phase("neuron"):
+            validator = Validator(config=config)
+
+        start = startup_profiler.clock()
+        with validator:
+            startup_profiler.record("start", start)
+            write_startup_report(validator.config)
             while True:
                 bt.logging.info(f"Validator running... {time.time()}")
                 
@@ -37,5 +37,6 @@ __spec_version__ = 100000  # Match network requirement
 from . import protocol
 from . import base
 from . import validator
+from . import miner
 from . import api
 from .subnet_links import SUBNET_LINKS
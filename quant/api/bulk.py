@@ -0,0 +1,372 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Bulk query mode for the QuantAPI.
+
+Runs many queries through the network concurrently with per-axon concurrency limits,
+a global rate limit and retries, writing one JSONL result line per query as soon as it
+completes. Can be used as a library (`BulkQueryRunner`) or from the command line:
+
+    python -m quant.api.bulk --input questions.jsonl --output answers.jsonl \\
+        --wallet.name default --wallet.hotkey default --subtensor.network finney
+
+Each input line is a JSON object with a `query` and optional `userID` and `metadata`.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import traceback
+import bittensor as bt
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from quant.api.quantapi import QuantAPI
+
+# Status codes worth retrying: timeouts, throttling and transient server errors.
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+DEFAULT_USER_ID = "bulk"
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket rate limiter for asyncio code.
+
+    Allows up to `rate` acquisitions per second on average, with bursts of up to `burst`.
+    A non-positive rate disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and consume it."""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read query requests from a JSONL file.
+
+    Args:
+        path (str): The input file, or "-" for stdin.
+
+    Yields:
+        Dict[str, Any]: One request per non-empty line. Lines that are not valid JSON
+            objects are yielded as {"error": ...} so they show up in the output.
+    """
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"error": f"Invalid JSON on line {line_number}: {e}"}
+                continue
+            if not isinstance(request, dict) or not request.get("query"):
+                yield {"error": f"Line {line_number} has no query"}
+                continue
+            yield request
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def completed_indices(path: str) -> Set[int]:
+    """
+    Return the indices of the requests already written to an output file, to resume a run.
+
+    Lines that cannot be parsed, such as a last line cut off when the run was killed, are
+    ignored so their requests run again.
+
+    Args:
+        path (str): The JSONL output file of a previous run.
+
+    Returns:
+        Set[int]: The indices of the completed requests.
+    """
+    indices = set()
+    if not os.path.exists(path):
+        return indices
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and isinstance(record.get("index"), int):
+                indices.add(record["index"])
+    return indices
+
+
+def _terminate_last_line(path: str):
+    """Append a newline if the file ends with a partial line, so appended records start on their own line."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+class BulkQueryRunner:
+    """
+    Runs a stream of queries through a connected QuantAPI concurrently.
+
+    Memory stays bounded: requests are pulled lazily from the input, at most
+    `max_concurrency` queries are in flight, and each result is written out as soon as it
+    completes (results may therefore be out of input order; each carries its `index`).
+    """
+
+    def __init__(
+        self,
+        api: QuantAPI,
+        k: int = 3,
+        timeout: float = 12.0,
+        max_concurrency: int = 32,
+        per_axon_concurrency: int = 4,
+        rate_limit: float = 10.0,
+        max_retries: int = 2,
+        retry_backoff: float = 1.0,
+        order: str = "stake",
+    ):
+        """
+        Args:
+            api (QuantAPI): A connected QuantAPI instance.
+            k (int): The number of miners to query per request.
+            timeout (float): The per-axon query timeout in seconds.
+            max_concurrency (int): The maximum number of requests in flight.
+            per_axon_concurrency (int): The maximum number of concurrent calls to a single axon.
+            rate_limit (float): The maximum number of axon calls per second (0 disables the limit).
+            max_retries (int): How many times a failed axon call is retried.
+            retry_backoff (float): Base delay in seconds of the jittered exponential backoff.
+            order (str): The UID ranking used to pick miners (see `QuantAPI.get_uids`).
+        """
+        self.api = api
+        self.k = k
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.per_axon_concurrency = per_axon_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.order = order
+        self.rate_limiter = AsyncRateLimiter(rate_limit)
+        self._axon_semaphores = defaultdict(
+            lambda: asyncio.Semaphore(self.per_axon_concurrency)
+        )
+
+    async def _query_uid(self, uid: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Query a single miner, retrying transient failures."""
+        result = {"uid": uid, "attempts": 0}
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                delay = self.retry_backoff * (2 ** (attempt - 1))
+                await asyncio.sleep(delay * (0.5 + random.random()))
+            await self.rate_limiter.acquire()
+            result["attempts"] = attempt + 1
+            try:
+                async with self._axon_semaphores[uid]:
+                    _, synapses = await self.api.aquery(
+                        [uid],
+                        request["query"],
+                        request.get("userID", DEFAULT_USER_ID),
+                        request.get("metadata") or {},
+                        timeout=self.timeout,
+                        deserialize=False,
+                    )
+            except Exception as e:
+                result.update(status_code=None, status_message=str(e), response=None)
+                continue
+
+            if not synapses:
+                result.update(status_code=None, status_message="Invalid axon", response=None)
+                return result
+
+            synapse = synapses[0]
+            status_code = synapse.dendrite.status_code
+            response = synapse.deserialize()
+            result.update(
+                status_code=status_code,
+                status_message=synapse.dendrite.status_message,
+                process_time=synapse.dendrite.process_time,
+                response=getattr(response, "response", None),
+                metadata=getattr(response, "metadata", None),
+            )
+            if status_code not in RETRYABLE_STATUS_CODES:
+                return result
+        return result
+
+    async def run_one(self, index: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a single request against `k` miners.
+
+        Args:
+            index (int): The position of the request in the input.
+            request (Dict[str, Any]): The request with `query`, `userID` and `metadata`.
+
+        Returns:
+            Dict[str, Any]: The JSON-serializable result record.
+        """
+        record = {"index": index, "query": request.get("query"), "userID": request.get("userID")}
+        if "error" in request:
+            record["error"] = request["error"]
+            return record
+
+        start_time = time.time()
+        uids = self.api.get_uids(k=self.k, exclude=request.get("exclude"), order=self.order)
+        record["uids"] = uids
+        record["responses"] = await asyncio.gather(
+            *(self._query_uid(uid, request) for uid in uids)
+        )
+        record["elapsed"] = time.time() - start_time
+        return record
+
+    async def run(self, requests: Iterable[Dict[str, Any]], output_path: str, resume: bool = False) -> Dict[str, int]:
+        """
+        Run all requests and append one JSON line per result to `output_path`.
+
+        Args:
+            requests (Iterable[Dict[str, Any]]): The requests, consumed lazily.
+            output_path (str): The JSONL output file, or "-" for stdout.
+            resume (bool): Skip the requests whose result is already in `output_path`, e.g.
+                after an interrupted run over the same input.
+
+        Returns:
+            Dict[str, int]: Counts of completed, answered, failed and skipped requests.
+        """
+        queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        summary = {"completed": 0, "answered": 0, "failed": 0, "skipped": 0}
+        done = set()
+        if resume and output_path != "-":
+            done = completed_indices(output_path)
+            _terminate_last_line(output_path)
+        output = sys.stdout if output_path == "-" else open(output_path, "a", encoding="utf-8")
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    return
+                index, request = item
+                try:
+                    record = await self.run_one(index, request)
+                except Exception as e:
+                    bt.logging.error(f"Bulk request {index} failed: {e}")
+                    record = {"index": index, "query": request.get("query"), "error": str(e)}
+                answered = any(r.get("status_code") == 200 for r in record.get("responses", []))
+                summary["completed"] += 1
+                summary["answered" if answered else "failed"] += 1
+                output.write(json.dumps(record, default=str) + "\n")
+                output.flush()
+                queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        try:
+            for index, request in enumerate(requests):
+                if index in done:
+                    summary["skipped"] += 1
+                    continue
+                await queue.put((index, request))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            if output is not sys.stdout:
+                output.close()
+        return summary
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> "bt.config":
+    """Parse command line arguments for the bulk runner."""
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through the Quant subnet")
+    parser.add_argument("--input", type=str, required=True, help="Input JSONL file ('-' for stdin)")
+    parser.add_argument("--output", type=str, required=True, help="Output JSONL file ('-' for stdout)")
+    parser.add_argument("--netuid", type=int, default=QuantAPI.netuid, help="The netuid of the subnet to query")
+    parser.add_argument("--k", type=int, default=3, help="Number of miners to query per request")
+    parser.add_argument("--timeout", type=float, default=12.0, help="Per-axon query timeout in seconds")
+    parser.add_argument("--concurrency", type=int, default=32, help="Maximum requests in flight")
+    parser.add_argument("--per_axon_concurrency", type=int, default=4, help="Maximum concurrent calls per axon")
+    parser.add_argument("--rate_limit", type=float, default=10.0, help="Maximum axon calls per second (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per failed axon call")
+    parser.add_argument("--order", type=str, default="stake", help="UID ranking: stake, incentive, validator_trust or latency")
+    parser.add_argument("--resume", action="store_true", help="Skip the requests already in the output file")
+    bt.wallet.add_args(parser)
+    bt.subtensor.add_args(parser)
+    return bt.config(parser, args=argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    config = parse_arguments(argv)
+
+    api = QuantAPI(wallet=bt.wallet(config=config))
+    api.netuid = config.netuid
+    if not api.connect(bt.subtensor(config=config)):
+        sys.exit(1)
+
+    runner = BulkQueryRunner(
+        api,
+        k=config.k,
+        timeout=config.timeout,
+        max_concurrency=config.concurrency,
+        per_axon_concurrency=config.per_axon_concurrency,
+        rate_limit=config.rate_limit,
+        max_retries=config.retries,
+        order=config.order,
+    )
+    start_time = time.time()
+    try:
+        summary = asyncio.run(runner.run(read_jsonl(config.input), config.output, resume=config.resume))
+    except KeyboardInterrupt:
+        print("Interrupted, partial results were written to the output file")
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error running bulk queries: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+    print(f"Completed {summary['completed']} requests in {time.time() - start_time:.1f}s: {summary}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Request-coalescing HTTP gateway in front of the QuantAPI.
+
+Identical in-flight (query, userID) requests share a single network fan-out, recent
+answers are served from a TTL cache, and admission control rejects requests when too
+many fan-outs are queued. Run it with:
+
+    python -m quant.api.gateway --port 8000 --wallet.name default --wallet.hotkey default
+
+Endpoints: POST /query, GET /health, GET /stats, GET /metrics (Prometheus).
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import bittensor as bt
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from quant.api.quantapi import QuantAPI
+from quant.protocol import QuantResponse
+from quant.utils.metrics import MetricsRegistry
+
+# How a request was served.
+OUTCOMES = ("hit", "coalesced", "miss", "rejected", "error")
+
+
+class GatewayOverloaded(Exception):
+    """Raised when the gateway cannot admit another network fan-out."""
+
+
+def response_to_dict(response: Any) -> Optional[Dict[str, Any]]:
+    """Convert a deserialized miner response into a JSON-serializable dict."""
+    if isinstance(response, QuantResponse):
+        response = response.model_dump()
+    if not isinstance(response, dict) or not response.get("response"):
+        return None
+    signature = response.get("signature")
+    return {
+        "response": response.get("response"),
+        "signature": signature.hex() if isinstance(signature, bytes) else signature,
+        "metadata": response.get("metadata") or {},
+    }
+
+
+class QuantGateway:
+    """
+    Coalescing, caching front for `QuantAPI`.
+
+    All state is owned by a single event loop, so no locks are needed.
+    """
+
+    def __init__(
+        self,
+        api: QuantAPI,
+        k: int = 3,
+        timeout: float = 12.0,
+        cache_ttl: float = 30.0,
+        cache_size: int = 1024,
+        max_inflight: int = 64,
+        max_waiting: int = 256,
+    ):
+        """
+        Args:
+            api (QuantAPI): A connected QuantAPI instance.
+            k (int): The number of miners queried per fan-out.
+            timeout (float): The per-axon query timeout in seconds.
+            cache_ttl (float): How long an answer is served from cache, in seconds (0 disables caching).
+            cache_size (int): The maximum number of cached answers.
+            max_inflight (int): The maximum number of concurrent network fan-outs.
+            max_waiting (int): The maximum number of fan-outs queued behind `max_inflight`.
+        """
+        self.api = api
+        self.k = k
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.max_waiting = max_waiting
+        self._semaphore = asyncio.Semaphore(max_inflight)
+        self._waiting = 0
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.counters = {outcome: 0 for outcome in OUTCOMES}
+        # Each gateway owns its metrics, served on /metrics.
+        self.metrics = MetricsRegistry()
+        self.latency = self.metrics.histogram(
+            "quant_gateway_request_seconds", "Duration of gateway requests, by outcome.", ("outcome",)
+        )
+        self.fanout_latency = self.metrics.histogram(
+            "quant_gateway_fanout_seconds", "Duration of network fan-outs."
+        )
+        self.metrics.gauge("quant_gateway_inflight", "Fan-outs currently in flight.").set_function(
+            lambda: len(self._inflight)
+        )
+        self.metrics.gauge("quant_gateway_waiting", "Fan-outs waiting for admission.").set_function(
+            lambda: self._waiting
+        )
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[List[Dict]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, answers = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return answers
+
+    def _cache_put(self, key: Tuple[str, str], answers: List[Dict]):
+        if self.cache_ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, answers)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _fan_out(self, query: str, userID: str, metadata: dict) -> List[Dict]:
+        """Query the network once, respecting the admission limits."""
+        if self._semaphore.locked() and self._waiting >= self.max_waiting:
+            raise GatewayOverloaded("Too many queued requests")
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            start_time = time.monotonic()
+            uids = self.api.get_uids(k=self.k)
+            _, responses = await self.api.aquery(
+                uids, query, userID, metadata, timeout=self.timeout
+            )
+            self.fanout_latency.observe(time.monotonic() - start_time)
+        finally:
+            self._semaphore.release()
+        return [a for a in map(response_to_dict, responses) if a is not None]
+
+    async def answer(self, query: str, userID: str, metadata: Optional[dict] = None) -> Dict[str, Any]:
+        """
+        Answer a query from cache, by joining an identical in-flight request, or by
+        querying the network.
+
+        Args:
+            query (str): The query string.
+            userID (str): The user ID for the query.
+            metadata (dict, optional): Metadata forwarded to the miners on a cache miss.
+
+        Returns:
+            Dict[str, Any]: {"responses": [...], "outcome": "hit" | "coalesced" | "miss"}.
+
+        Raises:
+            GatewayOverloaded: If the request cannot be admitted.
+        """
+        start_time = time.monotonic()
+        key = (query, userID)
+        outcome = "hit"
+        try:
+            answers = self._cache_get(key)
+            if answers is None:
+                task = self._inflight.get(key)
+                if task is not None:
+                    outcome = "coalesced"
+                    answers = await asyncio.shield(task)
+                else:
+                    outcome = "miss"
+                    answers = await self._lead(key, query, userID, metadata or {})
+        except GatewayOverloaded:
+            outcome = "rejected"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            self.counters[outcome] += 1
+            self.latency.observe(time.monotonic() - start_time, outcome=outcome)
+        return {"responses": answers, "outcome": outcome}
+
+    async def _lead(self, key: Tuple[str, str], query: str, userID: str, metadata: dict) -> List[Dict]:
+        """
+        Start the fan-out for `key` and wait for it like its coalesced followers.
+
+        The fan-out runs as its own task, so cancelling the leader (e.g. its client went away)
+        does not cancel the followers: they still get the answers, which are also cached.
+        """
+        task = asyncio.ensure_future(self._run_fan_out(key, query, userID, metadata))
+        # Mark the exception as retrieved in case every waiter is gone when it fails.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _run_fan_out(self, key: Tuple[str, str], query: str, userID: str, metadata: dict) -> List[Dict]:
+        try:
+            answers = await self._fan_out(query, userID, metadata)
+            if answers:
+                self._cache_put(key, answers)
+            return answers
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters, hit rate and latency histograms."""
+        served = sum(self.counters[o] for o in ("hit", "coalesced", "miss"))
+        return {
+            "counters": dict(self.counters),
+            "hit_rate": self.counters["hit"] / served if served else 0.0,
+            "coalesce_rate": self.counters["coalesced"] / served if served else 0.0,
+            "inflight": len(self._inflight),
+            "waiting": self._waiting,
+            "cache_size": len(self._cache),
+            "latency": {o: self.latency.to_dict(outcome=o) for o in OUTCOMES},
+            "fanout_latency": self.fanout_latency.to_dict(),
+        }
+
+
+def create_app(gateway: QuantGateway):
+    """
+    Build the Starlette application serving the gateway.
+
+    Args:
+        gateway (QuantGateway): The gateway to expose.
+
+    Returns:
+        starlette.applications.Starlette: The ASGI application.
+    """
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, PlainTextResponse
+    from starlette.routing import Route
+
+    async def query(request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "Invalid JSON body"}, status_code=400)
+        if not isinstance(body, dict) or not body.get("query"):
+            return JSONResponse({"error": "Missing query"}, status_code=400)
+        try:
+            result = await gateway.answer(
+                body["query"], body.get("userID", ""), body.get("metadata") or {}
+            )
+        except GatewayOverloaded as e:
+            return JSONResponse({"error": str(e)}, status_code=503, headers={"Retry-After": "1"})
+        except Exception as e:
+            bt.logging.error(f"Gateway query failed: {e}")
+            return JSONResponse({"error": "Failed to query the network"}, status_code=502)
+        return JSONResponse(result)
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "service": "quant-gateway"})
+
+    async def stats(request):
+        return JSONResponse(gateway.stats())
+
+    async def metrics(request):
+        return PlainTextResponse(
+            gateway.metrics.render(), media_type="text/plain; version=0.0.4"
+        )
+
+    return Starlette(
+        routes=[
+            Route("/query", query, methods=["POST"]),
+            Route("/health", health, methods=["GET"]),
+            Route("/stats", stats, methods=["GET"]),
+            Route("/metrics", metrics, methods=["GET"]),
+        ]
+    )
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> "bt.config":
+    """Parse command line arguments for the gateway."""
+    parser = argparse.ArgumentParser(description="Request-coalescing HTTP gateway for the Quant subnet")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to bind the gateway to")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind the gateway to")
+    parser.add_argument("--netuid", type=int, default=QuantAPI.netuid, help="The netuid of the subnet to query")
+    parser.add_argument("--k", type=int, default=3, help="Number of miners to query per fan-out")
+    parser.add_argument("--timeout", type=float, default=12.0, help="Per-axon query timeout in seconds")
+    parser.add_argument("--cache_ttl", type=float, default=30.0, help="Answer cache TTL in seconds (0 disables)")
+    parser.add_argument("--cache_size", type=int, default=1024, help="Maximum number of cached answers")
+    parser.add_argument("--max_inflight", type=int, default=64, help="Maximum concurrent network fan-outs")
+    parser.add_argument("--max_waiting", type=int, default=256, help="Maximum fan-outs queued before rejecting")
+    bt.wallet.add_args(parser)
+    bt.subtensor.add_args(parser)
+    return bt.config(parser, args=argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    import uvicorn
+
+    config = parse_arguments(argv)
+    api = QuantAPI(wallet=bt.wallet(config=config))
+    api.netuid = config.netuid
+    if not api.connect(bt.subtensor(config=config)):
+        sys.exit(1)
+
+    gateway = QuantGateway(
+        api,
+        k=config.k,
+        timeout=config.timeout,
+        cache_ttl=config.cache_ttl,
+        cache_size=config.cache_size,
+        max_inflight=config.max_inflight,
+        max_waiting=config.max_waiting,
+    )
+    uvicorn.run(create_app(gateway), host=config.host, port=config.port)
+
+
+if __name__ == "__main__":
+    main()
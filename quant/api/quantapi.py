@@ -19,9 +19,11 @@
 import bittensor as bt
 import random
 import sys
+import time
 import traceback
-from typing import List, Optional, Union, Any, Dict
-from quant.protocol import QuantSynapse, QuantQuery, QuantResponse
+from typing import AsyncIterator, List, Optional, Union, Any, Dict
+from quant.protocol import QuantSynapse, QuantStreamingSynapse, QuantQuery, QuantResponse
+from quant.api.uid_index import UIDRankingIndex
 
 
 class QuantAPI:
@@ -43,6 +45,7 @@ class QuantAPI:
         self.subtensor = None
         self.metagraph = None
         self.dendrite = None
+        self.uid_index = UIDRankingIndex()
         
     def connect(self, subtensor: Optional["bt.subtensor"] = None):
         """
@@ -77,16 +80,14 @@ class QuantAPI:
                 raise ValueError("Failed to initialize metagraph")
                 
             print(f"Metagraph initialized with {len(self.metagraph.hotkeys)} hotkeys")
+            self.uid_index.rebuild(self.metagraph, self._is_axon_valid)
             
             # Initialize the dendrite with wallet
             print(f"Initializing dendrite with wallet {self.wallet}")
             self.dendrite = bt.dendrite(wallet=self.wallet)
             
-            # Count active axons
-            active_axons = sum(1 for axon in self.metagraph.axons if axon is not None and self._is_axon_valid(axon))
-            
             print(f"Connected to Bittensor network with netuid {self.netuid}")
-            print(f"Metagraph has {active_axons} active axons out of {len(self.metagraph.axons)} total")
+            print(f"Metagraph has {len(self.uid_index)} active axons out of {len(self.metagraph.axons)} total")
             
             return True
             
@@ -95,6 +96,17 @@ class QuantAPI:
             traceback.print_exc()
             return False
     
+    def sync_metagraph(self):
+        """
+        Resync the metagraph with the chain and rebuild the UID ranking index.
+        """
+        if self.metagraph is None or self.subtensor is None:
+            print("WARNING: Cannot sync metagraph before connecting")
+            return
+        self.metagraph.sync(subtensor=self.subtensor)
+        self.uid_index.rebuild(self.metagraph, self._is_axon_valid)
+        print(f"Metagraph synced, {len(self.uid_index)} active axons")
+
     def _is_axon_valid(self, axon):
         """Check if an axon has valid connection details."""
         if axon is None:
@@ -132,13 +144,18 @@ class QuantAPI:
         # Create and return a QuantSynapse with the query
         return QuantSynapse(query=quant_query)
 
-    def get_uids(self, k: int = 5, exclude: Optional[List[int]] = None) -> List[int]:
+    def get_uids(self, k: int = 5, exclude: Optional[List[int]] = None, order: str = "stake") -> List[int]:
         """
         Get a list of UIDs to query, prioritizing nodes with higher stakes.
+
+        UIDs are read from the precomputed ranking index, which is rebuilt on every
+        metagraph refresh, so a call only walks the first ``k`` ranked UIDs.
         
         Args:
             k (int): The number of UIDs to return.
             exclude (List[int], optional): UIDs to exclude from the result.
+            order (str): The ranking to use: "stake" (default), "incentive",
+                "validator_trust" or "latency".
             
         Returns:
             List[int]: A list of UIDs to query.
@@ -146,36 +163,15 @@ class QuantAPI:
         if self.metagraph is None:
             print("WARNING: Metagraph is None when getting UIDs")
             return []
-            
-        if exclude is None:
-            exclude = []
-            
-        # Get all available UIDs with valid axons
-        available_uids = []
-        for uid in range(len(self.metagraph.axons)):
-            if uid in exclude:
-                continue
-                
-            axon = self.metagraph.axons[uid]
-            if axon is not None and self._is_axon_valid(axon):
-                available_uids.append(uid)
-                
-        print(f"Found {len(available_uids)} available UIDs with valid axons")
-        
-        # If there are no available UIDs, return an empty list
-        if not available_uids:
+
+        # Rebuild lazily if the metagraph was replaced outside of connect/sync_metagraph.
+        if not self.uid_index.is_built_for(self.metagraph):
+            self.uid_index.rebuild(self.metagraph, self._is_axon_valid)
+
+        uids = self.uid_index.top_k(k, exclude=exclude, order=order)
+        if not uids:
             print("WARNING: No available UIDs with valid axons found")
-            return []
-            
-        # If k is greater than the number of available UIDs, return all available UIDs
-        if k >= len(available_uids):
-            return available_uids
-            
-        # Sort UIDs by stake (higher stake first)
-        sorted_uids = sorted(available_uids, key=lambda uid: float(self.metagraph.S[uid]), reverse=True)
-        
-        # Return the top k UIDs
-        return sorted_uids[:k]
+        return uids
 
     def query(self, uids, query: str, userID: str, metadata: dict, timeout: float = 12.0):
         """
@@ -201,6 +197,7 @@ class QuantAPI:
             
             # Get the axons to query (only those with valid connection details)
             valid_axons = []
+            valid_uids = []
             for uid in uids:
                 if uid >= len(self.metagraph.axons):
                     print(f"WARNING: UID {uid} is out of range")
@@ -209,6 +206,7 @@ class QuantAPI:
                 axon = self.metagraph.axons[uid]
                 if axon is not None and self._is_axon_valid(axon):
                     valid_axons.append(axon)
+                    valid_uids.append(uid)
                 else:
                     print(f"WARNING: Skipping UID {uid} due to invalid axon")
             
@@ -218,15 +216,18 @@ class QuantAPI:
                 
             # Query the network
             print(f"Querying {len(valid_axons)} axons with timeout {timeout}s")
-            for i, axon in enumerate(valid_axons):
-                print(f"  Axon {i+1}: {axon.ip}:{axon.port} (UID: {uids[i] if i < len(uids) else 'unknown'})")
+            for i, (uid, axon) in enumerate(zip(valid_uids, valid_axons)):
+                print(f"  Axon {i+1}: {axon.ip}:{axon.port} (UID: {uid})")
                 
-            responses = self.dendrite.query(
+            # Keep the raw synapses so the observed latencies can feed the UID index.
+            synapses = self.dendrite.query(
                 axons=valid_axons,
                 synapse=synapse,
-                deserialize=True,
+                deserialize=False,
                 timeout=timeout
             )
+            self.record_latencies(valid_uids, synapses, timeout)
+            responses = [s.deserialize() for s in synapses]
             
             print(f"Received {len(responses)} responses")
             return responses
@@ -236,6 +237,120 @@ class QuantAPI:
             traceback.print_exc()
             return []
 
+    async def aquery(
+        self,
+        uids: List[int],
+        query: str,
+        userID: str,
+        metadata: dict,
+        timeout: float = 12.0,
+        deserialize: bool = True,
+    ):
+        """
+        Asynchronously query the network with the given query.
+
+        Unlike `query`, this does not block the calling event loop, so many queries
+        can be in flight at once (see `quant.api.bulk`). Errors are raised to the caller.
+
+        Args:
+            uids (List[int]): The UIDs to query. Invalid or out-of-range UIDs are skipped.
+            query (str): The query string.
+            userID (str): The user ID for the query.
+            metadata (dict): Any additional metadata to include with the query.
+            timeout (float): The timeout for the query in seconds.
+            deserialize (bool): If False, return the raw synapses (with status codes and
+                process times) instead of the deserialized responses.
+
+        Returns:
+            Tuple[List[int], List]: The UIDs that were actually queried and their responses.
+        """
+        if self.metagraph is None or self.dendrite is None:
+            raise RuntimeError("QuantAPI is not connected")
+
+        queried_uids = [
+            uid
+            for uid in uids
+            if uid < len(self.metagraph.axons) and self._is_axon_valid(self.metagraph.axons[uid])
+        ]
+        if not queried_uids:
+            return [], []
+
+        synapses = await self.dendrite.forward(
+            axons=[self.metagraph.axons[uid] for uid in queried_uids],
+            synapse=self.prepare_synapse(query, userID, metadata),
+            deserialize=False,
+            timeout=timeout,
+        )
+        self.record_latencies(queried_uids, synapses, timeout)
+        if deserialize:
+            return queried_uids, [s.deserialize() for s in synapses]
+        return queried_uids, synapses
+
+    async def astream(
+        self,
+        uid: int,
+        query: str,
+        userID: str,
+        metadata: dict,
+        timeout: float = 12.0,
+    ) -> AsyncIterator[Union[str, QuantStreamingSynapse]]:
+        """
+        Stream the answer of a single miner as it is produced.
+
+        Args:
+            uid (int): The UID to query.
+            query (str): The query string.
+            userID (str): The user ID for the query.
+            metadata (dict): Any additional metadata to include with the query.
+            timeout (float): The timeout for the query in seconds.
+
+        Yields:
+            str: Each piece of the answer as it arrives, followed by the filled
+                QuantStreamingSynapse, whose `deserialize()` returns the complete
+                QuantResponse and whose `time_to_first_byte` is set if anything arrived.
+        """
+        if self.metagraph is None or self.dendrite is None:
+            raise RuntimeError("QuantAPI is not connected")
+        if uid >= len(self.metagraph.axons) or not self._is_axon_valid(self.metagraph.axons[uid]):
+            raise ValueError(f"UID {uid} has no valid axon")
+
+        synapse = QuantStreamingSynapse(
+            query=QuantQuery(query=query, userID=userID, metadata=metadata)
+        )
+        start_time = time.monotonic()
+        time_to_first_byte = None
+        async for item in self.dendrite.call_stream(
+            self.metagraph.axons[uid], synapse, timeout=timeout, deserialize=False
+        ):
+            if isinstance(item, str):
+                if time_to_first_byte is None:
+                    time_to_first_byte = time.monotonic() - start_time
+                yield item
+            else:
+                synapse = item
+
+        synapse.time_to_first_byte = time_to_first_byte
+        self.record_latencies([uid], [synapse], timeout)
+        yield synapse
+
+    def record_latencies(self, uids: List[int], synapses: List["bt.Synapse"], timeout: float):
+        """
+        Feed the observed response times into the UID ranking index.
+
+        Args:
+            uids (List[int]): The UIDs that were queried, in the same order as the synapses.
+            synapses (List[bt.Synapse]): The non-deserialized responses.
+            timeout (float): The query timeout, used as the latency of failed responses.
+        """
+        for uid, synapse in zip(uids, synapses):
+            dendrite = getattr(synapse, "dendrite", None)
+            if dendrite is None:
+                continue
+            latency = timeout
+            if dendrite.status_code == 200 and dendrite.process_time is not None:
+                latency = float(dendrite.process_time)
+            self.uid_index.record_latency(uid, latency)
+
     def process_responses(self, responses: List[Union["bt.Synapse", Any]]):
         """
         Process the responses from the network.
@@ -0,0 +1,184 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the "Software"), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import threading
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Orderings that are precomputed from the metagraph on every rebuild.
+METAGRAPH_ORDERINGS = {
+    "stake": "S",
+    "incentive": "I",
+    "validator_trust": "Tv",
+}
+
+# Ordering computed from latencies observed by the client itself.
+LATENCY_ORDERING = "latency"
+
+
+class UIDRankingIndex:
+    """
+    Precomputed ranking of queryable UIDs, rebuilt once per metagraph refresh.
+
+    The index keeps the UIDs with valid axons sorted by stake (and optionally by
+    incentive, validator trust or observed latency) so that picking the top ``k``
+    UIDs is a walk over the first ``k`` entries instead of a full scan and sort.
+    """
+
+    def __init__(self, latency_alpha: float = 0.2):
+        """
+        Initialize an empty index.
+
+        Args:
+            latency_alpha (float): Smoothing factor of the exponential moving average
+                used for observed latencies.
+        """
+        self.latency_alpha = latency_alpha
+        self.metagraph = None
+        self._orderings: Dict[str, Tuple[int, ...]] = {}
+        self._valid_uids: frozenset = frozenset()
+        self._latencies: Dict[int, float] = {}
+        self._latency_dirty = True
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._valid_uids)
+
+    def is_built_for(self, metagraph) -> bool:
+        """Return True if the index was built from the given metagraph object."""
+        return self.metagraph is metagraph and bool(self._orderings)
+
+    def rebuild(self, metagraph, is_axon_valid: Callable) -> None:
+        """
+        Rebuild all orderings from the metagraph.
+
+        Args:
+            metagraph (bt.metagraph): The metagraph to index.
+            is_axon_valid (Callable): Predicate returning True for axons that can be queried.
+        """
+        valid = [
+            uid
+            for uid, axon in enumerate(metagraph.axons)
+            if axon is not None and is_axon_valid(axon)
+        ]
+        valid_array = np.asarray(valid, dtype=np.int64)
+
+        orderings = {}
+        for name, attribute in METAGRAPH_ORDERINGS.items():
+            values = getattr(metagraph, attribute, None)
+            if values is None or len(valid_array) == 0:
+                orderings[name] = tuple(valid)
+                continue
+            values = np.asarray(values, dtype=np.float64)[valid_array]
+            # Stable sort on the negated values keeps lower UIDs first on ties.
+            order = np.argsort(-values, kind="stable")
+            orderings[name] = tuple(int(uid) for uid in valid_array[order])
+
+        with self._lock:
+            self.metagraph = metagraph
+            self._valid_uids = frozenset(valid)
+            self._orderings = orderings
+            # Drop latency observations for UIDs that are no longer queryable.
+            self._latencies = {
+                uid: latency
+                for uid, latency in self._latencies.items()
+                if uid in self._valid_uids
+            }
+            self._latency_dirty = True
+
+    def record_latency(self, uid: int, seconds: float) -> None:
+        """
+        Record an observed response latency for a UID.
+
+        Args:
+            uid (int): The UID that answered.
+            seconds (float): The observed round-trip time in seconds.
+        """
+        with self._lock:
+            previous = self._latencies.get(uid)
+            if previous is None:
+                self._latencies[uid] = seconds
+            else:
+                self._latencies[uid] = (
+                    self.latency_alpha * seconds
+                    + (1 - self.latency_alpha) * previous
+                )
+            self._latency_dirty = True
+
+    def _latency_ordering(self) -> Tuple[int, ...]:
+        """Return UIDs sorted by observed latency, unobserved UIDs last in stake order."""
+        with self._lock:
+            if not self._latency_dirty:
+                return self._orderings[LATENCY_ORDERING]
+            stake_order = self._orderings.get("stake", ())
+            observed = sorted(
+                (uid for uid in stake_order if uid in self._latencies),
+                key=self._latencies.__getitem__,
+            )
+            unobserved = [
+                uid for uid in stake_order if uid not in self._latencies
+            ]
+            ordering = tuple(observed + unobserved)
+            self._orderings[LATENCY_ORDERING] = ordering
+            self._latency_dirty = False
+            return ordering
+
+    def ordering(self, order: str = "stake") -> Tuple[int, ...]:
+        """
+        Return the full ranking for the given ordering.
+
+        Args:
+            order (str): One of "stake", "incentive", "validator_trust" or "latency".
+
+        Returns:
+            Tuple[int, ...]: The ranked UIDs.
+        """
+        if order == LATENCY_ORDERING:
+            return self._latency_ordering()
+        if order not in METAGRAPH_ORDERINGS:
+            raise ValueError(f"Unknown UID ordering: {order}")
+        return self._orderings.get(order, ())
+
+    def top_k(
+        self,
+        k: int,
+        exclude: Optional[Iterable[int]] = None,
+        order: str = "stake",
+    ) -> List[int]:
+        """
+        Return the best ``k`` UIDs for the given ordering.
+
+        Args:
+            k (int): The number of UIDs to return.
+            exclude (Iterable[int], optional): UIDs to skip.
+            order (str): The ordering to walk.
+
+        Returns:
+            List[int]: Up to ``k`` UIDs, best first.
+        """
+        ranking = self.ordering(order)
+        if not exclude:
+            return list(ranking[:k])
+
+        excluded = exclude if isinstance(exclude, (set, frozenset)) else set(exclude)
+        uids = []
+        for uid in ranking:
+            if len(uids) >= k:
+                break
+            if uid not in excluded:
+                uids.append(uid)
+        return uids
@@ -15,7 +15,6 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
-import time
 import asyncio
 import threading
 import argparse
@@ -25,6 +24,8 @@ import bittensor as bt
 
 from quant.base.neuron import BaseNeuron
 from quant.utils.config import add_miner_args
+from quant.utils.uids import HotkeyIndex
+from quant.utils.startup import startup_profiler
 
 from typing import Union
 
@@ -54,10 +55,11 @@ class BaseMinerNeuron(BaseNeuron):
                 "You are allowing non-registered entities to send requests to your miner. This is a security risk."
             )
         # The axon handles request processing, allowing validators to send this miner requests.
-        self.axon = bt.axon(
-            wallet=self.wallet,
-            config=self.config() if callable(self.config) else self.config,
-        )
+        with startup_profiler.phase("axon"):
+            self.axon = bt.axon(
+                wallet=self.wallet,
+                config=self.config() if callable(self.config) else self.config,
+            )
 
         # Attach determiners which functions are called when servicing a request.
         bt.logging.info(f"Attaching forward function to miner axon.")
@@ -68,6 +70,9 @@ class BaseMinerNeuron(BaseNeuron):
         )
         bt.logging.info(f"Axon created: {self.axon}")
 
+        # Hotkey lookups for blacklist and priority, swapped on every metagraph resync.
+        self.hotkey_index = HotkeyIndex(self.metagraph)
+
         # Instantiate runners
         self.should_exit: bool = False
         self.is_running: bool = False
@@ -111,23 +116,29 @@ class BaseMinerNeuron(BaseNeuron):
         self.axon.start()
 
         bt.logging.info(f"Miner starting at block: {self.block}")
+        last_sync_block = self.block
 
         # This loop maintains the miner's operations until intentionally stopped.
         try:
             while not self.should_exit:
-                while (
-                    self.block - self.metagraph.last_update[self.uid]
-                    < self.config.neuron.epoch_length
-                ):
-                    # Wait before checking again.
-                    time.sleep(1)
-
-                    # Check if we should exit.
-                    if self.should_exit:
-                        break
+                # Sleep until the next epoch. Miners do not set weights, so their last_update
+                # does not move; count the epoch from our own last sync as well.
+                self.block_clock.wait_until(
+                    max(self.metagraph.last_update[self.uid], last_sync_block)
+                    + self.config.neuron.epoch_length
+                    + 1,
+                    # Wake up early to swap in the fresh metagraph when starting from a snapshot.
+                    should_exit=lambda: self.should_exit
+                    or (self.metagraph_refresh is not None and self.metagraph_refresh.done()),
+                )
+
+                # Check if we should exit.
+                if self.should_exit:
+                    break
 
                 # Sync metagraph and potentially set weights.
                 self.sync()
+                last_sync_block = self.block
                 self.step += 1
 
         # If someone intentionally stops the miner, it'll safely terminate operations.
@@ -194,3 +205,12 @@ class BaseMinerNeuron(BaseNeuron):
 
         # Sync the metagraph.
         self.metagraph.sync(subtensor=self.subtensor)
+        self.metagraph_updated()
+
+    def metagraph_updated(self, previous_metagraph=None):
+        """Re-indexes the hotkeys of the new metagraph."""
+        super().metagraph_updated(previous_metagraph)
+
+        # Build the new index aside and swap it in with a single assignment, so
+        # requests served concurrently always see a consistent snapshot.
+        self.hotkey_index = HotkeyIndex(self.metagraph)
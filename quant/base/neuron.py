@@ -15,8 +15,10 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
-import copy
+import os
 import typing
+import threading
+import concurrent.futures
 
 import bittensor as bt
 
@@ -24,8 +26,18 @@ from abc import ABC, abstractmethod
 
 # Sync calls set weights and also resyncs the metagraph.
 from quant.utils.config import check_config, add_args, config
-from quant.utils.misc import ttl_get_block
+from quant.utils.block_clock import BlockClock
+from quant.utils.metrics import start_metrics_server
+from quant.utils.device import resolve_device
+from quant.utils.startup import startup_profiler
+from quant.utils.metagraph_snapshot import (
+    SNAPSHOT_NAME,
+    load_metagraph_snapshot,
+    metagraph_diff,
+    save_metagraph_snapshot,
+)
 from quant import __spec_version__ as spec_version
+from bittensor_wallet.mock import get_mock_wallet
 from quant.mock import MockSubtensor, MockMetagraph
 
 
@@ -57,19 +69,39 @@ class BaseNeuron(ABC):
 
     @property
     def block(self):
-        return ttl_get_block(self)
+        # Extrapolated locally, the chain is only asked every --neuron.block_sync_interval seconds.
+        return self.block_clock.block
+
+    @property
+    def device(self):
+        # Probed on first use only, most neurons never need it.
+        if self._device is None:
+            self._device = resolve_device(self.config.neuron.device)
+        return self._device
+
+    @device.setter
+    def device(self, device):
+        # If a gpu is required, set the device to cuda:N (e.g. cuda:0)
+        self._device = device
 
     def __init__(self, config=None):
-        base_config = copy.deepcopy(config or BaseNeuron.config())
-        self.config = self.config()
-        self.config.merge(base_config)
-        self.check_config(self.config)
+        with startup_profiler.phase("config"):
+            built_for = getattr(config, "_neuron_class", None)
+            if built_for is not None and issubclass(built_for, type(self)):
+                # Built by this class' parser (e.g. `Miner.config()`), it already has every argument.
+                self.config = config
+            else:
+                # Parse the arguments of this class, then apply the given config over them.
+                given = config
+                self.config = self.config()
+                if given is not None:
+                    self.config.merge(given)
+            self.check_config(self.config)
 
         # Set up logging with the provided configuration.
         bt.logging.set_config(config=self.config.logging)
 
-        # If a gpu is required, set the device to cuda:N (e.g. cuda:0)
-        self.device = self.config.neuron.device
+        self._device = None
 
         # Log the configuration for reference.
         bt.logging.info(self.config)
@@ -78,26 +110,50 @@ class BaseNeuron(ABC):
         # These are core Bittensor classes to interact with the network.
         bt.logging.info("Setting up bittensor objects.")
 
+        # Fresh metagraph fetched in the background when starting from a snapshot.
+        self.metagraph_refresh: typing.Optional[concurrent.futures.Future] = None
+
         # The wallet holds the cryptographic key pairs for the miner.
         if self.config.mock:
-            self.wallet = bt.MockWallet(config=self.config)
-            self.subtensor = MockSubtensor(
-                self.config.netuid, wallet=self.wallet
-            )
-            self.metagraph = MockMetagraph(
-                self.config.netuid, subtensor=self.subtensor
-            )
+            # The mock network is local, the axon need not look its external IP up online.
+            if not self.config.axon.external_ip:
+                self.config.axon.external_ip = "127.0.0.1"
+            with startup_profiler.phase("wallet"):
+                # Fresh in-memory keys, registered on the mock subnet below.
+                self.wallet = get_mock_wallet()
+            with startup_profiler.phase("subtensor"):
+                self.subtensor = MockSubtensor(
+                    self.config.netuid, wallet=self.wallet
+                )
+            with startup_profiler.phase("metagraph"):
+                self.metagraph = MockMetagraph(
+                    self.config.netuid, subtensor=self.subtensor
+                )
         else:
-            self.wallet = bt.wallet(config=self.config)
-            self.subtensor = bt.subtensor(config=self.config)
-            self.metagraph = self.subtensor.metagraph(self.config.netuid)
+            with startup_profiler.phase("wallet"):
+                self.wallet = bt.wallet(config=self.config)
+            with startup_profiler.phase("subtensor"):
+                self.subtensor = bt.subtensor(config=self.config)
+            with startup_profiler.phase("metagraph"):
+                self.metagraph = self.load_metagraph()
+
+        self.block_clock = BlockClock(
+            self.subtensor.get_current_block,
+            sync_interval=self.config.neuron.block_sync_interval,
+        )
 
         bt.logging.info(f"Wallet: {self.wallet}")
         bt.logging.info(f"Subtensor: {self.subtensor}")
         bt.logging.info(f"Metagraph: {self.metagraph}")
 
+        # Expose the metrics of this process to a local Prometheus scraper.
+        self.metrics_server = None
+        if self.config.neuron.metrics_port:
+            self.metrics_server = start_metrics_server(self.config.neuron.metrics_port)
+
         # Check if the miner is registered on the Bittensor network before proceeding further.
-        self.check_registered()
+        with startup_profiler.phase("check_registered"):
+            self.check_registered()
 
         # Each miner gets a unique identity (UID) in the network for differentiation.
         self.uid = self.metagraph.hotkeys.index(
@@ -123,15 +179,105 @@ class BaseNeuron(ABC):
         # Ensure miner or validator hotkey is still registered on the network.
         self.check_registered()
 
-        if self.should_sync_metagraph():
+        # While the metagraph still comes from the snapshot, neither resync it again nor set weights from it.
+        reconciling = self.apply_metagraph_refresh()
+
+        if not reconciling and self.should_sync_metagraph():
             self.resync_metagraph()
 
-        if self.should_set_weights():
+        if not reconciling and self.should_set_weights():
             self.set_weights()
 
         # Always save state.
         self.save_state()
 
+    @property
+    def metagraph_snapshot_path(self) -> str:
+        return os.path.join(self.config.neuron.full_path, SNAPSHOT_NAME)
+
+    def load_metagraph(self) -> "bt.metagraph":
+        """
+        Return the metagraph saved by the previous run and fetch a fresh one in the background,
+        or sync the metagraph from the chain if there is no usable snapshot.
+        """
+        if not self.config.neuron.metagraph_snapshot_off:
+            snapshot = load_metagraph_snapshot(
+                self.metagraph_snapshot_path,
+                self.config.netuid,
+                self.subtensor.chain_endpoint,
+                max_age=self.config.neuron.metagraph_snapshot_max_age,
+            )
+            # A hotkey registered since the snapshot was taken has no UID in it.
+            if snapshot is not None and self.wallet.hotkey.ss58_address in snapshot.hotkeys:
+                bt.logging.info(
+                    f"Starting from the metagraph snapshot at block {int(snapshot.block[0])}, syncing it in the background."
+                )
+                self.metagraph_refresh = concurrent.futures.Future()
+                threading.Thread(
+                    target=self._fetch_metagraph, args=(self.metagraph_refresh,), daemon=True, name="metagraph"
+                ).start()
+                return snapshot
+
+        metagraph = self.subtensor.metagraph(self.config.netuid)
+        self.snapshot_metagraph(metagraph)
+        return metagraph
+
+    def _fetch_metagraph(self, future: concurrent.futures.Future):
+        try:
+            # Own connection, the websocket of self.subtensor is not thread-safe.
+            subtensor = bt.subtensor(config=self.config)
+            try:
+                future.set_result(subtensor.metagraph(self.config.netuid))
+            finally:
+                subtensor.close()
+        except Exception as e:
+            future.set_exception(e)
+
+    def apply_metagraph_refresh(self) -> bool:
+        """
+        Swap in the metagraph fetched in the background, once it arrived.
+
+        Returns:
+            bool: True while the metagraph still comes from the snapshot.
+        """
+        future = self.metagraph_refresh
+        if future is None:
+            return False
+        if not future.done():
+            return True
+        self.metagraph_refresh = None
+        try:
+            fresh_metagraph = future.result()
+        except Exception as e:
+            bt.logging.warning(f"Background metagraph sync failed, syncing now: {e}")
+            self.resync_metagraph()
+            return False
+
+        previous_metagraph, self.metagraph = self.metagraph, fresh_metagraph
+        diff = metagraph_diff(previous_metagraph, fresh_metagraph)
+        bt.logging.info(
+            f"Metagraph snapshot reconciled: {len(diff.replaced)} hotkeys replaced, {len(diff.added)} UIDs added, "
+            f"{len(diff.axons)} axons changed since block {int(previous_metagraph.block[0])}."
+        )
+        self.metagraph_updated(previous_metagraph)
+        return False
+
+    def metagraph_updated(self, previous_metagraph: typing.Optional["bt.metagraph"] = None):
+        """
+        Called once the metagraph changed, after a resync or when the snapshot was reconciled.
+
+        Args:
+            previous_metagraph (bt.metagraph, optional): The metagraph before the change.
+        """
+        self.uid = self.metagraph.hotkeys.index(self.wallet.hotkey.ss58_address)
+        self.snapshot_metagraph(self.metagraph)
+
+    def snapshot_metagraph(self, metagraph: "bt.metagraph"):
+        """Save the metagraph for the next start, unless disabled."""
+        if self.config.mock or self.config.neuron.metagraph_snapshot_off:
+            return
+        save_metagraph_snapshot(metagraph, self.metagraph_snapshot_path, self.subtensor.chain_endpoint)
+
     def check_registered(self):
         # --- Check for registration.
         if not self.subtensor.is_hotkey_registered(
@@ -33,6 +33,15 @@ from quant.base.utils.weight_utils import (
 )  # TODO: Replace when bittensor switches to numpy
 from quant.mock import MockDendrite
 from quant.utils.config import add_validator_args
+from quant.utils import metrics
+from quant.utils.startup import startup_profiler
+
+SET_WEIGHTS = metrics.counter(
+    "quant_validator_set_weights_total", "set_weights calls by result.", ("result",)
+)
+SET_WEIGHTS_SECONDS = metrics.histogram(
+    "quant_validator_set_weights_seconds", "Duration of set_weights calls."
+)
 
 
 class BaseValidatorNeuron(BaseNeuron):
@@ -65,11 +74,13 @@ class BaseValidatorNeuron(BaseNeuron):
         self.scores = np.zeros(self.metagraph.n, dtype=np.float32)
 
         # Init sync with the network. Updates the metagraph.
-        self.sync()
+        with startup_profiler.phase("sync"):
+            self.sync()
 
         # Serve axon to enable external connections.
         if not self.config.neuron.axon_off:
-            self.serve_axon()
+            with startup_profiler.phase("serve_axon"):
+                self.serve_axon()
         else:
             bt.logging.warning("axon off, not serving ip to chain.")
 
@@ -269,18 +280,21 @@ class BaseValidatorNeuron(BaseNeuron):
         # Set the weights on chain via our subtensor connection.
         uint_uids_converted = [int(uid) for uid in uint_uids]
         uint_weights_converted = [int(weight) for weight in uint_weights]
-        result, msg = self.subtensor.set_weights(
-            wallet=self.wallet,
-            netuid=self.config.netuid,
-            uids=uint_uids_converted,
-            weights=uint_weights_converted,
-            wait_for_finalization=False,
-            wait_for_inclusion=False,
-            version_key=self.spec_version,
-        )
+        with SET_WEIGHTS_SECONDS.time():
+            result, msg = self.subtensor.set_weights(
+                wallet=self.wallet,
+                netuid=self.config.netuid,
+                uids=uint_uids_converted,
+                weights=uint_weights_converted,
+                wait_for_finalization=False,
+                wait_for_inclusion=False,
+                version_key=self.spec_version,
+            )
         if result is True:
+            SET_WEIGHTS.inc(result="success")
             bt.logging.info("set_weights on chain successfully!")
         else:
+            SET_WEIGHTS.inc(result="failure")
             bt.logging.error("set_weights failed", msg)
 
     def resync_metagraph(self):
@@ -292,9 +306,15 @@ class BaseValidatorNeuron(BaseNeuron):
 
         # Sync the metagraph.
         self.metagraph.sync(subtensor=self.subtensor)
+        self.metagraph_updated(previous_metagraph)
+
+    def metagraph_updated(self, previous_metagraph=None):
+        """Updates the hotkeys and moving averages based on the new metagraph."""
+        super().metagraph_updated(previous_metagraph)
 
-        # Check if the metagraph axon info has changed.
-        if previous_metagraph.axons == self.metagraph.axons:
+        # Check if the metagraph axon info has changed. Without the previous metagraph,
+        # every UID is treated as changed.
+        if previous_metagraph is not None and previous_metagraph.axons == self.metagraph.axons:
             return
 
         bt.logging.info(
@@ -0,0 +1,4 @@
+from .agent_client import AgentClient, AgentPool
+from .cache import AnswerCache
+from .prewarm import PrewarmScheduler
+from .admission import AdmissionController, AdmissionRejected
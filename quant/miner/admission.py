@@ -0,0 +1,189 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import heapq
+import asyncio
+import itertools
+import bittensor as bt
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from quant.utils import metrics
+
+REJECTED = metrics.counter(
+    "quant_miner_admission_rejected_total", "Requests shed by the admission controller, by reason.", ("reason",)
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted because the miner is saturated."""
+
+
+class AdmissionController:
+    """
+    Bounds the agent work a miner accepts.
+
+    At most `max_concurrency` requests run at once. Further requests wait in a bounded
+    queue ordered by priority (the caller's stake), so high-stake validators are served
+    first. When the queue is full, the lowest-priority request, which may be the new one,
+    is rejected immediately instead of queueing behind slow agent calls and timing out.
+    Requests only wait for a `max_wait` fraction of their timeout, leaving them the rest to
+    be answered.
+
+    The controller is used from the axon's event loop only and needs no locking.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, max_wait: float = 0.5):
+        """
+        Args:
+            max_concurrency (int): The maximum number of requests running at once.
+            max_queue (int): The maximum number of requests waiting for a slot.
+            max_wait (float): The fraction of its timeout a request may spend waiting for a slot.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.rejected = 0
+        # Heap of [-priority, sequence, future]; cancelled entries have future=None.
+        self._queue: List[list] = []
+        self._waiting = 0
+        self._sequence = itertools.count()
+
+    @classmethod
+    def from_config(cls, config: "bt.Config") -> "AdmissionController":
+        """Build a controller from the miner's `admission.*` config."""
+        return cls(
+            max_concurrency=config.admission.max_concurrency
+            or config.agent.max_concurrency,
+            max_queue=config.admission.max_queue,
+            max_wait=config.admission.max_wait,
+        )
+
+    def deadline(self, timeout: Optional[float]) -> Optional[float]:
+        """
+        Return when a request received now must stop waiting for a slot.
+
+        Args:
+            timeout (float, optional): The request timeout, no deadline if None.
+
+        Returns:
+            Optional[float]: A `time.monotonic()` deadline, `max_wait` of the timeout from now.
+        """
+        return None if timeout is None else time.monotonic() + timeout * self.max_wait
+
+    @property
+    def waiting(self) -> int:
+        """The number of requests waiting for a slot."""
+        return self._waiting
+
+    def _lowest(self) -> Optional[list]:
+        """Return the waiting entry with the lowest priority (latest on ties)."""
+        live = [entry for entry in self._queue if entry[2] is not None]
+        return max(live, key=lambda entry: (entry[0], entry[1]), default=None)
+
+    def _remove(self, entry: list):
+        entry[2] = None
+        self._waiting -= 1
+
+    async def acquire(self, priority: float, timeout: Optional[float] = None, deadline: Optional[float] = None):
+        """
+        Wait for a slot.
+
+        Args:
+            priority (float): The request priority, higher is served first.
+            timeout (float, optional): Give up after this many seconds of waiting.
+            deadline (float, optional): Give up at this `time.monotonic()` time, see `deadline()`.
+
+        Raises:
+            AdmissionRejected: If the queue is full, the request was displaced by a
+                higher-priority one, or no slot became free in time.
+        """
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.monotonic())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        if self.active < self.max_concurrency and self._waiting == 0:
+            self.active += 1
+            return
+
+        if self._waiting >= self.max_queue:
+            lowest = self._lowest()
+            if lowest is None or -lowest[0] >= priority:
+                self.rejected += 1
+                REJECTED.inc(reason="queue_full")
+                raise AdmissionRejected("Miner is at capacity, try again later")
+            # Displace the lowest-priority waiter in favour of this request.
+            future = lowest[2]
+            self._remove(lowest)
+            self.rejected += 1
+            REJECTED.inc(reason="displaced")
+            future.set_exception(
+                AdmissionRejected("Displaced by a higher-priority request")
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [-priority, next(self._sequence), future]
+        heapq.heappush(self._queue, entry)
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.exception():
+                # The slot was handed over just as we timed out, give it back.
+                self.release()
+            elif entry[2] is not None:
+                self._remove(entry)
+            self.rejected += 1
+            REJECTED.inc(reason="timeout")
+            raise AdmissionRejected(f"No capacity within {timeout:.1f}s")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and not future.exception():
+                self.release()
+            elif entry[2] is not None:
+                self._remove(entry)
+            raise
+
+    def release(self):
+        """Release a slot, handing it to the highest-priority waiter if any."""
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            future = entry[2]
+            if future is None:
+                continue
+            self._waiting -= 1
+            entry[2] = None
+            # The slot passes straight to the waiter, `active` is unchanged.
+            future.set_result(None)
+            return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: float, timeout: Optional[float] = None, deadline: Optional[float] = None):
+        """
+        Context manager holding a slot for the duration of the block.
+
+        Args:
+            priority (float): The request priority, higher is served first.
+            timeout (float, optional): The maximum time to wait for a slot.
+            deadline (float, optional): The `time.monotonic()` time at which to stop waiting.
+        """
+        await self.acquire(priority, timeout, deadline)
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,574 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import json
+import time
+import asyncio
+import threading
+import requests
+import bittensor as bt
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from quant.protocol import QuantQuery, QuantResponse
+from quant.utils import metrics
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp ships with bittensor
+    aiohttp = None
+
+# Path of the BitQuant agent server endpoint answering subnet queries.
+DEFAULT_QUERY_PATH = "/api/subnet/query"
+
+AGENT_SECONDS = metrics.histogram(
+    "quant_agent_request_seconds", "Duration of agent calls, by mode and result.", ("mode", "result")
+)
+AGENT_EJECTIONS = metrics.counter(
+    "quant_agent_ejections_total", "Agent server workers taken out of rotation.", ("url",)
+)
+AGENT_HEALTHY = metrics.gauge(
+    "quant_agent_worker_healthy", "1 while an agent server worker is in rotation.", ("url",)
+)
+
+
+def load_subnet_query():
+    """
+    Return BitQuant's in-process `subnet_query` function, or None if the BitQuant
+    submodule is not checked out.
+    """
+    try:
+        from quant.BitQuant.subnet.subnet_methods import subnet_query
+    except ImportError:
+        return None
+    return subnet_query
+
+
+def parse_agent_response(data: Dict[str, Any]) -> QuantResponse:
+    """
+    Build a QuantResponse from the JSON returned by the agent server.
+
+    Args:
+        data (Dict[str, Any]): The decoded JSON body.
+
+    Returns:
+        QuantResponse: The parsed response.
+    """
+    return QuantResponse(
+        response=data.get("response", ""),
+        signature=data.get("signature") or b"",
+        proofs=data.get("proofs") or [],
+        metadata=data.get("metadata") or {},
+    )
+
+
+async def iter_stream_events(content) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Decode a newline-delimited JSON event stream.
+
+    Args:
+        content (aiohttp.StreamReader): The response body.
+
+    Yields:
+        Dict[str, Any]: Each event, malformed lines are skipped.
+    """
+    buffer = b""
+    async for data in content.iter_any():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                bt.logging.debug(f"Ignoring malformed agent stream line: {line[:100]!r}")
+    if buffer.strip():
+        try:
+            yield json.loads(buffer)
+        except ValueError:
+            bt.logging.debug(f"Ignoring malformed agent stream line: {buffer[:100]!r}")
+
+
+def parse_agent_urls(urls: Union[str, List[str]]) -> List[str]:
+    """
+    Parse agent server URLs given as a list or a comma-separated string.
+
+    Args:
+        urls (Union[str, List[str]]): The URLs.
+
+    Returns:
+        List[str]: The URLs without trailing slashes.
+    """
+    if isinstance(urls, str):
+        urls = urls.split(",")
+    return [url.strip().rstrip("/") for url in urls if url.strip()]
+
+
+class AgentEndpoint:
+    """A single agent server worker and its health as seen by the client."""
+
+    __slots__ = ("url", "standby", "outstanding", "failures", "ejections", "ejected_until")
+
+    def __init__(self, url: str, standby: bool = False):
+        self.url = url
+        self.standby = standby
+        self.outstanding = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self) -> str:
+        return f"AgentEndpoint({self.url}, outstanding={self.outstanding})"
+
+
+class AgentPool:
+    """
+    Balances agent calls over a pool of agent server workers.
+
+    Each call goes to the healthy worker with the fewest outstanding requests. A worker
+    failing `eject_after` calls in a row is ejected for `eject_for` seconds, doubling on
+    every consecutive ejection up to `max_eject_for`. Once the period expires the worker
+    is back on probation: one success reinstates it, one failure ejects it again. If
+    every worker is ejected, the one due back first is used anyway.
+
+    Standby workers get no traffic while every regular worker is healthy, and fill in
+    as soon as one of them is ejected.
+
+    The pool is shared by the event loops and threads of a client and is thread-safe.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        eject_after: int = 3,
+        eject_for: float = 5.0,
+        max_eject_for: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        standby_urls: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            urls (List[str]): The query URLs of the workers.
+            eject_after (int): Consecutive failures after which a worker is ejected.
+            eject_for (float): Seconds a worker is ejected for the first time.
+            max_eject_for (float): Upper bound of the ejection period.
+            clock (Callable[[], float]): Monotonic time source.
+            standby_urls (List[str], optional): The query URLs of warm standby workers.
+        """
+        if not urls:
+            raise ValueError("An agent pool needs at least one URL")
+        self.endpoints = [AgentEndpoint(url) for url in urls] + [
+            AgentEndpoint(url, standby=True) for url in standby_urls or []
+        ]
+        for endpoint in self.endpoints:
+            AGENT_HEALTHY.set(1, url=endpoint.url)
+        self.eject_after = eject_after
+        self.eject_for = eject_for
+        self.max_eject_for = max_eject_for
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._rotation = 0
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def __repr__(self) -> str:
+        return f"AgentPool({', '.join(endpoint.url for endpoint in self.endpoints)})"
+
+    def acquire(self) -> AgentEndpoint:
+        """Pick the worker for the next call and count the call as outstanding."""
+        with self._lock:
+            now = self.clock()
+            # Rotate the start so ties are spread over the workers.
+            self._rotation = (self._rotation + 1) % len(self.endpoints)
+            endpoints = self.endpoints[self._rotation:] + self.endpoints[:self._rotation]
+            healthy = [e for e in endpoints if e.ejected_until <= now]
+            if len([e for e in healthy if not e.standby]) == len([e for e in endpoints if not e.standby]):
+                # Every regular worker is up, keep the standbys idle.
+                healthy = [e for e in healthy if not e.standby]
+            if healthy:
+                endpoint = min(healthy, key=lambda e: e.outstanding)
+            else:
+                endpoint = min(endpoints, key=lambda e: e.ejected_until)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint: AgentEndpoint, ok: bool):
+        """
+        Record the outcome of a call.
+
+        Args:
+            endpoint (AgentEndpoint): The worker returned by `acquire`.
+            ok (bool): False if the worker failed, e.g. connection error, timeout or 5xx.
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok:
+                if endpoint.ejections:
+                    bt.logging.info(f"Agent server {endpoint.url} reinstated")
+                    AGENT_HEALTHY.set(1, url=endpoint.url)
+                endpoint.failures = 0
+                endpoint.ejections = 0
+                return
+            endpoint.failures += 1
+            # Workers on probation are ejected again on their first failure.
+            if endpoint.failures >= self.eject_after or endpoint.ejections:
+                period = min(
+                    self.max_eject_for, self.eject_for * 2 ** endpoint.ejections
+                )
+                endpoint.ejections += 1
+                endpoint.failures = 0
+                endpoint.ejected_until = self.clock() + period
+                AGENT_EJECTIONS.inc(url=endpoint.url)
+                AGENT_HEALTHY.set(0, url=endpoint.url)
+                bt.logging.warning(
+                    f"Ejecting unhealthy agent server {endpoint.url} for {period:.0f}s"
+                )
+
+    def _endpoint(self, url: str) -> Optional[AgentEndpoint]:
+        url = url.rstrip("/")
+        return next((e for e in self.endpoints if e.url == url), None)
+
+    def eject(self, url: str, period: Optional[float] = None):
+        """
+        Take a worker out of rotation right away, e.g. because its process exited.
+
+        Args:
+            url (str): The URL of the worker.
+            period (float, optional): Seconds until it is back on probation. By default it
+                stays out until `reinstate` is called.
+        """
+        with self._lock:
+            endpoint = self._endpoint(url)
+            if endpoint is None:
+                return
+            endpoint.ejections = max(1, endpoint.ejections)
+            endpoint.failures = 0
+            endpoint.ejected_until = float("inf") if period is None else self.clock() + period
+            AGENT_EJECTIONS.inc(url=endpoint.url)
+            AGENT_HEALTHY.set(0, url=endpoint.url)
+        bt.logging.warning(f"Agent server {url} taken out of rotation")
+
+    def reinstate(self, url: str):
+        """
+        Put a worker back in rotation, e.g. once its restarted process is ready.
+
+        Args:
+            url (str): The URL of the worker.
+        """
+        with self._lock:
+            endpoint = self._endpoint(url)
+            if endpoint is None or not endpoint.ejections:
+                return
+            endpoint.failures = 0
+            endpoint.ejections = 0
+            endpoint.ejected_until = 0.0
+            AGENT_HEALTHY.set(1, url=endpoint.url)
+        bt.logging.info(f"Agent server {url} reinstated")
+
+    def outstanding(self, url: str) -> int:
+        """Return the number of calls in flight on a worker, 0 for unknown URLs."""
+        endpoint = self._endpoint(url)
+        return endpoint.outstanding if endpoint is not None else 0
+
+    def healthy(self) -> List[str]:
+        """Return the URLs of the workers that are not ejected."""
+        now = self.clock()
+        with self._lock:
+            return [e.url for e in self.endpoints if e.ejected_until <= now]
+
+
+class _LoopState:
+    """Connection pool and concurrency limit bound to a single event loop."""
+
+    def __init__(self, max_concurrency: int, timeout: float):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.session = None
+        if aiohttp is not None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=max_concurrency, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            )
+
+
+class AgentClient:
+    """
+    Non-blocking client for the local Quant agent server.
+
+    Requests go over a pooled keep-alive HTTP connection and never block the axon's
+    event loop. When aiohttp is unavailable, or when the agent runs in-process through
+    BitQuant's `subnet_query`, the blocking call is offloaded to a thread pool. Calls are
+    balanced over all configured agent server workers through an `AgentPool`.
+    """
+
+    def __init__(
+        self,
+        base_url: Union[str, List[str]],
+        query_path: str = DEFAULT_QUERY_PATH,
+        stream_path: Optional[str] = None,
+        timeout: float = 60.0,
+        max_concurrency: int = 8,
+        in_process: bool = False,
+        eject_after: int = 3,
+        eject_for: float = 5.0,
+        standby_url: Optional[Union[str, List[str]]] = None,
+    ):
+        """
+        Args:
+            base_url (Union[str, List[str]]): The agent server URL(s), e.g. http://localhost:5000.
+                Several workers are given as a list or a comma-separated string.
+            query_path (str): The path of the query endpoint.
+            stream_path (str, optional): The path of the streaming query endpoint, if the agent
+                server has one. It must answer with newline-delimited JSON `chunk` events
+                followed by a `final` event carrying the usual query response.
+            timeout (float): The total timeout of a single agent call in seconds.
+            max_concurrency (int): The maximum number of concurrent agent calls.
+            in_process (bool): Call BitQuant's `subnet_query` directly instead of the HTTP server.
+            eject_after (int): Consecutive failures after which a worker is ejected.
+            eject_for (float): Seconds a failing worker is first ejected for.
+            standby_url (Union[str, List[str]], optional): The URL(s) of warm standby workers,
+                used only while a regular worker is out of rotation.
+        """
+        self.query_path = query_path
+        self.stream_path = stream_path
+        self.pool = AgentPool(
+            parse_agent_urls(base_url),
+            eject_after=eject_after,
+            eject_for=eject_for,
+            standby_urls=parse_agent_urls(standby_url) if standby_url else None,
+        )
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.subnet_query = load_subnet_query() if in_process else None
+        if in_process and self.subnet_query is None:
+            bt.logging.warning(
+                "In-process agent requested but BitQuant is not available, using the agent server."
+            )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="agent-client"
+        )
+        self._http = requests.Session()
+        self._loops: Dict[asyncio.AbstractEventLoop, _LoopState] = {}
+
+    @classmethod
+    def from_config(cls, config: "bt.Config", default_url: str, standby_url=None) -> "AgentClient":
+        """
+        Build a client from the miner's `agent.*` config.
+
+        Args:
+            config (bt.Config): The miner config.
+            default_url (Union[str, List[str]]): The URL(s) used when `agent.url` is not set.
+            standby_url (Union[str, List[str]], optional): The warm standby URL(s), ignored
+                when `agent.url` is set.
+        """
+        return cls(
+            base_url=config.agent.url or default_url,
+            query_path=config.agent.query_path,
+            stream_path=config.agent.stream_path,
+            timeout=config.agent.timeout,
+            max_concurrency=config.agent.max_concurrency,
+            in_process=config.agent.in_process,
+            eject_after=config.agent.eject_after,
+            eject_for=config.agent.eject_for,
+            standby_url=None if config.agent.url else standby_url,
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = _LoopState(self.max_concurrency, self.timeout)
+            self._loops[loop] = state
+        return state
+
+    @staticmethod
+    def _payload(query: QuantQuery) -> Dict[str, Any]:
+        return {
+            "query": query.query,
+            "userID": query.userID,
+            "metadata": query.metadata,
+        }
+
+    def query_sync(self, query: QuantQuery) -> Optional[QuantResponse]:
+        """
+        Blocking agent call. Used from the thread pool and by synchronous callers.
+
+        Args:
+            query (QuantQuery): The query to answer.
+
+        Returns:
+            Optional[QuantResponse]: The agent's response, or None if the call failed.
+        """
+        start_time = time.perf_counter()
+        if self.subnet_query is not None:
+            result = "error"
+            try:
+                response = self.subnet_query(query)
+                result = "ok"
+                return response
+            except Exception as e:
+                bt.logging.error(f"Agent call failed: {e}")
+                return None
+            finally:
+                AGENT_SECONDS.observe(time.perf_counter() - start_time, mode="in_process", result=result)
+
+        endpoint = self.pool.acquire()
+        ok = False
+        result = "error"
+        try:
+            response = self._http.post(
+                endpoint.url + self.query_path, json=self._payload(query), timeout=self.timeout
+            )
+            # Client errors are the request's fault, not the worker's.
+            ok = response.status_code < 500
+            response.raise_for_status()
+            parsed = parse_agent_response(response.json())
+            result = "ok"
+            return parsed
+        except Exception as e:
+            bt.logging.error(f"Agent call to {endpoint.url} failed: {e}")
+            return None
+        finally:
+            self.pool.release(endpoint, ok)
+            AGENT_SECONDS.observe(time.perf_counter() - start_time, mode="blocking", result=result)
+
+    async def query(self, query: QuantQuery) -> Optional[QuantResponse]:
+        """
+        Answer a query without blocking the event loop.
+
+        Args:
+            query (QuantQuery): The query to answer.
+
+        Returns:
+            Optional[QuantResponse]: The agent's response, or None if the call failed.
+        """
+        state = self._state()
+        async with state.semaphore:
+            if state.session is None or self.subnet_query is not None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor, self.query_sync, query
+                )
+            endpoint = self.pool.acquire()
+            ok = False
+            result = "error"
+            start_time = time.perf_counter()
+            try:
+                async with state.session.post(
+                    endpoint.url + self.query_path, json=self._payload(query)
+                ) as response:
+                    # Client errors are the request's fault, not the worker's.
+                    ok = response.status < 500
+                    response.raise_for_status()
+                    parsed = parse_agent_response(await response.json())
+                    result = "ok"
+                    return parsed
+            except asyncio.CancelledError:
+                # The caller gave up, the worker is not to blame.
+                ok = True
+                result = "cancelled"
+                raise
+            except asyncio.TimeoutError:
+                result = "timeout"
+                bt.logging.error(f"Agent call to {endpoint.url} timed out after {self.timeout}s")
+                return None
+            except Exception as e:
+                bt.logging.error(f"Agent call to {endpoint.url} failed: {e}")
+                return None
+            finally:
+                self.pool.release(endpoint, ok)
+                AGENT_SECONDS.observe(time.perf_counter() - start_time, mode="async", result=result)
+
+    async def stream(self, query: QuantQuery) -> AsyncIterator[Union[str, QuantResponse, None]]:
+        """
+        Answer a query, yielding pieces of the answer as the agent produces them.
+
+        Without a streaming endpoint, or when the agent runs in-process, the complete
+        answer is yielded as a single piece once it is available.
+
+        Args:
+            query (QuantQuery): The query to answer.
+
+        Yields:
+            str: Each piece of the answer, followed by exactly one last item: the complete
+                QuantResponse, or None if the call failed.
+        """
+        state = self._state()
+        if self.stream_path is None or state.session is None or self.subnet_query is not None:
+            response = await self.query(query)
+            if response is not None and response.response:
+                yield response.response
+            yield response
+            return
+
+        async with state.semaphore:
+            endpoint = self.pool.acquire()
+            ok = False
+            final = None
+            streamed = []
+            completed = False
+            result = "error"
+            start_time = time.perf_counter()
+            try:
+                async with state.session.post(
+                    endpoint.url + self.stream_path, json=self._payload(query)
+                ) as response:
+                    # Client errors are the request's fault, not the worker's.
+                    ok = response.status < 500
+                    response.raise_for_status()
+                    async for event in iter_stream_events(response.content):
+                        if event.get("type") == "chunk" and event.get("text"):
+                            streamed.append(event["text"])
+                            yield event["text"]
+                        elif event.get("type") == "final":
+                            final = parse_agent_response(event.get("response") or {})
+                    completed = True
+                    result = "ok"
+            except (asyncio.CancelledError, GeneratorExit):
+                # The caller gave up, the worker is not to blame.
+                ok = True
+                result = "cancelled"
+                raise
+            except asyncio.TimeoutError:
+                result = "timeout"
+                bt.logging.error(f"Agent stream from {endpoint.url} timed out after {self.timeout}s")
+            except Exception as e:
+                bt.logging.error(f"Agent stream from {endpoint.url} failed: {e}")
+            finally:
+                self.pool.release(endpoint, ok)
+                AGENT_SECONDS.observe(time.perf_counter() - start_time, mode="stream", result=result)
+
+        if final is None and streamed and completed:
+            # The agent finished without a final event, keep what it produced.
+            final = QuantResponse(
+                response="".join(streamed), signature=b"", proofs=[], metadata={}
+            )
+        yield final
+
+    async def aclose(self):
+        """Close the connection pool of the current event loop."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None and state.session is not None:
+            await state.session.close()
+
+    def close(self):
+        """Release the thread pool and the blocking HTTP session."""
+        self._executor.shutdown(wait=False)
+        self._http.close()
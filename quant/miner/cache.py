@@ -0,0 +1,300 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import json
+import time
+import asyncio
+import threading
+import concurrent.futures
+import bittensor as bt
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from quant.protocol import QuantQuery, QuantResponse
+from quant.utils.questions import categorize_question
+
+# Default time-to-live of cached answers per question category, in seconds.
+# Market data moves quickly; portfolio answers are keyed by wallet (userID) anyway.
+DEFAULT_CATEGORY_TTLS = {
+    "portfolio": 300.0,
+    "yield": 300.0,
+    "trading": 60.0,
+    "investment": 120.0,
+    "token_risk": 600.0,
+    "other": 60.0,
+}
+
+# Result of a shared fetch whose caller failed for reasons of its own, see `AnswerCache.fetch`.
+_RETRY = object()
+
+# Metadata keys that identify the caller rather than change the answer.
+IRRELEVANT_METADATA_KEYS = frozenset({"validator_id"})
+
+CacheKey = Tuple[str, str, str]
+
+
+def parse_category_ttls(spec: Optional[str]) -> Dict[str, float]:
+    """
+    Parse per-category TTL overrides of the form "trading=30,portfolio=600".
+
+    Args:
+        spec (str, optional): The comma-separated overrides.
+
+    Returns:
+        Dict[str, float]: The default TTLs updated with the overrides.
+    """
+    ttls = dict(DEFAULT_CATEGORY_TTLS)
+    if not spec:
+        return ttls
+    for item in spec.split(","):
+        category, _, seconds = item.partition("=")
+        if not seconds:
+            raise ValueError(f"Invalid category TTL: {item!r}")
+        ttls[category.strip()] = float(seconds)
+    return ttls
+
+
+class _Entry:
+    __slots__ = ("response", "fetched_at", "ttl", "category", "query")
+
+    def __init__(self, response: QuantResponse, fetched_at: float, ttl: float, category: str, query: QuantQuery):
+        self.response = response
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+        self.category = category
+        self.query = query
+
+
+class AnswerCache:
+    """
+    LRU cache of agent answers keyed by (query, userID, relevant metadata).
+
+    Entries younger than their category TTL are served as fresh. Entries within the
+    additional `stale_ttl` window are served immediately while a single background
+    refresh fetches a new answer (stale-while-revalidate). Concurrent misses for the
+    same key share one agent call, including across event loops and threads. When that
+    call fails for reasons of its caller's own (it was cancelled, or raised one of the
+    `caller_errors`, e.g. it was not admitted), the callers sharing it fetch again instead.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        category_ttls: Optional[Dict[str, float]] = None,
+        stale_ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+        caller_errors: Tuple[Type[BaseException], ...] = (),
+    ):
+        """
+        Args:
+            max_entries (int): The maximum number of cached answers.
+            category_ttls (Dict[str, float], optional): TTL in seconds per question category.
+            stale_ttl (float): How long past its TTL an answer may still be served while it is refreshed.
+            clock (Callable[[], float]): Monotonic time source.
+            caller_errors (Tuple[Type[BaseException], ...]): Errors of a fetch that are specific to
+                its caller rather than to the query, and are not shared with concurrent fetches.
+        """
+        self.max_entries = max_entries
+        self.category_ttls = category_ttls or dict(DEFAULT_CATEGORY_TTLS)
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self.caller_errors = caller_errors
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._inflight: Dict[CacheKey, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._background = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+
+    @classmethod
+    def from_config(cls, config: "bt.Config", **kwargs) -> "AnswerCache":
+        """Build a cache from the miner's `cache.*` config, `kwargs` are passed to the constructor."""
+        return cls(
+            max_entries=config.cache.max_entries,
+            category_ttls=parse_category_ttls(config.cache.ttls),
+            stale_ttl=config.cache.stale_ttl,
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(query: QuantQuery) -> CacheKey:
+        """Return the cache key of a query."""
+        metadata = {
+            k: v
+            for k, v in (query.metadata or {}).items()
+            if k not in IRRELEVANT_METADATA_KEYS
+        }
+        return (
+            query.query,
+            query.userID,
+            json.dumps(metadata, sort_keys=True, default=str),
+        )
+
+    def ttl_for(self, query: QuantQuery) -> Tuple[str, float]:
+        """Return the category and TTL of a query."""
+        category = categorize_question(query.query)
+        return category, self.category_ttls.get(
+            category, self.category_ttls.get("other", 0.0)
+        )
+
+    def lookup(self, query: QuantQuery) -> Tuple[Optional[QuantResponse], str]:
+        """
+        Look up a cached answer without fetching.
+
+        Args:
+            query (QuantQuery): The query.
+
+        Returns:
+            Tuple[Optional[QuantResponse], str]: A copy of the cached answer (or None) and
+                its state: "fresh", "stale" or "miss".
+        """
+        key = self.key(query)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, "miss"
+            age = now - entry.fetched_at
+            if age > entry.ttl + self.stale_ttl:
+                del self._entries[key]
+                return None, "miss"
+            self._entries.move_to_end(key)
+            state = "fresh" if age <= entry.ttl else "stale"
+            # Callers mutate the response (e.g. to add their miner_id), so hand out copies.
+            return entry.response.model_copy(deep=True), state
+
+    def put(self, query: QuantQuery, response: QuantResponse):
+        """
+        Store an answer.
+
+        Args:
+            query (QuantQuery): The query that was answered.
+            response (QuantResponse): The agent's answer.
+        """
+        category, ttl = self.ttl_for(query)
+        if ttl <= 0:
+            return
+        entry = _Entry(response.model_copy(deep=True), self.clock(), ttl, category, query)
+        key = self.key(query)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def age(self, query: QuantQuery) -> Optional[float]:
+        """Return how old the cached answer for a query is, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(self.key(query))
+            return None if entry is None else self.clock() - entry.fetched_at
+
+    async def fetch(
+        self,
+        query: QuantQuery,
+        fetch: Callable[[QuantQuery], Awaitable[Optional[QuantResponse]]],
+    ) -> Optional[QuantResponse]:
+        """
+        Fetch and cache a new answer, sharing the call with concurrent fetches of the same key.
+
+        Args:
+            query (QuantQuery): The query to answer.
+            fetch (Callable): Coroutine function computing an answer.
+
+        Returns:
+            Optional[QuantResponse]: The answer, or None if it could not be computed.
+        """
+        key = self.key(query)
+        while True:
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = concurrent.futures.Future()
+                    self._inflight[key] = future
+            if leader:
+                break
+            # Shielded, a follower giving up must not cancel the shared call.
+            response = await asyncio.shield(asyncio.wrap_future(future))
+            if response is not _RETRY:
+                return None if response is None else response.model_copy(deep=True)
+            # The leader failed for reasons of its own, fetch again on our behalf.
+
+        try:
+            response = await fetch(query)
+        except (asyncio.CancelledError, *self.caller_errors):
+            self._forget(key, future)
+            future.set_result(_RETRY)
+            raise
+        except BaseException as e:
+            self._forget(key, future)
+            future.set_exception(e)
+            raise
+        if response is not None:
+            self.put(query, response)
+        self._forget(key, future)
+        future.set_result(None if response is None else response.model_copy(deep=True))
+        return response
+
+    def _forget(self, key: CacheKey, future: concurrent.futures.Future):
+        """Stop sharing a call, unless another one took its place."""
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _refresh(self, query: QuantQuery, fetch):
+        try:
+            self.stats["refreshes"] += 1
+            await self.fetch(query, fetch)
+        except Exception as e:
+            bt.logging.debug(f"Background refresh failed for {query.query!r}: {e}")
+
+    def refresh_in_background(self, query: QuantQuery, fetch):
+        """Schedule a refresh of a query on the running event loop, unless one is already running."""
+        with self._lock:
+            if self.key(query) in self._inflight:
+                return
+        task = asyncio.get_running_loop().create_task(self._refresh(query, fetch))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_or_fetch(
+        self,
+        query: QuantQuery,
+        fetch: Callable[[QuantQuery], Awaitable[Optional[QuantResponse]]],
+    ) -> Optional[QuantResponse]:
+        """
+        Return a cached answer, or fetch and cache a new one.
+
+        Args:
+            query (QuantQuery): The query to answer.
+            fetch (Callable): Coroutine function computing an answer, e.g. `AgentClient.query`.
+
+        Returns:
+            Optional[QuantResponse]: The answer, or None if it could not be computed.
+        """
+        response, state = self.lookup(query)
+        if state == "fresh":
+            self.stats["hits"] += 1
+            return response
+        if state == "stale":
+            self.stats["stale_hits"] += 1
+            self.refresh_in_background(query, fetch)
+            return response
+        self.stats["misses"] += 1
+        return await self.fetch(query, fetch)
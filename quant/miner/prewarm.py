@@ -0,0 +1,211 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import time
+import asyncio
+import threading
+import bittensor as bt
+from typing import Callable, Dict, List, Optional
+
+from quant.protocol import QuantQuery
+from quant.miner.cache import AnswerCache
+from quant.utils.questions import questions, default_user_id, validator_query_metadata
+
+
+def system_load() -> float:
+    """Return the 1-minute load average per CPU, or 0.0 where it is unavailable."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+def parse_user_ids(spec: Optional[str]) -> List[str]:
+    """
+    Parse the userIDs to pre-warm answers for.
+
+    Args:
+        spec (str, optional): Comma-separated userIDs. Defaults to $SOLANA_WALLET or the
+            validators' default wallet.
+
+    Returns:
+        List[str]: The userIDs.
+    """
+    if spec:
+        return [user_id.strip() for user_id in spec.split(",") if user_id.strip()]
+    return [os.getenv("SOLANA_WALLET") or default_user_id]
+
+
+class PrewarmScheduler:
+    """
+    Keeps the answer cache warm for the public validator question bank.
+
+    A background thread with its own event loop periodically walks every question for
+    every configured userID, stalest first, and refreshes the answers that are missing
+    or close to their TTL. It only uses a small agent concurrency budget and backs off
+    while the miner is serving validators or the host is loaded, so validator traffic
+    always takes precedence.
+    """
+
+    def __init__(
+        self,
+        cache: AnswerCache,
+        agent_client,
+        user_ids: Optional[List[str]] = None,
+        concurrency: int = 1,
+        interval: float = 30.0,
+        refresh_ahead: float = 0.8,
+        max_load: float = 0.75,
+        is_busy: Optional[Callable[[], bool]] = None,
+        load: Callable[[], float] = system_load,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Args:
+            cache (AnswerCache): The cache to fill.
+            agent_client (AgentClient): The client used to compute answers.
+            user_ids (List[str], optional): The userIDs to warm answers for.
+            concurrency (int): The maximum number of concurrent pre-warm agent calls.
+            interval (float): Seconds between two scans of the question bank.
+            refresh_ahead (float): Refresh answers older than this fraction of their TTL.
+            max_load (float): Pause while the load average per CPU is above this value.
+            is_busy (Callable[[], bool], optional): Returns True while the miner is serving requests.
+            load (Callable[[], float]): Returns the load average per CPU.
+            poll_interval (float): Seconds between two checks of the budget and of `should_exit`.
+        """
+        self.cache = cache
+        self.agent_client = agent_client
+        self.user_ids = user_ids or parse_user_ids(None)
+        self.concurrency = concurrency
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.max_load = max_load
+        self.is_busy = is_busy or (lambda: False)
+        self.load = load
+        self.poll_interval = poll_interval
+        self.freshness: Dict[tuple, Dict] = {}
+        self.should_exit = False
+        self.thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: "bt.Config", cache: AnswerCache, agent_client, is_busy=None) -> "PrewarmScheduler":
+        """Build a scheduler from the miner's `prewarm.*` config."""
+        return cls(
+            cache,
+            agent_client,
+            user_ids=parse_user_ids(config.prewarm.user_ids),
+            concurrency=config.prewarm.concurrency,
+            interval=config.prewarm.interval,
+            refresh_ahead=config.prewarm.refresh_ahead,
+            max_load=config.prewarm.max_load,
+            is_busy=is_busy,
+        )
+
+    def queries(self) -> List[QuantQuery]:
+        """Return every query a validator can send, for every configured userID."""
+        return [
+            QuantQuery(query=question, userID=user_id, metadata=dict(validator_query_metadata))
+            for user_id in self.user_ids
+            for question in questions
+        ]
+
+    def due(self) -> List[QuantQuery]:
+        """Return the queries whose answers are missing or due for a refresh, stalest first."""
+        due = []
+        for query in self.queries():
+            _, ttl = self.cache.ttl_for(query)
+            if ttl <= 0:
+                continue
+            age = self.cache.age(query)
+            if age is None:
+                due.append((float("inf"), query))
+            elif age >= ttl * self.refresh_ahead:
+                due.append((age / ttl, query))
+        due.sort(key=lambda item: item[0], reverse=True)
+        return [query for _, query in due]
+
+    def _over_budget(self) -> bool:
+        return self.is_busy() or self.load() > self.max_load
+
+    async def _warm(self, query: QuantQuery, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            # Yield to validator traffic and other load before spending agent time.
+            while not self.should_exit and self._over_budget():
+                await asyncio.sleep(self.poll_interval)
+            if self.should_exit:
+                return
+            start_time = time.time()
+            response = None
+            try:
+                response = await self.cache.fetch(query, self.agent_client.query)
+            except Exception as e:
+                bt.logging.debug(f"Pre-warming {query.query!r} failed: {e}")
+            self.freshness[AnswerCache.key(query)] = {
+                "warmed_at": time.time(),
+                "duration": time.time() - start_time,
+                "ok": response is not None,
+            }
+
+    async def run_once(self) -> int:
+        """
+        Warm every due answer once.
+
+        Returns:
+            int: The number of queries that were due.
+        """
+        due = self.due()
+        if due:
+            bt.logging.debug(f"Pre-warming {len(due)} answers")
+            semaphore = asyncio.Semaphore(self.concurrency)
+            await asyncio.gather(*(self._warm(query, semaphore) for query in due))
+        return len(due)
+
+    async def _run(self):
+        try:
+            while not self.should_exit:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    bt.logging.error(f"Pre-warm scan failed: {e}")
+                slept = 0.0
+                while not self.should_exit and slept < self.interval:
+                    await asyncio.sleep(self.poll_interval)
+                    slept += self.poll_interval
+        finally:
+            # The agent client keeps a connection pool per event loop, release ours.
+            await self.agent_client.aclose()
+
+    def start(self):
+        """Start pre-warming in a background thread."""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        bt.logging.info(
+            f"Starting answer pre-warming for {len(questions)} questions and {len(self.user_ids)} userIDs"
+        )
+        self.should_exit = False
+        self.thread = threading.Thread(
+            target=asyncio.run, args=(self._run(),), daemon=True, name="prewarm"
+        )
+        self.thread.start()
+
+    def stop(self):
+        """Stop pre-warming."""
+        self.should_exit = True
+        if self.thread is not None:
+            self.thread.join(5)
+            self.thread = None
@@ -5,6 +5,8 @@ import random
 import bittensor as bt
 
 from typing import List
+from unittest.mock import patch
+from bittensor.utils import networking
 
 
 class MockSubtensor(bt.MockSubtensor):
@@ -34,6 +36,14 @@ class MockSubtensor(bt.MockSubtensor):
                 stake=100000,
             )
 
+    # bt.MockSubtensor keeps its chain state in `chain_state`, but these calls still go to its
+    # MagicMock substrate, which says every subnet exists and fails to decode neurons.
+    def subnet_exists(self, netuid: int, block=None) -> bool:
+        return netuid in self.chain_state["SubtensorModule"]["NetworksAdded"]
+
+    def serve_axon(self, netuid: int, axon: "bt.axon", **kwargs) -> bool:
+        return True
+
 
 class MockMetagraph(bt.metagraph):
     def __init__(self, netuid=1, network="mock", subtensor=None):
@@ -50,6 +60,16 @@ class MockMetagraph(bt.metagraph):
         bt.logging.info(f"Metagraph: {self}")
         bt.logging.info(f"Axons: {self.axons}")
 
+    # bt.MockSubtensor has no runtime API: stakes come from the registered neurons, and
+    # there is no extra subnet information to apply.
+    def _get_all_stakes_from_chain(self, block: int):
+        self.total_stake = self.stake = self._create_tensor(
+            [float(neuron.stake) for neuron in self.neurons], dtype=self._dtype_registry["float32"]
+        )
+
+    def _apply_metagraph_info(self, block: int):
+        pass
+
 
 class MockDendrite(bt.dendrite):
     """
@@ -57,7 +77,9 @@ class MockDendrite(bt.dendrite):
     """
 
     def __init__(self, wallet):
-        super().__init__(wallet)
+        # The mock network is local, do not look the external IP up online.
+        with patch.object(networking, "get_external_ip", return_value="127.0.0.1"):
+            super().__init__(wallet)
 
     async def forward(
         self,
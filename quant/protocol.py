@@ -15,9 +15,12 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
+import json
+import base64
 import typing
 import bittensor as bt
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+from starlette.responses import StreamingResponse
 
 class QuantQuery(BaseModel):
     """
@@ -102,3 +105,169 @@ class QuantSynapse(bt.Synapse):
         QuantResponse("response_data", b'signature', [b'proof1'], {})
         """
         return self.response
+
+
+def encode_stream_chunk(text: str) -> bytes:
+    """
+    Encode a piece of the answer as a line of the streaming wire format.
+
+    The stream is newline-delimited JSON: any number of
+    `{"type": "chunk", "text": ...}` events followed by one
+    `{"type": "final", "response": {...}}` event carrying the complete QuantResponse.
+    """
+    return json.dumps({"type": "chunk", "text": text}).encode("utf-8") + b"\n"
+
+
+def encode_stream_final(response: QuantResponse) -> bytes:
+    """Encode the complete response as the last line of the streaming wire format."""
+    payload = {
+        "response": response.response,
+        "signature": base64.b64encode(response.signature).decode("ascii"),
+        "proofs": [base64.b64encode(proof).decode("ascii") for proof in response.proofs],
+        "metadata": response.metadata,
+    }
+    return json.dumps({"type": "final", "response": payload}, default=str).encode("utf-8") + b"\n"
+
+
+def decode_stream_final(payload: dict) -> QuantResponse:
+    """Decode the QuantResponse carried by a final streaming event."""
+    return QuantResponse(
+        response=payload.get("response", ""),
+        signature=base64.b64decode(payload.get("signature") or ""),
+        proofs=[base64.b64decode(proof) for proof in payload.get("proofs") or []],
+        metadata=payload.get("metadata") or {},
+    )
+
+
+class QuantStreamingSynapse(bt.StreamingSynapse):
+    """
+    Streaming variant of QuantSynapse.
+
+    The miner sends the answer as it is produced, so validators and API clients see
+    the first bytes long before the agent has finished. Chunks are accumulated in
+    `completion`; the final event fills `response` with the same QuantResponse a
+    QuantSynapse would carry, including signature and proofs.
+
+    Attributes:
+    - query: A QuantQuery object representing the input request sent by the validator.
+    - completion: The text streamed so far.
+    - response: The complete QuantResponse, filled once the stream has finished.
+    - time_to_first_byte: Seconds until the first chunk arrived, measured by the receiving client.
+    """
+
+    model_config = {"arbitrary_types_allowed": True, "validate_assignment": True}
+
+    # Required request input, filled by sending dendrite caller.
+    query: typing.Optional[QuantQuery] = None
+
+    # Streamed output, filled as chunks arrive.
+    completion: str = ""
+
+    # Complete output, filled by the final event of the stream.
+    response: typing.Optional[QuantResponse] = None
+
+    # Seconds from sending the request to the first chunk, filled by the consumer.
+    time_to_first_byte: typing.Optional[float] = None
+
+    # Error message of a rejected request, whose body is JSON instead of a stream.
+    _error_message: typing.Optional[str] = PrivateAttr(default=None)
+
+    async def process_streaming_response(self, response: StreamingResponse):
+        """
+        Decode the newline-delimited JSON events of the stream.
+
+        Args:
+            response: The aiohttp response of the axon.
+
+        Yields:
+            str: Each piece of the answer as it arrives.
+        """
+        if self.completion is None:
+            self.completion = ""
+        buffer = b""
+        async for data in response.content.iter_any():
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                text = self._process_line(line)
+                if text:
+                    yield text
+        text = self._process_line(buffer)
+        if text:
+            yield text
+
+    def _process_line(self, line: bytes) -> typing.Optional[str]:
+        if not line.strip():
+            return None
+        try:
+            event = json.loads(line)
+        except ValueError:
+            bt.logging.debug(f"Ignoring malformed stream line: {line[:100]!r}")
+            return None
+        if not isinstance(event, dict):
+            return None
+        if event.get("type") == "chunk":
+            text = event.get("text") or ""
+            self.completion += text
+            return text
+        if event.get("type") == "final":
+            self.response = decode_stream_final(event.get("response") or {})
+            if not self.completion:
+                self.completion = self.response.response
+        elif "message" in event:
+            # Error responses from the axon are a plain JSON object.
+            self._error_message = event["message"]
+        return None
+
+    def extract_response_json(self, response: StreamingResponse) -> dict:
+        """
+        Extract the header information of the response, used by the dendrite to fill the
+        synapse's terminal info.
+
+        Args:
+            response: The aiohttp response of the axon.
+
+        Returns:
+            dict: The response metadata and the streamed fields.
+        """
+        headers = {
+            k.decode("utf-8"): v.decode("utf-8")
+            for k, v in response.__dict__["_raw_headers"]
+        }
+
+        def extract_info(prefix):
+            return {
+                key.split("_")[-1]: value
+                for key, value in headers.items()
+                if key.startswith(prefix)
+            }
+
+        # The dendrite rebuilds the synapse from this dict, so it carries every field.
+        extracted = {
+            "name": headers.get("name", ""),
+            "timeout": float(headers.get("timeout", 0)),
+            "total_size": int(headers.get("total_size", 0)),
+            "header_size": int(headers.get("header_size", 0)),
+            "dendrite": extract_info("bt_header_dendrite"),
+            "axon": extract_info("bt_header_axon"),
+            "query": self.query,
+            "completion": self.completion,
+            "response": self.response,
+            "time_to_first_byte": self.time_to_first_byte,
+        }
+        if self._error_message is not None:
+            extracted["message"] = self._error_message
+        return extracted
+
+    def deserialize(self) -> typing.Optional[QuantResponse]:
+        """
+        Return the complete response, like QuantSynapse.deserialize.
+
+        If the stream was cut before its final event, the text received so far is
+        returned without signature or proofs.
+        """
+        if self.response is None and self.completion:
+            return QuantResponse(
+                response=self.completion, signature=b"", proofs=[], metadata={}
+            )
+        return self.response
@@ -1,3 +1,7 @@
 from . import config
 from . import misc
 from . import uids
+from . import metrics
+from . import device
+from . import startup
+from . import metagraph_snapshot
@@ -0,0 +1,167 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import threading
+import bittensor as bt
+from typing import Callable, Optional
+
+from quant.utils import metrics
+
+# Target block time of the chain, in seconds.
+BLOCK_TIME = 12.0
+
+BLOCK_FETCHES = metrics.counter(
+    "quant_block_clock_fetches_total", "Block numbers fetched from the chain by the block clock, by result.", ("result",)
+)
+BLOCK_DRIFT = metrics.counter(
+    "quant_block_clock_corrections_total", "Fetches where the extrapolated block was off and the clock was re-anchored."
+)
+
+
+class BlockClock:
+    """
+    Local estimate of the current block.
+
+    The clock anchors on a block number fetched from the chain and extrapolates from it
+    with the block time, so reading the block costs no RPC. It re-fetches the real block
+    every `sync_interval` seconds and whenever a caller waits for a target block, and
+    re-anchors when the extrapolation has drifted. Until the first re-anchor the estimate
+    may lag the chain by up to one block, never lead it.
+    """
+
+    def __init__(
+        self,
+        fetch_block: Callable[[], int],
+        block_time: float = BLOCK_TIME,
+        sync_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            fetch_block (Callable[[], int]): Returns the current block from the chain, e.g. `subtensor.get_current_block`.
+            block_time (float): Seconds per block.
+            sync_interval (float): Maximum seconds between two fetches of the real block.
+            clock (Callable[[], float]): Monotonic time source.
+            sleep (Callable[[float], None]): Sleep function used while waiting for a block.
+        """
+        self.fetch_block = fetch_block
+        self.block_time = block_time
+        self.sync_interval = sync_interval
+        self.clock = clock
+        self.sleep = sleep
+        self._anchor_block: Optional[int] = None
+        self._anchor_time = 0.0
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def _extrapolate(self, now: float) -> int:
+        return self._anchor_block + int((now - self._anchor_time) // self.block_time)
+
+    def sync(self) -> int:
+        """
+        Fetch the real block and correct the clock.
+
+        Returns:
+            int: The fetched block, or the extrapolated one if the fetch failed after the
+                clock was anchored.
+        """
+        try:
+            block = int(self.fetch_block())
+        except Exception as e:
+            BLOCK_FETCHES.inc(result="error")
+            with self._lock:
+                if self._anchor_block is None:
+                    raise
+                # Keep extrapolating, retry at the next interval.
+                self._synced_at = self.clock()
+                bt.logging.warning(f"Failed to fetch the current block, extrapolating: {e}")
+                return self._extrapolate(self._synced_at)
+        BLOCK_FETCHES.inc(result="ok")
+
+        now = self.clock()
+        with self._lock:
+            if self._anchor_block is None or self._extrapolate(now) != block:
+                if self._anchor_block is not None:
+                    BLOCK_DRIFT.inc()
+                    bt.logging.trace(
+                        f"Block clock drifted: estimated {self._extrapolate(now)}, chain is at {block}"
+                    )
+                # The block started at or before now.
+                self._anchor_block = block
+                self._anchor_time = now
+            self._synced_at = now
+            return block
+
+    @property
+    def block(self) -> int:
+        """The current block, fetched from the chain only when the last fetch is too old."""
+        now = self.clock()
+        if self._anchor_block is None or now - self._synced_at >= self.sync_interval:
+            return self.sync()
+        with self._lock:
+            return self._extrapolate(now)
+
+    def time_until(self, target_block: int) -> float:
+        """
+        Estimate the seconds until `target_block` is reached.
+
+        Args:
+            target_block (int): The block to wait for.
+
+        Returns:
+            float: The estimated seconds, 0.0 if the block is already reached.
+        """
+        current = self.block
+        if current >= target_block:
+            return 0.0
+        with self._lock:
+            reached_at = self._anchor_time + (target_block - self._anchor_block) * self.block_time
+        return max(0.0, reached_at - self.clock())
+
+    def wait_until(
+        self,
+        target_block: int,
+        should_exit: Optional[Callable[[], bool]] = None,
+        poll: float = 1.0,
+    ) -> int:
+        """
+        Sleep until the chain reaches `target_block`.
+
+        The wait is computed locally; the real block is fetched once the estimate says the
+        target is reached, and the wait continues if the chain is behind.
+
+        Args:
+            target_block (int): The block to wait for.
+            should_exit (Callable[[], bool], optional): Checked every `poll` seconds to abort the wait.
+            poll (float): Maximum seconds between two `should_exit` checks.
+
+        Returns:
+            int: The block when the wait ended, lower than the target only if aborted.
+        """
+        while True:
+            if should_exit is not None and should_exit():
+                return self.block
+            remaining = self.time_until(target_block)
+            if remaining <= 0:
+                block = self.sync()
+                if block >= target_block:
+                    return block
+                # The chain is slower than the clock, check again shortly.
+                remaining = self.block_time / 4
+            self.sleep(min(remaining, poll) if should_exit is not None else remaining)
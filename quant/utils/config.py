@@ -16,28 +16,10 @@
 # DEALINGS IN THE SOFTWARE.
 
 import os
-import subprocess
 import argparse
 import bittensor as bt
 from .logging import setup_events_logger
-
-
-def is_cuda_available():
-    try:
-        output = subprocess.check_output(
-            ["nvidia-smi", "-L"], stderr=subprocess.STDOUT
-        )
-        if "NVIDIA" in output.decode("utf-8"):
-            return "cuda"
-    except Exception:
-        pass
-    try:
-        output = subprocess.check_output(["nvcc", "--version"]).decode("utf-8")
-        if "release" in output:
-            return "cuda"
-    except Exception:
-        pass
-    return "cpu"
+from .device import AUTO, is_cuda_available  # noqa: F401
 
 
 def check_config(cls, config: "bt.Config"):
@@ -76,8 +58,8 @@ def add_args(cls, parser):
     parser.add_argument(
         "--neuron.device",
         type=str,
-        help="Device to run on.",
-        default=is_cuda_available(),
+        help="Device to run on. 'auto' detects CUDA on first use; the $QUANT_DEVICE environment variable overrides it.",
+        default=AUTO,
     )
 
     parser.add_argument(
@@ -87,6 +69,48 @@ def add_args(cls, parser):
         default=100,
     )
 
+    parser.add_argument(
+        "--neuron.block_sync_interval",
+        type=float,
+        help="Maximum seconds between two fetches of the current block; in between it is extrapolated locally.",
+        default=60.0,
+    )
+
+    parser.add_argument(
+        "--neuron.metagraph_snapshot_off",
+        action="store_true",
+        help="Always sync the metagraph at startup instead of starting from the snapshot saved by the previous run.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.metagraph_snapshot_max_age",
+        type=float,
+        help="Seconds after which the metagraph snapshot is too old to start from.",
+        default=24 * 60 * 60,
+    )
+
+    parser.add_argument(
+        "--neuron.profile_startup",
+        action="store_true",
+        help="Write a phase-by-phase timeline of the startup to a JSON report.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.profile_startup_path",
+        type=str,
+        help="Path of the startup report, startup_profile.json in the neuron's directory by default.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--neuron.metrics_port",
+        type=int,
+        help="Port of the local Prometheus /metrics endpoint. 0 disables it.",
+        default=0,
+    )
+
     parser.add_argument(
         "--mock",
         action="store_true",
@@ -154,6 +178,284 @@ def add_miner_args(cls, parser):
         default=False,
     )
 
+    parser.add_argument(
+        "--agent.url",
+        type=str,
+        help="URL of the Quant agent server, or a comma-separated list of worker URLs. Defaults to the locally managed server pool.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--agent.query_path",
+        type=str,
+        help="Path of the agent server endpoint that answers subnet queries.",
+        default="/api/subnet/query",
+    )
+
+    parser.add_argument(
+        "--agent.stream_path",
+        type=str,
+        help="Path of the agent server endpoint that streams answers as newline-delimited JSON. "
+        "If unset, streamed answers are sent once the agent has finished.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--agent.timeout",
+        type=float,
+        help="Timeout of a single agent call in seconds.",
+        default=60.0,
+    )
+
+    parser.add_argument(
+        "--agent.max_concurrency",
+        type=int,
+        help="Maximum number of concurrent agent calls.",
+        default=8,
+    )
+
+    parser.add_argument(
+        "--agent.in_process",
+        action="store_true",
+        help="If set, call BitQuant's subnet_query in-process (in a thread pool) instead of the agent server.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--agent.workers",
+        type=int,
+        help="Number of local Quant agent server workers to run, on consecutive ports from --agent.base_port. "
+        "Each worker gets its port in $PORT; the miner stops if a worker listens on another port.",
+        default=1,
+    )
+
+    parser.add_argument(
+        "--agent.base_port",
+        type=int,
+        help="Port of the first local Quant agent server worker.",
+        default=5000,
+    )
+
+    parser.add_argument(
+        "--agent.pin_cpus",
+        action="store_true",
+        help="If set, pin each local Quant agent server worker to its own share of the CPUs.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--agent.eject_after",
+        type=int,
+        help="Consecutive failed calls after which an agent server worker is taken out of rotation.",
+        default=3,
+    )
+
+    parser.add_argument(
+        "--agent.eject_for",
+        type=float,
+        help="Seconds a failing agent server worker is first taken out of rotation, doubling on repeated failures.",
+        default=5.0,
+    )
+
+    parser.add_argument(
+        "--agent.standby",
+        action="store_true",
+        help="If set, run a warm standby Quant agent server on the port after the workers, "
+        "taking traffic as soon as a worker fails.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--agent.restart_backoff",
+        type=float,
+        help="Seconds before a crashed Quant agent server worker is first restarted, doubling on repeated crashes.",
+        default=1.0,
+    )
+
+    parser.add_argument(
+        "--agent.max_restart_backoff",
+        type=float,
+        help="Upper bound of the restart backoff, and the retry period of crash-looping workers.",
+        default=60.0,
+    )
+
+    parser.add_argument(
+        "--agent.crash_loop_restarts",
+        type=int,
+        help="Crashes within --agent.crash_loop_window after which a worker is considered crash-looping.",
+        default=5,
+    )
+
+    parser.add_argument(
+        "--agent.crash_loop_window",
+        type=float,
+        help="Seconds over which the crashes of a Quant agent server worker are counted.",
+        default=300.0,
+    )
+
+    parser.add_argument(
+        "--agent.max_rss_mb",
+        type=float,
+        help="Recycle a Quant agent server worker whose resident memory exceeds this many MiB, 0 to disable.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--agent.max_cpu_percent",
+        type=float,
+        help="Recycle a Quant agent server worker using more than this percentage of a core "
+        "over --agent.cpu_window, 0 to disable.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--agent.max_fds",
+        type=int,
+        help="Recycle a Quant agent server worker with more open file descriptors than this, 0 to disable.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--agent.cpu_window",
+        type=float,
+        help="Seconds over which the CPU use of the Quant agent server workers is measured.",
+        default=60.0,
+    )
+
+    parser.add_argument(
+        "--agent.drain_timeout",
+        type=float,
+        help="Maximum seconds a recycled Quant agent server worker gets to finish its requests.",
+        default=30.0,
+    )
+
+    parser.add_argument(
+        "--agent.log_dir",
+        type=str,
+        help="Directory of the output logs of the local Quant agent server workers.",
+        default="~/.bittensor/quant/agent_server_logs",
+    )
+
+    parser.add_argument(
+        "--agent.log_max_bytes",
+        type=int,
+        help="Size in bytes at which a Quant agent server output log is rotated.",
+        default=10 * 1024 * 1024,
+    )
+
+    parser.add_argument(
+        "--agent.log_backups",
+        type=int,
+        help="Number of rotated Quant agent server output logs to keep per worker.",
+        default=5,
+    )
+
+    parser.add_argument(
+        "--agent.ready_pattern",
+        type=str,
+        help="Regex matching the output line a local Quant agent server prints once it accepts connections, "
+        "e.g. 'Uvicorn running on'. Readiness is otherwise detected by health probes only.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--agent.ready_timeout",
+        type=float,
+        help="Maximum seconds to wait for the local Quant agent server workers to become ready.",
+        default=30.0,
+    )
+
+    parser.add_argument(
+        "--admission.max_concurrency",
+        type=int,
+        help="Maximum number of requests handled by the agent at once. Defaults to --agent.max_concurrency.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--admission.max_queue",
+        type=int,
+        help="Maximum number of requests waiting for the agent before new low-stake requests are rejected.",
+        default=32,
+    )
+
+    parser.add_argument(
+        "--admission.max_wait",
+        type=float,
+        help="Fraction of a request's timeout it may spend waiting for the agent before it is rejected.",
+        default=0.5,
+    )
+
+    parser.add_argument(
+        "--cache.off",
+        action="store_true",
+        help="If set, disable the miner answer cache.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--cache.max_entries",
+        type=int,
+        help="Maximum number of answers kept in the miner answer cache.",
+        default=1024,
+    )
+
+    parser.add_argument(
+        "--cache.ttls",
+        type=str,
+        help="Per-category answer TTL overrides in seconds, e.g. 'trading=30,portfolio=600'.",
+        default="",
+    )
+
+    parser.add_argument(
+        "--cache.stale_ttl",
+        type=float,
+        help="How long past its TTL a cached answer is still served while it is refreshed in the background.",
+        default=600.0,
+    )
+
+    parser.add_argument(
+        "--prewarm.enable",
+        action="store_true",
+        help="If set, periodically pre-compute answers to the validator question bank into the answer cache.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--prewarm.user_ids",
+        type=str,
+        help="Comma-separated userIDs to pre-warm answers for. Defaults to $SOLANA_WALLET or the validators' default wallet.",
+        default="",
+    )
+
+    parser.add_argument(
+        "--prewarm.concurrency",
+        type=int,
+        help="Maximum number of concurrent pre-warm agent calls.",
+        default=1,
+    )
+
+    parser.add_argument(
+        "--prewarm.interval",
+        type=float,
+        help="Seconds between two scans of the question bank.",
+        default=30.0,
+    )
+
+    parser.add_argument(
+        "--prewarm.refresh_ahead",
+        type=float,
+        help="Refresh cached answers once they are older than this fraction of their TTL.",
+        default=0.8,
+    )
+
+    parser.add_argument(
+        "--prewarm.max_load",
+        type=float,
+        help="Pause pre-warming while the load average per CPU is above this value.",
+        default=0.75,
+    )
+
     parser.add_argument(
         "--wandb.project_name",
         type=str,
@@ -186,6 +488,64 @@ def add_validator_args(cls, parser):
         default=10,
     )
 
+    parser.add_argument(
+        "--neuron.streaming",
+        action="store_true",
+        help="If set, query miners with the streaming protocol and log their time to first byte.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.attestation_jitter",
+        type=float,
+        help="Maximum random delay in seconds of the hourly attestation check, so validators do not all "
+        "query the attestation endpoint at the top of the hour.",
+        default=300.0,
+    )
+
+    parser.add_argument(
+        "--neuron.archive_off",
+        action="store_true",
+        help="Do not record the results of the validator forwards in the columnar archive.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.archive_dir",
+        type=str,
+        help="Directory of the forward archive, 'forwards' in the neuron's directory by default.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--neuron.archive_bodies",
+        action="store_true",
+        help="Also archive the response bodies, in a separate file.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.attestation_port",
+        type=int,
+        help="If set, require a valid TEE attestation from every miner, served on this port of its axon IP. "
+        "Miners without one get a reward of 0.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.attestation_concurrency",
+        type=int,
+        help="Maximum number of miner attestations fetched at once.",
+        default=16,
+    )
+
+    parser.add_argument(
+        "--neuron.attestation_timeout",
+        type=float,
+        help="Timeout of a miner attestation request, in seconds.",
+        default=30.0,
+    )
+
     parser.add_argument(
         "--neuron.num_concurrent_forwards",
         type=int,
@@ -256,4 +616,7 @@ def config(cls):
     bt.logging.add_args(parser)
     bt.axon.add_args(parser)
     cls.add_args(parser)
-    return bt.config(parser)
+    built = bt.config(parser)
+    # Remember which class the config was built for, so the neuron can use it without rebuilding it.
+    object.__setattr__(built, "_neuron_class", cls)
+    return built
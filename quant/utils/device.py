@@ -0,0 +1,157 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import json
+import shutil
+import hashlib
+import platform
+import threading
+import subprocess
+import bittensor as bt
+from typing import Optional
+
+# Environment variable forcing the device, e.g. QUANT_DEVICE=cpu, skipping the probe.
+DEVICE_ENV = "QUANT_DEVICE"
+
+# Value of --neuron.device asking for the probed device.
+AUTO = "auto"
+
+# Where probe results are cached across runs, by host fingerprint.
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.bittensor/quant/device_cache.json")
+
+# Maximum seconds a probe command may take.
+PROBE_TIMEOUT = 10
+
+_lock = threading.Lock()
+_device: Optional[str] = None
+
+
+def probe_device() -> str:
+    """
+    Detect whether CUDA is available by running `nvidia-smi`, then `nvcc`.
+
+    Commands missing from the PATH are skipped without spawning a process.
+
+    Returns:
+        str: "cuda" or "cpu".
+    """
+    if shutil.which("nvidia-smi"):
+        try:
+            output = subprocess.check_output(
+                ["nvidia-smi", "-L"], stderr=subprocess.STDOUT, timeout=PROBE_TIMEOUT
+            )
+            if "NVIDIA" in output.decode("utf-8"):
+                return "cuda"
+        except Exception:
+            pass
+    if shutil.which("nvcc"):
+        try:
+            output = subprocess.check_output(["nvcc", "--version"], timeout=PROBE_TIMEOUT).decode("utf-8")
+            if "release" in output:
+                return "cuda"
+        except Exception:
+            pass
+    return "cpu"
+
+
+def host_fingerprint() -> str:
+    """
+    Identify the host and its GPU setup, so a cached probe result is not reused after
+    the hardware, the driver or the CUDA toolkit changed.
+
+    Returns:
+        str: A hex digest.
+    """
+    parts = [platform.node(), platform.machine(), shutil.which("nvidia-smi") or "", shutil.which("nvcc") or ""]
+    try:
+        with open("/proc/driver/nvidia/version") as f:
+            parts.append(f.read())
+    except OSError:
+        parts.append("")
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _read_cache(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(path: str, cache: dict):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        bt.logging.debug(f"Failed to cache the device probe in {path}: {e}")
+
+
+def get_device(cache_path: Optional[str] = DEFAULT_CACHE_PATH) -> str:
+    """
+    Return the device to run on, probing it at most once.
+
+    The result comes from, in order: the QUANT_DEVICE environment variable, the result
+    of an earlier call in this process, the on-disk cache for this host, and the probe.
+
+    Args:
+        cache_path (str, optional): The on-disk cache, None to always probe in a new process.
+
+    Returns:
+        str: The device, e.g. "cuda" or "cpu".
+    """
+    global _device
+    override = os.getenv(DEVICE_ENV)
+    if override:
+        return override
+    with _lock:
+        if _device is not None:
+            return _device
+        fingerprint = host_fingerprint() if cache_path else None
+        cache = _read_cache(cache_path) if cache_path else {}
+        device = cache.get(fingerprint)
+        if device is None:
+            device = probe_device()
+            if cache_path:
+                cache[fingerprint] = device
+                _write_cache(cache_path, cache)
+        _device = device
+        return device
+
+
+def resolve_device(device: Optional[str]) -> str:
+    """
+    Resolve the value of `--neuron.device`, probing only when it is "auto" or unset.
+
+    Args:
+        device (str, optional): The configured device.
+
+    Returns:
+        str: The device to run on.
+    """
+    if not device or device == AUTO:
+        return get_device()
+    return device
+
+
+def is_cuda_available() -> str:
+    """Return "cuda" if CUDA is available, "cpu" otherwise. The result is cached."""
+    return get_device()
@@ -1,16 +1,199 @@
 import os
+import copy
+import gzip
+import json
+import queue
+import atexit
+import shutil
 import logging
-from logging.handlers import RotatingFileHandler
+import datetime
+import threading
+from typing import List, Optional
+from logging.handlers import QueueHandler, RotatingFileHandler
 
 EVENTS_LEVEL_NUM = 38
 DEFAULT_LOG_BACKUP_COUNT = 10
 
+logging.addLevelName(EVENTS_LEVEL_NUM, "EVENT")
+
+# Events waiting to be written; when full, new events are dropped rather than block the caller.
+DEFAULT_EVENTS_QUEUE_SIZE = 10000
+# Maximum events written at once.
+DEFAULT_EVENTS_BATCH_SIZE = 512
+# Seconds between two flushes of the events file when events keep coming.
+DEFAULT_EVENTS_FLUSH_INTERVAL = 1.0
+
+# Running writer of the events file, if events are saved.
+_events_writer: Optional["EventsWriter"] = None
+
+
+def _json_default(value):
+    # numpy scalars and arrays, without importing numpy here.
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class JsonlFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    The object holds the time, the level and the message of the record, and the structured
+    fields of the event, given as a dict message or in `extra={"fields": {...}}`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+        }
+        fields = getattr(record, "fields", None)
+        if isinstance(record.msg, dict):
+            entry.update(record.msg)
+        else:
+            entry["message"] = record.getMessage()
+        if fields:
+            entry.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=_json_default, separators=(",", ":"))
+
+
+class GzipRotatingFileHandler(RotatingFileHandler):
+    """A `RotatingFileHandler` compressing the rotated files, e.g. events.jsonl.1.gz."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source: str, dest: str):
+        with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Enqueues records without ever blocking, counting the records dropped when the queue is full."""
+
+    def __init__(self, queue_):
+        super().__init__(queue_)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Keep dict messages as they are, the writer formats them; only resolve the arguments here.
+        record = copy.copy(record)
+        if not isinstance(record.msg, dict):
+            record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class EventsWriter:
+    """
+    Writes the records of the events logger to a JSONL file from a background thread.
+
+    Logging an event only puts it in a bounded queue. The writer takes the events from the
+    queue in batches, formats them, and writes and flushes each batch at once; rotation and
+    the compression of the rotated file happen on its thread too.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        backup_count: int = DEFAULT_LOG_BACKUP_COUNT,
+        queue_size: int = DEFAULT_EVENTS_QUEUE_SIZE,
+        batch_size: int = DEFAULT_EVENTS_BATCH_SIZE,
+        flush_interval: float = DEFAULT_EVENTS_FLUSH_INTERVAL,
+    ):
+        self.queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue(queue_size)
+        self.handler = GzipRotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+        self.handler.setFormatter(JsonlFormatter())
+        self.queue_handler = _DroppingQueueHandler(self.queue)
+        self.queue_handler.setLevel(EVENTS_LEVEL_NUM)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def dropped(self) -> int:
+        """Number of events dropped because the queue was full."""
+        return self.queue_handler.dropped
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, daemon=True, name="events")
+        self.thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Write the queued events and stop."""
+        if self.thread is None:
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+        self.thread = None
+        self.handler.close()
+
+    def _run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            while record is not None:
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.write(batch)
+            if record is None:
+                return
+
+    def write(self, records: List[logging.LogRecord]):
+        """Write a batch of records, rotating the file first if the batch would not fit."""
+        handler = self.handler
+        try:
+            data = "".join(handler.format(record) + "\n" for record in records)
+            with handler.lock:
+                if handler.stream is None:
+                    handler.stream = handler._open()
+                size = handler.stream.tell()
+                if handler.maxBytes > 0 and size > 0 and size + len(data) > handler.maxBytes:
+                    handler.doRollover()
+                handler.stream.write(data)
+                handler.stream.flush()
+        except Exception:
+            handler.handleError(records[-1])
+
 
 def setup_events_logger(full_path, events_retention_size):
-    logging.addLevelName(EVENTS_LEVEL_NUM, "EVENT")
+    global _events_writer
 
     logger = logging.getLogger("event")
     logger.setLevel(EVENTS_LEVEL_NUM)
+    logger.propagate = False
 
     def event(self, message, *args, **kws):
         if self.isEnabledFor(EVENTS_LEVEL_NUM):
@@ -18,18 +201,37 @@ def setup_events_logger(full_path, events_retention_size):
 
     logging.Logger.event = event
 
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    # Replace the writer of a previous setup, e.g. when a neuron is created again.
+    if _events_writer is not None:
+        logger.removeHandler(_events_writer.queue_handler)
+        _events_writer.stop()
 
-    file_handler = RotatingFileHandler(
-        os.path.join(full_path, "events.log"),
-        maxBytes=events_retention_size,
-        backupCount=DEFAULT_LOG_BACKUP_COUNT,
+    _events_writer = EventsWriter(
+        os.path.join(full_path, "events.jsonl"),
+        max_bytes=int(events_retention_size),
+        backup_count=DEFAULT_LOG_BACKUP_COUNT,
     )
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(EVENTS_LEVEL_NUM)
-    logger.addHandler(file_handler)
+    _events_writer.start()
+    logger.addHandler(_events_writer.queue_handler)
 
     return logger
+
+
+def log_event(event: str, **fields):
+    """
+    Record a structured event, e.g. `log_event("reward", step=1, uid=3, reward=0.5)`.
+
+    Events are only recorded when the events logger is set up, see `--neuron.dont_save_events`.
+
+    Args:
+        event (str): The kind of event.
+        **fields: The fields of the event, JSON-serializable or numpy values.
+    """
+    if _events_writer is not None:
+        logging.getLogger("event").log(EVENTS_LEVEL_NUM, {"event": event, **fields})
+
+
+@atexit.register
+def _stop_events_writer():
+    if _events_writer is not None:
+        _events_writer.stop()
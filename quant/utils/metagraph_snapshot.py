@@ -0,0 +1,130 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import json
+import time
+import dataclasses
+import numpy as np
+import bittensor as bt
+from typing import List, NamedTuple, Optional
+
+# Name of the snapshot file, under `neuron.full_path`.
+SNAPSHOT_NAME = "metagraph.npz"
+
+# Bumped when the layout of the snapshot changes, older snapshots are then ignored.
+SNAPSHOT_VERSION = 1
+
+# Per-UID arrays kept in the snapshot, besides the axons.
+SNAPSHOT_ARRAYS = ("uids", "stake", "alpha_stake", "tao_stake", "total_stake", "validator_permit", "last_update")
+
+
+def save_metagraph_snapshot(metagraph: "bt.metagraph", path: str, chain_endpoint: str):
+    """
+    Save the parts of the metagraph a neuron needs to start: its axons (hence hotkeys),
+    stakes, validator permits, last updates and block.
+
+    Args:
+        metagraph (bt.metagraph): The synced metagraph.
+        path (str): Where to save it, replaced atomically.
+        chain_endpoint (str): The chain it was synced from.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=SNAPSHOT_VERSION,
+                netuid=metagraph.netuid,
+                chain_endpoint=chain_endpoint,
+                saved_at=time.time(),
+                block=np.asarray(metagraph.block).reshape(-1)[:1],
+                axons=json.dumps([dataclasses.asdict(axon) for axon in metagraph.axons]),
+                **{name: np.asarray(getattr(metagraph, name)) for name in SNAPSHOT_ARRAYS},
+            )
+        os.replace(tmp_path, path)
+    except OSError as e:
+        bt.logging.warning(f"Failed to save the metagraph snapshot to {path}: {e}")
+
+
+def load_metagraph_snapshot(path: str, netuid: int, chain_endpoint: str, max_age: float) -> Optional["bt.metagraph"]:
+    """
+    Load a metagraph saved by `save_metagraph_snapshot`.
+
+    Args:
+        path (str): The snapshot.
+        netuid (int): The subnet it must describe.
+        chain_endpoint (str): The chain it must come from.
+        max_age (float): Snapshots older than this many seconds are ignored.
+
+    Returns:
+        bt.metagraph or None: An unsynced metagraph holding the snapshot, None if there is no
+            usable snapshot.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as snapshot:
+            if int(snapshot["version"]) != SNAPSHOT_VERSION:
+                return None
+            if int(snapshot["netuid"]) != netuid or str(snapshot["chain_endpoint"]) != chain_endpoint:
+                return None
+            age = time.time() - float(snapshot["saved_at"])
+            if age > max_age:
+                bt.logging.info(f"Ignoring the metagraph snapshot {path}, it is {age:.0f}s old.")
+                return None
+            metagraph = bt.metagraph(netuid=netuid, network=chain_endpoint, sync=False)
+            metagraph.axons = [bt.AxonInfo(**axon) for axon in json.loads(str(snapshot["axons"]))]
+            for name in SNAPSHOT_ARRAYS:
+                setattr(metagraph, name, snapshot[name])
+            metagraph.block = snapshot["block"]
+            metagraph.n = np.array([len(metagraph.axons)], dtype=np.int64)
+            return metagraph
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        bt.logging.warning(f"Ignoring the unreadable metagraph snapshot {path}: {e}")
+        return None
+
+
+class MetagraphDiff(NamedTuple):
+    """UIDs that changed between two metagraphs."""
+
+    replaced: List[int]
+    """UIDs whose hotkey changed."""
+    added: List[int]
+    """UIDs that did not exist."""
+    axons: List[int]
+    """UIDs whose hotkey is the same but whose axon changed."""
+
+    def __bool__(self):
+        return bool(self.replaced or self.added or self.axons)
+
+
+def metagraph_diff(previous: "bt.metagraph", current: "bt.metagraph") -> MetagraphDiff:
+    """
+    Compare two metagraphs of the same subnet.
+
+    Returns:
+        MetagraphDiff: The UIDs that changed.
+    """
+    replaced, axons = [], []
+    for uid, (before, after) in enumerate(zip(previous.axons, current.axons)):
+        if before.hotkey != after.hotkey:
+            replaced.append(uid)
+        elif before != after:
+            axons.append(uid)
+    added = list(range(len(previous.axons), len(current.axons)))
+    return MetagraphDiff(replaced, added, axons)
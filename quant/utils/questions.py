@@ -2,52 +2,107 @@
 List of questions that can be answered by the crypto analysis document.
 """
 
-questions = [    
+# userID and metadata validators send with every question (see quant/validator/forward.py).
+default_user_id = "5HHSqMvTCvgtzdqFb5BbtYjB8cEiJjf8UZ6p5rQczagL"
+validator_query_metadata = {"Create_Proof": "True", "Type": "Validator_Test"}
+
+# Questions grouped by category. Categories drive per-category behaviour such as
+# how long a miner may cache an answer.
+question_categories = {
     # Portfolio Analytics questions
-    "Can you analyze my portfolio's rolling volatility and identify which assets are contributing most to risk?",
-    "How do the volatility trends of my top portfolio assets compare over the last 90 days?",
-    "Provide insights on my portfolio holdings and how I can better diversify?",
-    "What's my current portfolio risk assessment and how can I optimize for a better risk-return ratio?",
-    "What's the maximum drawdown for my current portfolio and how does it compare to market benchmarks?",
-    "Evaluate my portfolio risk",
+    "portfolio": [
+        "Can you analyze my portfolio's rolling volatility and identify which assets are contributing most to risk?",
+        "How do the volatility trends of my top portfolio assets compare over the last 90 days?",
+        "Provide insights on my portfolio holdings and how I can better diversify?",
+        "What's my current portfolio risk assessment and how can I optimize for a better risk-return ratio?",
+        "What's the maximum drawdown for my current portfolio and how does it compare to market benchmarks?",
+        "Evaluate my portfolio risk",
+    ],
     # Yield questions
-    "How can I earn the best yield on USDC?",
-    "How can I earn the best yield on SOL?",
-    "How can I earn the best yield on USDT?",
-    "How can I earn the best yield on JTO?",
-    "How can I earn the best yield on JLP?",
-    "How can I earn the best yield on cbBTC?",
-    "How can I earn the best yield on bSOL?",
-    "How can I earn the best yield on jitoSOL?",
+    "yield": [
+        "How can I earn the best yield on USDC?",
+        "How can I earn the best yield on SOL?",
+        "How can I earn the best yield on USDT?",
+        "How can I earn the best yield on JTO?",
+        "How can I earn the best yield on JLP?",
+        "How can I earn the best yield on cbBTC?",
+        "How can I earn the best yield on bSOL?",
+        "How can I earn the best yield on jitoSOL?",
+    ],
     # Trading questions
-    "What are the trading tokens on Solana?",
-    "What are the trading tokens on Sui?",
-    "What are the trading tokens on Ethereum?",
-    "What are the trading tokens on Base?",
-    "What is the highest trending token on Base?",
-    "What is the highest trending token on Solana?",
-    "What is the highest trending token on Sui?",
-    "What is the highest trending token on Ethereum?",
+    "trading": [
+        "What are the trading tokens on Solana?",
+        "What are the trading tokens on Sui?",
+        "What are the trading tokens on Ethereum?",
+        "What are the trading tokens on Base?",
+        "What is the highest trending token on Base?",
+        "What is the highest trending token on Solana?",
+        "What is the highest trending token on Sui?",
+        "What is the highest trending token on Ethereum?",
+    ],
     # Investment questions
-    "Should i buy SOL?",
-    "Should i buy ETH?",
-    "Should i buy BTC?",
-    "Should i buy LINK?",
-    "Should i buy BONK?",
-    "Should i buy SHIB?",
-    "Should i buy ZORA?",
+    "investment": [
+        "Should i buy SOL?",
+        "Should i buy ETH?",
+        "Should i buy BTC?",
+        "Should i buy LINK?",
+        "Should i buy BONK?",
+        "Should i buy SHIB?",
+        "Should i buy ZORA?",
+    ],
     # Token risk questions
-    "Evaluate the risk of PENGU",
-    "Evaluate the risk of PEPE",
-    "Evaluate the risk of ZORA on Base",
-    "Evaluate the risk of SMOG on Solana",
-    "Who are the top holders of PENGU?",
-    "Who are the top holders of PEPE?",
-    "Who are the top holders of LINK?",
-    "Who are the top holders of ZORA on Base?",
-    "Who are the top holders of AERO on Base?",
-    "What are the top 3 safest memecoins to buy on Solana?",
-    "What are the top 3 safest memecoins to buy on Sui?",
-    "What are the top 3 safest memecoins to buy on Base?",
-    "What are the top 3 safest memecoins to buy on Ethereum?",
-]
\ No newline at end of file
+    "token_risk": [
+        "Evaluate the risk of PENGU",
+        "Evaluate the risk of PEPE",
+        "Evaluate the risk of ZORA on Base",
+        "Evaluate the risk of SMOG on Solana",
+        "Who are the top holders of PENGU?",
+        "Who are the top holders of PEPE?",
+        "Who are the top holders of LINK?",
+        "Who are the top holders of ZORA on Base?",
+        "Who are the top holders of AERO on Base?",
+        "What are the top 3 safest memecoins to buy on Solana?",
+        "What are the top 3 safest memecoins to buy on Sui?",
+        "What are the top 3 safest memecoins to buy on Base?",
+        "What are the top 3 safest memecoins to buy on Ethereum?",
+    ],
+}
+
+questions = [
+    question for category in question_categories.values() for question in category
+]
+
+_question_to_category = {
+    question: category
+    for category, category_questions in question_categories.items()
+    for question in category_questions
+}
+
+# Keyword rules used to categorize questions that are not in the question bank.
+_category_keywords = (
+    ("portfolio", ("portfolio", "my holdings", "drawdown")),
+    ("yield", ("yield", "apy", "staking")),
+    ("trading", ("trading tokens", "trending")),
+    ("investment", ("should i buy", "should i sell")),
+    ("token_risk", ("risk of", "top holders", "safest")),
+)
+
+
+def categorize_question(question: str) -> str:
+    """
+    Return the category of a question.
+
+    Args:
+        question (str): The question text.
+
+    Returns:
+        str: One of the `question_categories` keys, or "other".
+    """
+    category = _question_to_category.get(question)
+    if category is not None:
+        return category
+    lowered = question.lower()
+    for category, keywords in _category_keywords:
+        if any(keyword in lowered for keyword in keywords):
+            return category
+    return "other"
@@ -0,0 +1,150 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import sys
+import json
+import time
+import contextlib
+import bittensor as bt
+from typing import Callable, List, Optional
+
+# Name of the report written under `neuron.full_path` when no path is given.
+REPORT_NAME = "startup_profile.json"
+
+
+def process_age() -> float:
+    """
+    Seconds since this process was started, so the timeline also covers the interpreter
+    start and the imports that ran before this module.
+
+    Returns:
+        float: The age of the process, 0.0 where /proc is not available.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name may contain spaces, the fields are counted from its closing parenthesis.
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class StartupProfiler:
+    """
+    Records the timeline of a neuron's startup, phase by phase.
+
+    Phases are timed relative to the start of the process and may be nested. Recording
+    is cheap, so it always happens; the report is only written with `--neuron.profile_startup`.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter, age: Optional[float] = None):
+        age = process_age() if age is None else age
+        self.clock = clock
+        self.started_at = time.time() - age
+        self.origin = clock() - age
+        self.phases: List[dict] = []
+        self._depth = 0
+
+    def elapsed(self) -> float:
+        """Seconds since the process started."""
+        return self.clock() - self.origin
+
+    def record(self, name: str, start: float, end: Optional[float] = None):
+        """
+        Record a phase timed by the caller.
+
+        Args:
+            name (str): The phase.
+            start (float): When it started, a value of the profiler's clock.
+            end (float, optional): When it ended, now by default.
+        """
+        end = self.clock() if end is None else end
+        self.phases.append(
+            {
+                "name": name,
+                "start": round(start - self.origin, 6),
+                "duration": round(end - start, 6),
+                "depth": self._depth,
+            }
+        )
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time the body of the `with` statement as the phase `name`."""
+        start = self.clock()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.record(name, start)
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: The timeline, with the phases sorted by start.
+        """
+        return {
+            "pid": os.getpid(),
+            "argv": sys.argv,
+            "started_at": self.started_at,
+            "total": round(self.elapsed(), 6),
+            "phases": sorted(self.phases, key=lambda phase: (phase["start"], phase["depth"])),
+        }
+
+    def write(self, path: str) -> str:
+        """
+        Write the report as JSON.
+
+        Args:
+            path (str): Where to write it, replaced atomically.
+
+        Returns:
+            str: The path.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+# Profiler of this process.
+startup_profiler = StartupProfiler()
+
+
+def write_startup_report(config: "bt.Config", profiler: StartupProfiler = startup_profiler) -> Optional[str]:
+    """
+    Write the startup timeline if `--neuron.profile_startup` is set; call it once the neuron serves.
+
+    Args:
+        config (bt.Config): The neuron's config.
+        profiler (StartupProfiler, optional): The profiler, the one of this process by default.
+
+    Returns:
+        str or None: The path of the report, None if profiling is off.
+    """
+    if not config.neuron.profile_startup:
+        return None
+    path = config.neuron.profile_startup_path or os.path.join(config.neuron.full_path, REPORT_NAME)
+    profiler.write(path)
+    bt.logging.info(f"Startup took {profiler.elapsed():.2f}s, timeline written to {path}")
+    return path
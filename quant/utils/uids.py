@@ -60,3 +60,45 @@ def get_random_uids(self, k: int, exclude: List[int] = None) -> np.ndarray:
         )
     uids = np.array(random.sample(available_uids, k))
     return uids
+
+
+class HotkeyIndex:
+    """
+    Immutable snapshot of the metagraph used to vet incoming requests in constant time.
+
+    The snapshot maps each hotkey to its UID and keeps the validator permits and stakes
+    as arrays indexed by UID. Per-hotkey blacklist and priority decisions are memoized
+    on the snapshot, so they are dropped together with it when the metagraph is
+    resynced and a new snapshot is swapped in.
+    """
+
+    def __init__(self, metagraph: "bt.metagraph.Metagraph"):
+        """
+        Args:
+            metagraph (:obj: bt.metagraph.Metagraph): The metagraph to index.
+        """
+        hotkeys = list(metagraph.hotkeys)
+        self.uids = {hotkey: uid for uid, hotkey in enumerate(hotkeys)}
+        self.validator_permit = np.asarray(metagraph.validator_permit, dtype=bool)
+        self.stake = np.asarray(metagraph.S, dtype=np.float64)
+        # Memoized decisions, only ever populated for registered hotkeys so they stay bounded.
+        self.blacklist: dict = {}
+        self.priority: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.uids)
+
+    def __contains__(self, hotkey: str) -> bool:
+        return hotkey in self.uids
+
+    def uid(self, hotkey: str):
+        """Return the UID of a hotkey, or None if it is not registered."""
+        return self.uids.get(hotkey)
+
+    def has_validator_permit(self, uid: int) -> bool:
+        """Return True if the UID holds a validator permit."""
+        return bool(self.validator_permit[uid])
+
+    def stake_of(self, uid: int) -> float:
+        """Return the stake of the UID."""
+        return float(self.stake[uid])
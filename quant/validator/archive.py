@@ -0,0 +1,308 @@
+# The MIT License (MIT)
+# Copyright © 2025 Quant by OpenGradient
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import gzip
+import json
+import time
+import queue
+import datetime
+import threading
+import numpy as np
+import bittensor as bt
+from typing import Dict, Iterator, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - optional, the archive falls back to NPZ
+    pa = None
+
+# Columns of the archive, one row per queried miner, and their types.
+COLUMNS = {
+    "time": np.float64,
+    "step": np.int64,
+    "block": np.int64,
+    "query_id": np.str_,
+    "uid": np.int32,
+    "reward": np.float32,
+    "latency": np.float32,  # NaN if unknown
+    "status_code": np.int16,  # -1 if unknown
+    "response_length": np.int32,
+}
+
+ARROW_SUFFIX = ".arrow"
+NPZ_SUFFIX = ".npz"
+BODIES_SUFFIX = ".bodies.jsonl.gz"
+
+
+def _partition(timestamp: float) -> str:
+    return "date=" + datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime("%Y-%m-%d")
+
+
+class ForwardArchive:
+    """
+    Records the results of every validator forward in columnar files, for analytics.
+
+    Each forward adds one row per queried miner. Rows are handed to a background writer
+    through a bounded queue, so recording never blocks the forward; the writer flushes them
+    every `flush_rows` rows or `flush_interval` seconds to a new file in the partition of
+    their day, `<directory>/date=YYYY-MM-DD/`. With pyarrow installed the files are
+    zstd-compressed Arrow IPC files, one record batch per flush; otherwise they are
+    compressed NPZ files. Response bodies, if kept, go to a gzipped JSONL file next to them.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        keep_bodies: bool = False,
+        flush_rows: int = 4096,
+        flush_interval: float = 600.0,
+        queue_size: int = 1024,
+        use_arrow: Optional[bool] = None,
+    ):
+        self.directory = directory
+        self.keep_bodies = keep_bodies
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.use_arrow = pa is not None if use_arrow is None else use_arrow
+        self.queue: "queue.Queue[Optional[dict]]" = queue.Queue(queue_size)
+        self.dropped = 0
+        self.thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: "bt.Config") -> "ForwardArchive":
+        """Build an archive from the validator's `neuron.archive_*` config."""
+        return cls(
+            directory=config.neuron.archive_dir or os.path.join(config.neuron.full_path, "forwards"),
+            keep_bodies=config.neuron.archive_bodies,
+        )
+
+    def record(
+        self,
+        step: int,
+        block: int,
+        query_id: str,
+        uids: Sequence[int],
+        rewards: Sequence[float],
+        latencies: Sequence[Optional[float]],
+        status_codes: Sequence[Optional[int]],
+        response_lengths: Sequence[int],
+        bodies: Optional[Sequence[Optional[str]]] = None,
+    ):
+        """
+        Record a forward. Never blocks: the forward is dropped if the writer is too far behind.
+
+        Args:
+            step (int): The validator step.
+            block (int): The block of the forward.
+            query_id (str): Identifies the query sent to the miners.
+            uids (Sequence[int]): The queried miners.
+            rewards, latencies, status_codes, response_lengths: Per miner, in the order of `uids`;
+                latencies and status codes may be None.
+            bodies (Sequence[str or None], optional): The response texts, kept only with `keep_bodies`.
+        """
+        n = len(uids)
+        forward = {
+            "time": np.full(n, time.time(), dtype=np.float64),
+            "step": np.full(n, step, dtype=np.int64),
+            "block": np.full(n, block, dtype=np.int64),
+            "query_id": np.array([query_id] * n, dtype=np.str_),
+            "uid": np.asarray(uids, dtype=np.int32),
+            "reward": np.asarray(rewards, dtype=np.float32),
+            "latency": np.array([np.nan if v is None else v for v in latencies], dtype=np.float32),
+            "status_code": np.array([-1 if v is None else int(v) for v in status_codes], dtype=np.int16),
+            "response_length": np.asarray(response_lengths, dtype=np.int32),
+        }
+        if self.keep_bodies and bodies is not None:
+            forward["bodies"] = list(bodies)
+        try:
+            self.queue.put_nowait(forward)
+        except queue.Full:
+            self.dropped += 1
+
+    def start(self):
+        """Start the background writer."""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, daemon=True, name="forward-archive")
+        self.thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Write the pending forwards and stop the writer."""
+        if self.thread is None:
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+        self.thread = None
+
+    def _run(self):
+        pending: List[dict] = []
+        rows = 0
+        flush_at = time.monotonic() + self.flush_interval
+        while True:
+            stopping = False
+            try:
+                forward = self.queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+                if forward is None:
+                    stopping = True
+                else:
+                    pending.append(forward)
+                    rows += len(forward["uid"])
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            if pending and (stopping or rows >= self.flush_rows or now >= flush_at):
+                try:
+                    self.flush(pending)
+                except Exception as e:
+                    bt.logging.error(f"Failed to archive {len(pending)} forwards: {e}")
+                pending, rows = [], 0
+            if stopping:
+                return
+            if now >= flush_at or not pending:
+                flush_at = now + self.flush_interval
+
+    def flush(self, forwards: List[dict]):
+        """Write forwards to new files, one per day partition."""
+        by_day: Dict[str, List[dict]] = {}
+        for forward in forwards:
+            if len(forward["uid"]):
+                by_day.setdefault(_partition(forward["time"][0]), []).append(forward)
+        for partition, day in by_day.items():
+            directory = os.path.join(self.directory, partition)
+            os.makedirs(directory, exist_ok=True)
+            stem = os.path.join(directory, f"forwards-{time.time_ns()}-{os.getpid()}")
+            columns = {name: np.concatenate([forward[name] for forward in day]) for name in COLUMNS}
+            if self.use_arrow:
+                _write_arrow(stem + ARROW_SUFFIX, columns)
+            else:
+                _write_npz(stem + NPZ_SUFFIX, columns)
+            if any("bodies" in forward for forward in day):
+                _write_bodies(stem + BODIES_SUFFIX, day)
+
+
+def _write_arrow(path: str, columns: Dict[str, np.ndarray]):
+    table = pa.table(columns)
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _write_npz(path: str, columns: Dict[str, np.ndarray]):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **columns)
+    os.replace(tmp_path, path)
+
+
+def _write_bodies(path: str, forwards: List[dict]):
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt") as f:
+        for forward in forwards:
+            for step, uid, body in zip(forward["step"], forward["uid"], forward.get("bodies", ())):
+                f.write(json.dumps({"step": int(step), "uid": int(uid), "body": body}) + "\n")
+    os.replace(tmp_path, path)
+
+
+def archive_files(directory: str, start: Optional[datetime.date] = None,
+                  end: Optional[datetime.date] = None) -> Iterator[str]:
+    """
+    List the archive files of the days from `start` to `end` included, oldest first.
+
+    Args:
+        directory (str): The archive directory.
+        start (datetime.date, optional): The first day, the oldest by default.
+        end (datetime.date, optional): The last day, the newest by default.
+    """
+    if not os.path.isdir(directory):
+        return
+    for partition in sorted(os.listdir(directory)):
+        if not partition.startswith("date="):
+            continue
+        day = datetime.date.fromisoformat(partition[len("date="):])
+        if (start is not None and day < start) or (end is not None and day > end):
+            continue
+        for name in sorted(os.listdir(os.path.join(directory, partition))):
+            if name.endswith(ARROW_SUFFIX) or name.endswith(NPZ_SUFFIX):
+                yield os.path.join(directory, partition, name)
+
+
+def _read_columns(path: str, columns: Sequence[str]) -> Dict[str, np.ndarray]:
+    if path.endswith(ARROW_SUFFIX):
+        # Memory-mapped: only the buffers of the selected columns are read (and decompressed).
+        with pa.memory_map(path) as source:
+            schema = pa.ipc.open_file(source).schema
+            options = pa.ipc.IpcReadOptions(included_fields=[schema.get_field_index(name) for name in columns])
+            table = pa.ipc.open_file(source, options=options).read_all()
+            return {name: table.column(name).to_numpy() for name in columns}
+    # NPZ members are decompressed on access, only the selected columns are read.
+    with np.load(path, allow_pickle=False) as npz:
+        return {name: npz[name] for name in columns}
+
+
+def load_forwards(
+    directory: str,
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+    uids: Optional[Sequence[int]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Load forward results from the archive.
+
+    Files are read one at a time, keeping only the selected columns and rows, so the
+    memory used is that of the result rather than of the whole archive.
+
+    Args:
+        directory (str): The archive directory.
+        columns (Sequence[str], optional): The columns to load, all by default.
+        start (datetime.date, optional): The first day to load.
+        end (datetime.date, optional): The last day to load.
+        uids (Sequence[int], optional): Only load the rows of these miners.
+
+    Returns:
+        Dict[str, np.ndarray]: The selected columns.
+    """
+    columns = list(columns or COLUMNS)
+    read = columns if uids is None or "uid" in columns else columns + ["uid"]
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name in columns}
+    for path in archive_files(directory, start, end):
+        data = _read_columns(path, read)
+        mask = None if uids is None else np.isin(data["uid"], uids)
+        for name in columns:
+            parts[name].append(data[name] if mask is None else data[name][mask])
+    return {
+        name: np.concatenate(values) if values else np.empty(0, dtype=COLUMNS[name])
+        for name, values in parts.items()
+    }
+
+
+def load_bodies(directory: str, start: Optional[datetime.date] = None,
+                end: Optional[datetime.date] = None) -> Iterator[dict]:
+    """Iterate over the archived response bodies, as {"step", "uid", "body"} dicts."""
+    for path in archive_files(directory, start, end):
+        bodies_path = path.rsplit(".", 1)[0] + BODIES_SUFFIX
+        if os.path.exists(bodies_path):
+            with gzip.open(bodies_path, "rt") as f:
+                for line in f:
+                    yield json.loads(line)
@@ -1,19 +1,49 @@
 import requests
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
+import hashlib
+import functools
 import json
 import os
 import time
+import threading
 import bittensor as bt
 
 GPU_ATTEST_URL = "http://34.96.84.217:5001/attest/gpu"
 GPU_ATTEST_HEADERS = {"Content-Type": "application/json"}
+# (connect, read) timeout of an attestation request, in seconds
+GPU_ATTEST_TIMEOUT = (5, 30)
+
+# Pooled connection to the attestation endpoint, shared by all callers
+_session = requests.Session()
 
 GOLDEN_MEASUREMENTS_PATH = os.path.join(os.path.dirname(__file__), 'golden_measurements.json')
 def load_golden_measurements():
     with open(GOLDEN_MEASUREMENTS_PATH, 'r') as f:
         return json.load(f)
-GOLDEN_MEASUREMENTS = load_golden_measurements()
+
+@functools.lru_cache(maxsize=None)
+def golden_measurements() -> Tuple[str, ...]:
+    """
+    The golden measurements, loaded on first use.
+    """
+    return tuple(load_golden_measurements())
+
+@functools.lru_cache(maxsize=None)
+def golden_digest() -> str:
+    """
+    The digest of the golden measurements, computed on first use.
+    """
+    return measurements_digest(golden_measurements())
+
+def __getattr__(name):
+    # GOLDEN_MEASUREMENTS and GOLDEN_DIGEST are loaded lazily, on first access
+    if name == "GOLDEN_MEASUREMENTS":
+        return list(golden_measurements())
+    if name == "GOLDEN_DIGEST":
+        return golden_digest()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 SUCCESS_STRINGS = [
     "Attestation report signature verification successful.",
     "Attestation report verification successful.",
@@ -22,6 +52,97 @@ SUCCESS_STRINGS = [
     "GPU Attestation is Successful."
 ]
 
+def measurements_digest(measurements: Iterable[str]) -> str:
+    """
+    Digest of a list of measurements, equal for equal lists.
+    """
+    digest = hashlib.sha256()
+    for measurement in measurements:
+        digest.update(measurement.encode("ascii"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+_MEASUREMENT_INDEX = "Measurement Block index : "
+_MEASUREMENT_VALUE = "DMTFSpecMeasurementValue     : "
+_DIGITS = re.compile(r"\d+")
+_HEX = re.compile(r"[0-9a-fA-F]+")
+# Any of the success strings, so a chunk is searched for all of them in one pass
+_SUCCESS = re.compile("|".join(re.escape(s) for s in SUCCESS_STRINGS))
+
+class AttestationParser:
+    """
+    Incremental, single-pass parser of GPU attestation documents.
+
+    Feed the document in chunks of any size, e.g. as it is read from the network. The text
+    is scanned forward once for the next marker only: a measurement is the first
+    DMTFSpecMeasurementValue after a Measurement Block index. Success strings are searched
+    for together, in one pass over each complete chunk, until all are found. The measurements are hashed as they are
+    found, so validating them against the golden measurements is a single digest
+    comparison.
+    """
+
+    def __init__(self):
+        self.measurements: List[str] = []
+        self.missing = set(SUCCESS_STRINGS)
+        self._digest = hashlib.sha256()
+        self._in_block = False
+        # Pieces of the current line, joined once it is complete
+        self._partial: List[str] = []
+
+    def _scan(self, text: str):
+        position = 0
+        while True:
+            if not self._in_block:
+                position = text.find(_MEASUREMENT_INDEX, position)
+                if position < 0:
+                    break
+                position += len(_MEASUREMENT_INDEX)
+                self._in_block = _DIGITS.match(text, position) is not None
+            else:
+                position = text.find(_MEASUREMENT_VALUE, position)
+                if position < 0:
+                    break
+                position += len(_MEASUREMENT_VALUE)
+                match = _HEX.match(text, position)
+                if match is not None:
+                    measurement = match.group()
+                    self.measurements.append(measurement)
+                    self._digest.update(measurement.encode("ascii"))
+                    self._digest.update(b"\n")
+                    self._in_block = False
+                    position = match.end()
+        if self.missing:
+            for match in _SUCCESS.finditer(text):
+                self.missing.discard(match.group())
+                if not self.missing:
+                    break
+
+    def feed(self, chunk: str) -> "AttestationParser":
+        # Markers and values never span lines, scan up to the last complete line.
+        end = chunk.rfind("\n")
+        if end < 0:
+            self._partial.append(chunk)
+            return self
+        self._partial.append(chunk[:end + 1])
+        self._scan("".join(self._partial))
+        self._partial = [chunk[end + 1:]] if end + 1 < len(chunk) else []
+        return self
+
+    def result(self) -> Dict:
+        """
+        Finish parsing and return the attestation, as `parse_gpu_attestation`.
+        """
+        if self._partial:
+            self._scan("".join(self._partial))
+            self._partial = []
+        checks = {s: (s not in self.missing) for s in SUCCESS_STRINGS}
+        return {
+            "measurements": self.measurements,
+            "digest": self._digest.hexdigest(),
+            "checks": checks,
+            "overall_success": all(checks.values())
+        }
+
 def generate_nonce(epoch_seconds: int = None) -> str:
     """
     Generate a nonce based on the current epoch hour (default) or a user-supplied epoch.
@@ -32,38 +153,30 @@ def generate_nonce(epoch_seconds: int = None) -> str:
     epoch_hour = epoch_seconds // 3600
     return f"{epoch_hour:016x}"
 
-def retrieve_remote_attestation(nonce: str = None) -> Dict:
+def retrieve_remote_attestation(nonce: str = None, url: str = GPU_ATTEST_URL, session: requests.Session = None,
+                                timeout=GPU_ATTEST_TIMEOUT) -> Dict:
     if nonce is None:
         nonce = generate_nonce()
     data = {"nonce": nonce}
-    response = requests.post(GPU_ATTEST_URL, headers=GPU_ATTEST_HEADERS, json=data)
-    if response.status_code != 200:
-        raise RuntimeError("Failed to retrieve remote attestation")
-    return parse_gpu_attestation(response.text)
+    # Parse the document as it arrives instead of buffering it whole
+    with (session or _session).post(url, headers=GPU_ATTEST_HEADERS, json=data, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            raise RuntimeError("Failed to retrieve remote attestation")
+        response.encoding = response.encoding or "utf-8"
+        parser = AttestationParser()
+        for chunk in response.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+            parser.feed(chunk)
+    return parser.result()
 
 def parse_gpu_attestation(raw_attestation_doc: str) -> Dict:
-    # Parse measurement blocks
-    measurement_blocks = re.findall(
-        r"Measurement Block index : (\d+).*?DMTFSpecMeasurementValue     : ([0-9a-fA-F]+)",
-        raw_attestation_doc, re.DOTALL)
-    measurements = [block[1] for block in measurement_blocks]
-
-    # Check for all relevant success strings
-    checks = {s: (s in raw_attestation_doc) for s in SUCCESS_STRINGS}
-
-    # Overall status
-    overall_success = all(checks.values())
-    return {
-        "measurements": measurements,
-        "checks": checks,
-        "overall_success": overall_success
-    }
+    return AttestationParser().feed(raw_attestation_doc).result()
 
 def validate_attestation(attestation: Dict) -> bool:
     # Compare measurements to golden
-    if attestation["measurements"] != GOLDEN_MEASUREMENTS:
+    digest = attestation.get("digest") or measurements_digest(attestation["measurements"])
+    if digest != golden_digest():
         bt.logging.warning("[Attestation] Measurement mismatch detected.")
-        bt.logging.warning(f"[Attestation] Expected measurements: {GOLDEN_MEASUREMENTS}")
+        bt.logging.warning(f"[Attestation] Expected measurements: {list(golden_measurements())}")
         bt.logging.warning(f"[Attestation] Got measurements: {attestation['measurements']}")
         return False
     if not attestation["overall_success"]:
@@ -71,3 +184,82 @@ def validate_attestation(attestation: Dict) -> bool:
         bt.logging.warning(f"[Attestation] overall_success is False. Failed checks: {failed_checks}")
         return False
     return True
+
+class AttestationService:
+    """
+    Memoizes attestation results per (endpoint, nonce).
+
+    The nonce only changes every epoch hour, so the attestation is fetched, parsed and
+    validated once per hour and endpoint no matter how many responses are checked.
+    Concurrent callers asking for the same nonce wait for a single request. Failures are
+    cached for `error_ttl` seconds so an unreachable endpoint is not hammered either.
+    """
+
+    def __init__(self, url: str = GPU_ATTEST_URL, timeout=GPU_ATTEST_TIMEOUT, error_ttl: float = 60.0,
+                 max_entries: int = 8, session: requests.Session = None, clock=time.monotonic):
+        self.url = url
+        self.timeout = timeout
+        self.error_ttl = error_ttl
+        self.max_entries = max_entries
+        self.session = session or _session
+        self.clock = clock
+        # (url, nonce) -> (attestation or None, valid, error or None, fetched at)
+        self._results: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, key) -> Optional[tuple]:
+        result = self._results.get(key)
+        if result is None:
+            return None
+        if result[2] is not None and self.clock() - result[3] >= self.error_ttl:
+            del self._results[key]
+            return None
+        return result
+
+    def result(self, nonce: str = None) -> Tuple[Optional[Dict], bool, Optional[Exception]]:
+        """
+        Return the attestation for `nonce` (the current epoch hour by default).
+
+        Returns:
+            Tuple[Dict or None, bool, Exception or None]: The parsed attestation, whether it is
+                valid, and the error if it could not be retrieved.
+        """
+        if nonce is None:
+            nonce = generate_nonce()
+        key = (self.url, nonce)
+        while True:
+            with self._lock:
+                result = self._cached(key)
+                if result is not None:
+                    return result[:3]
+                event = self._inflight.get(key)
+                if event is None:
+                    # This caller fetches, the others wait for it.
+                    event = self._inflight[key] = threading.Event()
+                    break
+            event.wait()
+
+        attestation, valid, error = None, False, None
+        try:
+            attestation = retrieve_remote_attestation(nonce, url=self.url, session=self.session, timeout=self.timeout)
+            valid = validate_attestation(attestation)
+        except Exception as e:
+            error = e
+            bt.logging.error(f"[Attestation] Failed to retrieve attestation for nonce {nonce}: {e}")
+        finally:
+            with self._lock:
+                self._results[key] = (attestation, valid, error, self.clock())
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+                del self._inflight[key]
+            event.set()
+        return attestation, valid, error
+
+    def is_valid(self, nonce: str = None) -> bool:
+        """Return whether the attestation for `nonce` (the current epoch hour by default) is valid."""
+        return self.result(nonce)[1]
+
+
+# Shared by the reward path and the periodic check, so both cost one request per hour
+attestation_service = AttestationService()
@@ -1,31 +1,104 @@
+import random
+import asyncio
 import threading
 import time
 import bittensor as bt
-from .attestation import retrieve_remote_attestation, validate_attestation, generate_nonce
+from typing import Callable, Optional
+from .attestation import AttestationService, attestation_service, generate_nonce
 
-def periodic_attestation_check(interval_seconds: int = 3600):
+class PeriodicAttestationService:
     """
-    Runs attestation validation at the top of every hour (default) in a background thread.
+    Checks the attestation once per epoch hour, from a background event loop.
+
+    Nothing runs until `start()` is called. Each check is delayed by a random jitter of
+    up to `max_jitter` seconds after the top of the hour, so validators do not all hit the
+    attestation endpoint at the same moment. The result is stored in the shared
+    `AttestationService`, so the reward path reuses it without another request.
     """
-    def _job():
-        while True:
-            now = time.time()
-            # Calculate seconds until the next hour
-            seconds_until_next_hour = 3600 - (int(now) % 3600)
-            bt.logging.info(f"Sleeping {seconds_until_next_hour}s until next attestation check...")
-            time.sleep(seconds_until_next_hour)
+
+    def __init__(self, service: AttestationService = attestation_service, interval_seconds: int = 3600,
+                 max_jitter: float = 300.0, clock: Callable[[], float] = time.time):
+        self.service = service
+        self.interval_seconds = interval_seconds
+        self.max_jitter = max_jitter
+        self.clock = clock
+        self.thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._stop_requested = False
+
+    def seconds_until_next_check(self) -> float:
+        """
+        Seconds until the start of the next interval, plus jitter.
+        """
+        now = self.clock()
+        seconds_until_next_interval = self.interval_seconds - (now % self.interval_seconds)
+        return seconds_until_next_interval + random.uniform(0, self.max_jitter)
+
+    def check(self) -> bool:
+        """
+        Check the attestation for the current epoch hour now.
+        """
+        nonce = generate_nonce(int(self.clock()))
+        bt.logging.info(f"Running attestation check at epoch hour nonce: {nonce}")
+        _, valid, error = self.service.result(nonce)
+        if error is not None:
+            bt.logging.error(f"[Attestation] ERROR: {error}")
+        elif valid:
+            bt.logging.info("[Attestation] SUCCESS")
+        else:
+            bt.logging.warning("[Attestation] FAILURE")
+        return valid
+
+    async def _run(self):
+        self._stopped = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        while not self._stop_requested and not self._stopped.is_set():
+            delay = self.seconds_until_next_check()
+            bt.logging.info(f"Sleeping {delay:.0f}s until next attestation check...")
+            try:
+                await asyncio.wait_for(self._stopped.wait(), delay)
+                break
+            except asyncio.TimeoutError:
+                pass
             try:
-                nonce = generate_nonce()
-                bt.logging.info(f"Running attestation check at epoch hour nonce: {nonce}")
-                attestation = retrieve_remote_attestation(nonce)
-                if validate_attestation(attestation):
-                    bt.logging.info("[Attestation] SUCCESS")
-                else:
-                    bt.logging.warning("[Attestation] FAILURE")
+                # The request blocks, keep it off the loop so stop() is never delayed by it
+                await self._loop.run_in_executor(None, self.check)
             except Exception as e:
                 bt.logging.error(f"[Attestation] ERROR: {e}")
-    thread = threading.Thread(target=_job, daemon=True)
-    thread.start()
+
+    def start(self):
+        """
+        Start the periodic checks in a background thread.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self._stop_requested = False
+        self._loop = self._stopped = None
+        self.thread = threading.Thread(target=asyncio.run, args=(self._run(),), daemon=True, name="attestation")
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the periodic checks.
+        """
+        self._stop_requested = True
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                pass  # The loop already finished
+        if self.thread is not None:
+            self.thread.join(5)
+            self.thread = None
+
+def periodic_attestation_check(interval_seconds: int = 3600) -> PeriodicAttestationService:
+    """
+    Runs attestation validation at the top of every hour (default) in a background thread.
+    """
+    service = PeriodicAttestationService(interval_seconds=interval_seconds)
+    service.start()
+    return service
 
 if __name__ == "__main__":
     bt.logging.info("Starting periodic attestation check (every hour)...")
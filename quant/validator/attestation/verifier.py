@@ -0,0 +1,151 @@
+import asyncio
+import numpy as np
+import bittensor as bt
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .attestation import GPU_ATTEST_HEADERS, generate_nonce, parse_gpu_attestation, validate_attestation
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp ships with bittensor
+    aiohttp = None
+
+# Path of the attestation endpoint on a miner's attestation server
+MINER_ATTEST_PATH = "/attest/gpu"
+
+
+def miner_attestation_endpoints(metagraph, uids, port: int, path: str = MINER_ATTEST_PATH) -> List[Tuple[int, Optional[str]]]:
+    """
+    Build the attestation endpoints of miners from the IPs they serve their axon on.
+
+    Returns:
+        List[Tuple[int, str or None]]: (uid, endpoint) pairs, None for miners not serving an axon.
+    """
+    endpoints = []
+    for uid in uids:
+        axon = metagraph.axons[uid]
+        serving = axon.is_serving and axon.ip not in ("0.0.0.0", "")
+        endpoints.append((int(uid), f"http://{axon.ip}:{port}{path}" if serving else None))
+    return endpoints
+
+
+class AttestationFetchError(Exception):
+    """Raised when a miner's attestation server answers without a report."""
+
+
+class AttestationVerifier:
+    """
+    Verifies the TEE attestations of many miners concurrently.
+
+    Reports are fetched with at most `max_concurrency` requests in flight, then parsed and
+    validated in a thread pool so the regex work stays off the event loop. Verdicts are
+    cached per (hotkey, nonce): as the nonce is the epoch hour, each miner is attested at
+    most once per hour, and concurrent verifications of the same miner share one request.
+    Only reports that were retrieved get a verdict: a miner whose report could not be
+    fetched fails this verification and is asked again on the next one.
+    """
+
+    def __init__(self, max_concurrency: int = 16, timeout: float = 30.0, max_entries: int = 4096, workers: int = 4):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="attestation")
+        # (hotkey, nonce) -> verdict
+        self._verdicts: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    @classmethod
+    def from_config(cls, config: "bt.Config") -> "AttestationVerifier":
+        """Build a verifier from the validator's `neuron.attestation_*` config."""
+        return cls(
+            max_concurrency=config.neuron.attestation_concurrency,
+            timeout=config.neuron.attestation_timeout,
+        )
+
+    async def _fetch(self, session, semaphore: asyncio.Semaphore, endpoint: str, nonce: str) -> str:
+        """
+        Raises:
+            AttestationFetchError, aiohttp.ClientError, asyncio.TimeoutError: If there is no report.
+        """
+        async with semaphore:
+            async with session.post(endpoint, headers=GPU_ATTEST_HEADERS, json={"nonce": nonce}) as response:
+                if response.status != 200:
+                    raise AttestationFetchError(f"{endpoint} answered {response.status}")
+                return await response.text()
+
+    @staticmethod
+    def _check(raw_attestation_doc: str) -> bool:
+        return validate_attestation(parse_gpu_attestation(raw_attestation_doc))
+
+    async def _verify(self, session, semaphore, endpoint: str, nonce: str) -> bool:
+        raw_attestation_doc = await self._fetch(session, semaphore, endpoint, nonce)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._check, raw_attestation_doc)
+
+    def _store(self, key: Tuple[str, str], verdict: bool):
+        self._verdicts[key] = verdict
+        while len(self._verdicts) > self.max_entries:
+            self._verdicts.popitem(last=False)
+
+    async def verify(self, targets: Sequence[Tuple[int, Optional[str]]], hotkeys: Sequence[str],
+                     nonce: str = None) -> np.ndarray:
+        """
+        Verify the attestations of miners.
+
+        Args:
+            targets (Sequence[Tuple[int, str or None]]): (uid, attestation endpoint) pairs; miners
+                without an endpoint fail.
+            hotkeys (Sequence[str]): The hotkeys of the network by uid, e.g. `metagraph.hotkeys`.
+            nonce (str, optional): The nonce, the current epoch hour by default.
+
+        Returns:
+            np.ndarray: 1.0 for the miners whose attestation is valid and 0.0 for the others, in
+                the order of `targets`, to be multiplied into their rewards.
+        """
+        if nonce is None:
+            nonce = generate_nonce()
+        mask = np.zeros(len(targets), dtype=np.float32)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pending = {}
+        created = []
+        session = None
+        try:
+            for index, (uid, endpoint) in enumerate(targets):
+                if endpoint is None:
+                    continue
+                key = (hotkeys[uid], nonce)
+                verdict = self._verdicts.get(key)
+                if verdict is not None:
+                    mask[index] = verdict
+                    continue
+                future = self._inflight.get(key)
+                if future is None:
+                    if session is None:
+                        session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+                    future = asyncio.ensure_future(self._verify(session, semaphore, endpoint, nonce))
+                    self._inflight[key] = future
+                    created.append(key)
+                pending[index] = (key, future)
+
+            if pending:
+                verdicts = await asyncio.gather(*(future for _, future in pending.values()), return_exceptions=True)
+                for (index, (key, _)), verdict in zip(pending.items(), verdicts):
+                    if isinstance(verdict, BaseException):
+                        # No report (network error, timeout, error status): not a verdict on
+                        # the miner, retry on the next verification.
+                        bt.logging.debug(f"[Attestation] Verification of {key[0]} failed: {verdict}")
+                        continue
+                    mask[index] = verdict
+                    self._store(key, verdict)
+        finally:
+            for key in created:
+                self._inflight.pop(key, None)
+            if session is not None:
+                await session.close()
+        return mask
+
+    def close(self):
+        """Shut down the parsing thread pool."""
+        self._executor.shutdown(wait=False)
@@ -17,13 +17,28 @@
 
 import os
 import time
+import hashlib
 import random
+import asyncio
 import bittensor as bt
 
-from quant.protocol import QuantQuery, QuantSynapse
+from quant.protocol import QuantQuery, QuantSynapse, QuantStreamingSynapse
 from quant.validator.reward import get_rewards
+from quant.validator.attestation.verifier import miner_attestation_endpoints
 from quant.utils.uids import get_random_uids
-from quant.utils.questions import questions
+from quant.utils import metrics
+from quant.utils.logging import log_event
+from quant.utils.questions import questions, default_user_id, validator_query_metadata
+
+FORWARD_SECONDS = metrics.histogram(
+    "quant_validator_forward_seconds", "Duration of a validator forward pass, excluding the cadence sleep."
+)
+DENDRITE_RESPONSES = metrics.counter(
+    "quant_validator_dendrite_responses_total", "Miner responses by dendrite status code.", ("status",)
+)
+TIME_TO_FIRST_BYTE = metrics.histogram(
+    "quant_validator_time_to_first_byte_seconds", "Time until the first streamed chunk of a miner answer."
+)
 
 
 async def forward(self):
@@ -36,6 +51,8 @@ async def forward(self):
         self (:obj:`bittensor.neuron.Neuron`): The neuron object which contains all the necessary state for the validator.
 
     """
+    start_time = time.perf_counter()
+
     # TODO(developer): Define how the validator selects a miner to query, how often, etc.
     # get_random_uids is an example method, but you can replace it with your own.
     miner_uids = get_random_uids(self, k=self.config.neuron.sample_size)
@@ -43,20 +60,84 @@ async def forward(self):
     wallet_address = os.getenv("SOLANA_WALLET")
     if not wallet_address:
         bt.logging.error("SOLANA_WALLET environment variable is not set. Using a default value.")
-        wallet_address = "5HHSqMvTCvgtzdqFb5BbtYjB8cEiJjf8UZ6p5rQczagL"
+        wallet_address = default_user_id
 
     query = QuantQuery(
         query=random.choice(questions),
         userID=wallet_address,
         metadata={
-            "Create_Proof": "True", 
-            "Type": "Validator_Test",
+            **validator_query_metadata,
             "validator_id": self.wallet.hotkey.ss58_address
         }
     )
 
+    # Verify the miners' attestations while they answer.
+    attestation = None
+    verifier = getattr(self, "attestation_verifier", None)
+    if verifier is not None:
+        attestation = asyncio.ensure_future(
+            verifier.verify(
+                miner_attestation_endpoints(self.metagraph, miner_uids, self.config.neuron.attestation_port),
+                self.metagraph.hotkeys,
+            )
+        )
+
+    if self.config.neuron.streaming:
+        responses, synapses = await stream_responses(self, miner_uids, query)
+    else:
+        responses, synapses = await query_responses(self, miner_uids, query)
+    latencies = response_latencies(synapses)
+
+    # Log the results for monitoring purposes.
+    bt.logging.info(f"Received responses: {responses}")
+
+    attestation_mask = None
+    if attestation is not None:
+        attestation_mask = await attestation
+        bt.logging.info(f"Attested miners: {int(attestation_mask.sum())}/{len(miner_uids)}")
+
+    # Adjust the scores based on responses from miners.
+    rewards = get_rewards(self, query=query, responses=responses, attestation_mask=attestation_mask)
+
+    bt.logging.info(f"Scored responses: {rewards}")
+    for uid, reward, latency in zip(miner_uids, rewards, latencies):
+        log_event("reward", step=int(self.step), uid=int(uid), reward=float(reward), latency=latency)
+
+    archive = getattr(self, "forward_archive", None)
+    if archive is not None:
+        texts = [getattr(response, "response", None) for response in responses]
+        archive.record(
+            step=int(self.step),
+            block=self.block,
+            query_id=hashlib.sha1(query.query.encode("utf-8")).hexdigest()[:16],
+            uids=miner_uids,
+            rewards=rewards,
+            latencies=latencies,
+            status_codes=response_status_codes(synapses),
+            response_lengths=[len(text) if text else 0 for text in texts],
+            bodies=texts,
+        )
+    # Update the scores based on the rewards. You may want to define your own update_scores function for custom behavior.
+    self.update_scores(rewards, miner_uids)
+    FORWARD_SECONDS.observe(time.perf_counter() - start_time)
+    time.sleep(int(os.getenv("VALIDATOR_CADENCE", 500)))
+
+
+async def query_responses(self, miner_uids, query: QuantQuery):
+    """
+    Query the miners with a QuantSynapse and wait for their complete answers.
+
+    Args:
+        self (:obj:`bittensor.neuron.Neuron`): The validator.
+        miner_uids: The UIDs to query.
+        query (QuantQuery): The query.
+
+    Returns:
+        Tuple[List[QuantResponse], List[QuantSynapse]]: The deserialized responses and the
+            synapses, in the order of `miner_uids`.
+    """
     # The dendrite client queries the network.
-    responses = await self.dendrite(
+    synapses = await self.dendrite(
         # Send the query to selected miner axons in the network.
         axons=[self.metagraph.axons[uid] for uid in miner_uids],
         # Create a proper QuantQuery object and pass it to QuantSynapse
@@ -64,18 +145,76 @@ async def forward(self):
         synapse=QuantSynapse(
             query=query
         ),
-        # All responses have the deserialize function called on them before returning.
+        # Keep the raw synapses to count their status codes, then deserialize them.
         # You are encouraged to define your own deserialization function.
-        deserialize=True,
+        deserialize=False,
     )
+    count_statuses(synapses)
+    return [s.deserialize() for s in synapses], synapses
 
-    # Log the results for monitoring purposes.
-    bt.logging.info(f"Received responses: {responses}")
 
-    # Adjust the scores based on responses from miners.
-    rewards = get_rewards(self, query=query, responses=responses)
+async def stream_responses(self, miner_uids, query: QuantQuery):
+    """
+    Query the miners with a QuantStreamingSynapse, consuming their answers as they arrive.
 
-    bt.logging.info(f"Scored responses: {rewards}")
-    # Update the scores based on the rewards. You may want to define your own update_scores function for custom behavior.
-    self.update_scores(rewards, miner_uids)
-    time.sleep(int(os.getenv("VALIDATOR_CADENCE", 500)))
+    The time to first byte of every miner is logged; the complete answers are scored
+    exactly like QuantSynapse responses.
+
+    Args:
+        self (:obj:`bittensor.neuron.Neuron`): The validator.
+        miner_uids: The UIDs to query.
+        query (QuantQuery): The query.
+
+    Returns:
+        Tuple[List[QuantResponse], List[QuantStreamingSynapse]]: The deserialized responses and
+            the synapses, in the order of `miner_uids`.
+    """
+
+    async def stream(uid):
+        synapse = QuantStreamingSynapse(query=query)
+        start_time = time.monotonic()
+        async for item in self.dendrite.call_stream(
+            self.metagraph.axons[uid],
+            synapse,
+            timeout=self.config.neuron.timeout,
+            deserialize=False,
+        ):
+            if isinstance(item, str):
+                if synapse.time_to_first_byte is None:
+                    synapse.time_to_first_byte = time.monotonic() - start_time
+            else:
+                item.time_to_first_byte = synapse.time_to_first_byte
+                synapse = item
+        return synapse
+
+    synapses = await asyncio.gather(*(stream(uid) for uid in miner_uids))
+    count_statuses(synapses)
+    for synapse in synapses:
+        if synapse.time_to_first_byte is not None:
+            TIME_TO_FIRST_BYTE.observe(synapse.time_to_first_byte)
+    bt.logging.info(
+        "Time to first byte: "
+        + ", ".join(
+            f"{uid}={s.time_to_first_byte:.2f}s" if s.time_to_first_byte is not None else f"{uid}=n/a"
+            for uid, s in zip(miner_uids, synapses)
+        )
+    )
+    return [s.deserialize() for s in synapses], synapses
+
+
+def response_latencies(synapses):
+    """Return the dendrite process time of every response, None if unknown."""
+    return [getattr(getattr(synapse, "dendrite", None), "process_time", None) for synapse in synapses]
+
+
+def response_status_codes(synapses):
+    """Return the dendrite status code of every response, None if unknown."""
+    return [getattr(getattr(synapse, "dendrite", None), "status_code", None) for synapse in synapses]
+
+
+def count_statuses(synapses):
+    """Count the dendrite status codes of the responses."""
+    for synapse in synapses:
+        dendrite = getattr(synapse, "dendrite", None)
+        status = getattr(dendrite, "status_code", None)
+        DENDRITE_RESPONSES.inc(status=status if status is not None else "none")
@@ -20,12 +20,9 @@ import json
 from typing import List, Optional, Dict, Any
 import bittensor as bt
 from quant.protocol import QuantResponse, QuantQuery
+from quant.utils import metrics
 # from quant.BitQuant.subnet.subnet_methods import subnet_evaluation
-from quant.validator.attestation.attestation import retrieve_remote_attestation, validate_attestation
-from quant.validator.attestation.periodic import periodic_attestation_check
-
-# Start periodic attestation check
-periodic_attestation_check()
+from quant.validator.attestation.attestation import attestation_service
 
 
 def bitquant_evaluate(
@@ -171,13 +168,13 @@ def reward(query: QuantQuery, response: QuantResponse) -> float:
 
     """
     TEE remote attestation check -> no hard TEE attestation check requirement for now
-    try:
-        attestation = retrieve_remote_attestation()
-        if not validate_attestation(attestation):
-            bt.logging.warning("TEE GPU attestation failed. Reward set to 0.")
-            return 0.0
-    except Exception as e:
-        bt.logging.error(f"TEE attestation error: {e}. Reward set to 0.")
+    The result is cached per epoch hour, so this costs one attestation request per hour.
+    _, valid, error = attestation_service.result()
+    if error is not None:
+        bt.logging.error(f"TEE attestation error: {error}. Reward set to 0.")
+        return 0.0
+    if not valid:
+        bt.logging.warning("TEE GPU attestation failed. Reward set to 0.")
         return 0.0
     """
     bt.logging.info(f"Evaluating response for query: {query} and response: {response}")
@@ -198,10 +195,16 @@ def reward(query: QuantQuery, response: QuantResponse) -> float:
     return reward_score
 
 
+EVALUATION_SECONDS = metrics.histogram(
+    "quant_validator_evaluation_seconds", "Duration of scoring the responses of one forward pass."
+)
+
+
 def get_rewards(
     self,
     query: QuantQuery,
     responses: List[QuantResponse],
+    attestation_mask: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Calculate and return an array of rewards for the provided query and corresponding responses.
@@ -209,8 +212,14 @@ def get_rewards(
     Args:
     - query (QuantQuery): The query sent to the miner.
     - responses (List[QuantResponse]): A list of QuantResponse objects received from the miner.
+    - attestation_mask (np.ndarray, optional): 1.0 for the miners with a valid TEE attestation and
+      0.0 for the others, as returned by `AttestationVerifier.verify`.
 
     Returns:
     - np.ndarray: An array of reward values for each response based on the given query.
     """
-    return np.array([reward(query, response) for response in responses])
+    with EVALUATION_SECONDS.time():
+        rewards = np.array([reward(query, response) for response in responses])
+    if attestation_mask is not None:
+        rewards = rewards * attestation_mask
+    return rewards
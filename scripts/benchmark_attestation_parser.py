@@ -0,0 +1,115 @@
+"""
+Benchmark the GPU attestation parser on large synthetic reports.
+
+Compares the single-pass `AttestationParser` (fed the whole document and fed in 64 KiB
+chunks, as when streaming the HTTP body) with the previous whole-document regex parser,
+on a well-formed report and on a truncated one whose last measurement blocks have no
+value, where the regex rescans the rest of the document for every block.
+
+Usage:
+    python scripts/benchmark_attestation_parser.py [--size-mb 8] [--truncated-blocks 500] [--repeat 3]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quant.validator.attestation.attestation import (  # noqa: E402
+    GOLDEN_MEASUREMENTS,
+    SUCCESS_STRINGS,
+    AttestationParser,
+    parse_gpu_attestation,
+    validate_attestation,
+)
+
+
+def legacy_parse_gpu_attestation(raw_attestation_doc):
+    measurement_blocks = re.findall(
+        r"Measurement Block index : (\d+).*?DMTFSpecMeasurementValue     : ([0-9a-fA-F]+)",
+        raw_attestation_doc, re.DOTALL)
+    checks = {s: (s in raw_attestation_doc) for s in SUCCESS_STRINGS}
+    return {
+        "measurements": [block[1] for block in measurement_blocks],
+        "checks": checks,
+        "overall_success": all(checks.values()),
+    }
+
+
+def synthetic_report(size_mb):
+    """A report padded with certificate-like lines between measurement blocks."""
+    filler = "".join(f"        Certificate line {i:04d} : {'ab' * 32}\n" for i in range(200))
+    blocks = []
+    for index, value in enumerate(GOLDEN_MEASUREMENTS):
+        blocks.append(
+            f"Measurement Block index : {index}\n"
+            f"        MeasurementSpecification     : 1\n"
+            f"{filler}"
+            f"        DMTFSpecMeasurementValue     : {value}\n"
+        )
+    body = "".join(blocks)
+    padding = []
+    while len(body) + sum(map(len, padding)) < size_mb * 1024 * 1024:
+        padding.append(filler)
+    # The success strings come last, as in real reports, so every scan reads the whole document.
+    return "".join(padding) + body + "\n".join(SUCCESS_STRINGS) + "\n"
+
+
+def truncated_report(size_mb, blocks):
+    """A report cut off within its trailing measurement blocks, before their values."""
+    trailer = "".join(
+        f"Measurement Block index : {index}\n"
+        f"        MeasurementSpecification     : 1\n"
+        f"        Certificate line : {'ab' * 32}\n"
+        for index in range(blocks)
+    )
+    return synthetic_report(size_mb) + trailer
+
+
+def best_of(repeat, function, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def streamed(doc, chunk_size=64 * 1024):
+    parser = AttestationParser()
+    for start in range(0, len(doc), chunk_size):
+        parser.feed(doc[start:start + chunk_size])
+    return parser.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=8.0)
+    parser.add_argument("--truncated-blocks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    reports = [
+        ("well-formed", synthetic_report(args.size_mb)),
+        (f"truncated, {args.truncated_blocks} blocks", truncated_report(args.size_mb, args.truncated_blocks)),
+    ]
+    for name, doc in reports:
+        print(f"Report ({name}): {len(doc) / 1024 / 1024:.1f} MiB, {doc.count(chr(10))} lines")
+
+        legacy_time, legacy = best_of(args.repeat, legacy_parse_gpu_attestation, doc)
+        whole_time, whole = best_of(args.repeat, parse_gpu_attestation, doc)
+        streamed_time, stream = best_of(args.repeat, streamed, doc)
+        assert legacy["measurements"] == whole["measurements"] == stream["measurements"]
+        assert legacy["checks"] == whole["checks"] == stream["checks"]
+        assert validate_attestation(whole)
+
+        print(f"  regex parser:        {legacy_time * 1000:8.1f} ms")
+        print(f"  single-pass parser:  {whole_time * 1000:8.1f} ms ({legacy_time / whole_time:.1f}x)")
+        print(f"  streamed (64 KiB):   {streamed_time * 1000:8.1f} ms ({legacy_time / streamed_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark the cold start of the validator and the miner.
+
+Starts each neuron in `--mock` mode in a fresh interpreter, with `--neuron.profile_startup`,
+waits for its startup report, stops it, and repeats. Prints the percentiles of the total
+startup time and of every phase of the timeline (imports, config, wallet, metagraph,
+check_registered, ...).
+
+Pass `--json` to save the results and `--baseline` to compare against saved results: the
+script exits with status 1 when the median startup of a neuron regressed by more than
+`--max-regression`.
+
+The miner is started with `--agent.url` pointing at a closed port, so the agent servers are
+not booted; pass `--with-agent` to include them.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 10] [--neurons validator miner] [--json out.json]
+                                        [--baseline previous.json] [--max-regression 0.2]
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERCENTILES = (50, 90, 99)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def neuron_command(neuron, workdir, report_path, with_agent):
+    command = [
+        sys.executable, os.path.join(ROOT, "neurons", f"{neuron}.py"),
+        "--mock",
+        "--netuid", "1",
+        "--wallet.path", os.path.join(workdir, "wallets"),
+        "--logging.logging_dir", os.path.join(workdir, "logs"),
+        "--axon.port", str(free_port()),
+        "--neuron.dont_save_events",
+        "--neuron.profile_startup",
+        "--neuron.profile_startup_path", report_path,
+    ]
+    if neuron == "validator":
+        command.append("--neuron.axon_off")
+    elif not with_agent:
+        command += ["--agent.url", "http://127.0.0.1:9"]
+    return command
+
+
+def cold_start(neuron, workdir, run, timeout, with_agent):
+    """
+    Start a neuron, wait for its startup report, then stop it.
+
+    Returns:
+        dict: The startup report.
+    """
+    report_path = os.path.join(workdir, f"{neuron}-{run}.json")
+    log_path = os.path.join(workdir, f"{neuron}-{run}.log")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.getenv("PYTHONPATH")])))
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(
+            neuron_command(neuron, workdir, report_path, with_agent),
+            cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+        try:
+            deadline = time.monotonic() + timeout
+            while not os.path.exists(report_path):
+                if process.poll() is not None:
+                    raise RuntimeError(f"{neuron} exited with {process.returncode} before starting, see {log_path}")
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{neuron} did not start within {timeout}s, see {log_path}")
+                time.sleep(0.05)
+        finally:
+            if process.poll() is None:
+                process.send_signal(signal.SIGINT)
+                try:
+                    process.wait(10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+    with open(report_path) as f:
+        return json.load(f)
+
+
+def summarize(reports):
+    """
+    Returns:
+        dict: The percentiles of the total and of every phase, in seconds.
+    """
+    durations = defaultdict(list)
+    for report in reports:
+        durations["total"].append(report["total"])
+        for phase in report["phases"]:
+            durations[phase["name"]].append(phase["duration"])
+    return {
+        name: {f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES}
+        for name, values in durations.items()
+    }
+
+
+def print_summary(neuron, runs, summary):
+    print(f"{neuron} ({runs} cold starts)")
+    print(f"  {'phase':<24}" + "".join(f"{f'p{p}':>10}" for p in PERCENTILES))
+    for name, percentiles in sorted(summary.items(), key=lambda item: -item[1]["p50"]):
+        print(f"  {name:<24}" + "".join(f"{percentiles[f'p{p}'] * 1000:>8.0f}ms" for p in PERCENTILES))
+
+
+def regressions(results, baseline, max_regression):
+    """
+    Returns:
+        List[str]: The neurons whose median startup regressed by more than `max_regression`.
+    """
+    failures = []
+    for neuron, summary in results.items():
+        if neuron not in baseline:
+            continue
+        before, after = baseline[neuron]["total"]["p50"], summary["total"]["p50"]
+        if after > before * (1 + max_regression):
+            failures.append(f"{neuron}: median startup {before:.2f}s -> {after:.2f}s")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--neurons", nargs="+", choices=("validator", "miner"), default=["validator", "miner"])
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for one start.")
+    parser.add_argument("--with-agent", action="store_true", help="Boot the miner's agent servers.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare with.")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="quant-startup-") as workdir:
+        for neuron in args.neurons:
+            reports = [cold_start(neuron, workdir, run, args.timeout, args.with_agent) for run in range(args.runs)]
+            results[neuron] = summarize(reports)
+            print_summary(neuron, args.runs, results[neuron])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = regressions(results, json.load(f), args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import time
+import asyncio
+
+import pytest
+
+from quant.miner.admission import AdmissionController, AdmissionRejected
+
+
+async def hold(controller, priority, order, release, **kwargs):
+    """Take a slot, note it, and keep it until `release` is set."""
+    async with controller.slot(priority, **kwargs):
+        order.append(priority)
+        await release.wait()
+
+
+def test_waiters_are_served_by_priority():
+    controller = AdmissionController(max_concurrency=1, max_queue=10)
+    order = []
+
+    async def run():
+        release = asyncio.Event()
+        await controller.acquire(100)
+        # Equal priorities are served first come, first served.
+        tasks = [asyncio.ensure_future(hold(controller, p, order, release)) for p in (1, 5, 3, 5.0)]
+        await asyncio.sleep(0)
+        assert controller.waiting == 4 and controller.active == 1
+        release.set()
+        controller.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == [5, 5.0, 3, 1]
+    assert isinstance(order[0], int)
+    assert controller.active == 0 and controller.waiting == 0
+
+
+def test_full_queue_displaces_the_lowest_priority_waiter():
+    controller = AdmissionController(max_concurrency=1, max_queue=2)
+
+    async def run():
+        await controller.acquire(100)
+        low = asyncio.ensure_future(controller.acquire(1))
+        mid = asyncio.ensure_future(controller.acquire(2))
+        await asyncio.sleep(0)
+
+        # Not above the lowest waiter: rejected at once.
+        with pytest.raises(AdmissionRejected, match="at capacity"):
+            await controller.acquire(1)
+
+        high = asyncio.ensure_future(controller.acquire(3))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected, match="Displaced"):
+            await low
+        assert controller.waiting == 2
+
+        controller.release()
+        await high
+        assert not mid.done()
+        controller.release()
+        await mid
+        controller.release()
+
+    asyncio.run(run())
+    assert controller.rejected == 2
+    assert controller.active == 0 and controller.waiting == 0
+
+
+def test_waiting_times_out():
+    controller = AdmissionController(max_concurrency=1, max_queue=10, max_wait=0.5)
+
+    async def run():
+        await controller.acquire(1)
+        start = time.monotonic()
+        with pytest.raises(AdmissionRejected, match="No capacity"):
+            await controller.acquire(1, timeout=0.05)
+        assert 0.04 <= time.monotonic() - start < 0.5
+
+        # The deadline is max_wait of the request timeout.
+        deadline = controller.deadline(0.1)
+        assert deadline - time.monotonic() == pytest.approx(0.05, abs=0.01)
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire(1, deadline=deadline)
+        assert time.monotonic() < deadline + 0.05
+
+        # A past deadline only rejects requests that would have to wait.
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire(1, timeout=10, deadline=time.monotonic() - 1)
+        assert controller.waiting == 0
+        controller.release()
+        await controller.acquire(1, deadline=time.monotonic() - 1)
+        controller.release()
+
+    asyncio.run(run())
+    assert controller.deadline(None) is None
+    assert controller.rejected == 3
+    assert controller.active == 0 and controller.waiting == 0
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    controller = AdmissionController(max_concurrency=1, max_queue=10)
+
+    async def run():
+        await controller.acquire(1)
+        waiter = asyncio.ensure_future(controller.acquire(5))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.waiting == 0
+        controller.release()
+
+    asyncio.run(run())
+    assert controller.active == 0
+
+
+def test_slot_handed_to_a_cancelled_waiter_passes_on():
+    controller = AdmissionController(max_concurrency=1, max_queue=10)
+
+    async def run():
+        await controller.acquire(1)
+        first = asyncio.ensure_future(controller.acquire(5))
+        second = asyncio.ensure_future(controller.acquire(2))
+        await asyncio.sleep(0)
+
+        # The slot goes to `first`, which is cancelled before it wakes up.
+        controller.release()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await second
+        assert controller.active == 1 and controller.waiting == 0
+        controller.release()
+
+    asyncio.run(run())
+    assert controller.active == 0
+
+
+def test_slot_is_released_on_error():
+    controller = AdmissionController(max_concurrency=1, max_queue=10)
+    order = []
+
+    async def fail():
+        async with controller.slot(1):
+            await asyncio.sleep(0.01)
+            raise ValueError("agent failed")
+
+    async def run():
+        release = asyncio.Event()
+        release.set()
+        failing = asyncio.ensure_future(fail())
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(hold(controller, 2, order, release))
+        with pytest.raises(ValueError):
+            await failing
+        await waiter
+
+    asyncio.run(run())
+    assert order == [2]
+    assert controller.active == 0 and controller.waiting == 0
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+
+from aiohttp import web
+
+from quant.miner.agent_client import DEFAULT_QUERY_PATH, AgentClient
+from quant.protocol import QuantQuery, QuantResponse
+
+
+async def serve(handler):
+    app = web.Application()
+    app.router.add_post(DEFAULT_QUERY_PATH, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def echo(request):
+    body = await request.json()
+    return web.json_response({"response": body["query"], "metadata": {"userID": body["userID"]}})
+
+
+def query(text="q"):
+    return QuantQuery(query=text, userID="wallet", metadata={})
+
+
+def test_concurrent_queries_share_one_session():
+    state = {"inflight": 0, "max_inflight": 0, "peers": set()}
+
+    async def slow_echo(request):
+        state["inflight"] += 1
+        state["max_inflight"] = max(state["max_inflight"], state["inflight"])
+        state["peers"].add(request.transport.get_extra_info("peername"))
+        try:
+            await asyncio.sleep(0.05)
+            return await echo(request)
+        finally:
+            state["inflight"] -= 1
+
+    async def run():
+        runner, url = await serve(slow_echo)
+        client = AgentClient(url, max_concurrency=4)
+        try:
+            first = await asyncio.gather(*(client.query(query(str(i))) for i in range(8)))
+            second = await asyncio.gather(*(client.query(query(str(i))) for i in range(4)))
+            return client, first + second
+        finally:
+            await client.aclose()
+            client.close()
+            await runner.cleanup()
+
+    client, responses = asyncio.run(run())
+    assert all(isinstance(response, QuantResponse) for response in responses)
+    assert [response.response for response in responses] == [str(i) for i in range(8)] + [str(i) for i in range(4)]
+    assert responses[0].metadata == {"userID": "wallet"}
+    # Bounded by max_concurrency, over keep-alive connections reused across batches.
+    assert state["max_inflight"] == 4
+    assert len(state["peers"]) <= 4
+
+
+def test_timeout_returns_none():
+    async def hang(request):
+        await asyncio.sleep(1)
+        return await echo(request)
+
+    async def run():
+        runner, url = await serve(hang)
+        client = AgentClient(url, timeout=0.1)
+        try:
+            return await client.query(query())
+        finally:
+            await client.aclose()
+            client.close()
+            await runner.cleanup()
+
+    assert asyncio.run(run()) is None
+
+
+def test_server_error_ejects_the_worker():
+    hits = {"bad": 0, "good": 0}
+
+    async def broken(request):
+        hits["bad"] += 1
+        return web.Response(status=500)
+
+    async def working(request):
+        hits["good"] += 1
+        return await echo(request)
+
+    async def run():
+        bad_runner, bad = await serve(broken)
+        good_runner, good = await serve(working)
+        client = AgentClient([bad, good], eject_after=1, eject_for=60)
+        try:
+            responses = []
+            while not hits["bad"]:
+                responses.append(await client.query(query()))
+            assert responses[-1] is None
+            assert client.pool.healthy() == [good]
+            # Every following call goes to the remaining worker.
+            later = [await client.query(query()) for _ in range(4)]
+            return later
+        finally:
+            await client.aclose()
+            client.close()
+            await bad_runner.cleanup()
+            await good_runner.cleanup()
+
+    later = asyncio.run(run())
+    assert all(response is not None and response.response == "q" for response in later)
+    assert hits["bad"] == 1
+
+
+def test_query_sync_from_another_thread():
+    threads = []
+
+    def call(client):
+        threads.append(threading.current_thread())
+        return client.query_sync(query("sync"))
+
+    async def run():
+        runner, url = await serve(echo)
+        client = AgentClient(url)
+        try:
+            # The server runs on this loop, the blocking call must happen off it.
+            return await asyncio.get_running_loop().run_in_executor(None, call, client)
+        finally:
+            client.close()
+            await runner.cleanup()
+
+    response = asyncio.run(run())
+    assert response.response == "sync"
+    assert threads[0] is not threading.main_thread()
+
+
+def test_aclose_releases_the_loop_session():
+    async def run():
+        runner, url = await serve(echo)
+        client = AgentClient(url)
+        try:
+            assert (await client.query(query())).response == "q"
+            loop = asyncio.get_running_loop()
+            session = client._loops[loop].session
+            assert not session.closed
+
+            await client.aclose()
+            assert session.closed and loop not in client._loops
+            # A later call on the loop opens a new session.
+            assert (await client.query(query())).response == "q"
+            assert client._loops[loop].session is not session
+            await client.aclose()
+        finally:
+            client.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
@@ -0,0 +1,76 @@
+from quant.miner.agent_client import AgentPool, parse_agent_urls
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_agent_urls():
+    assert parse_agent_urls("http://a:5000/, http://b:5001") == [
+        "http://a:5000",
+        "http://b:5001",
+    ]
+    assert parse_agent_urls(["http://a:5000"]) == ["http://a:5000"]
+
+
+def test_least_outstanding_requests():
+    pool = AgentPool(["a", "b", "c"], clock=FakeClock())
+    first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+    assert {first.url, second.url, third.url} == {"a", "b", "c"}
+
+    pool.release(second, ok=True)
+    # The only worker without outstanding requests gets the next call.
+    assert pool.acquire() is second
+
+
+def test_ejection_and_reinstatement():
+    clock = FakeClock()
+    pool = AgentPool(["a", "b"], eject_after=2, eject_for=10, clock=clock)
+    a = next(e for e in pool.endpoints if e.url == "a")
+
+    for _ in range(2):
+        a.outstanding += 1
+        pool.release(a, ok=False)
+    assert pool.healthy() == ["b"]
+    assert all(pool.acquire().url == "b" for _ in range(5))
+
+    # Back on probation after the ejection period, one failure ejects it for twice as long.
+    clock.now = 10
+    assert pool.healthy() == ["a", "b"]
+    a.outstanding += 1
+    pool.release(a, ok=False)
+    assert a.ejected_until == 30
+
+    # A success reinstates it for good.
+    clock.now = 30
+    a.outstanding += 1
+    pool.release(a, ok=True)
+    assert a.ejections == 0 and pool.healthy() == ["a", "b"]
+
+
+def test_all_ejected_fails_open():
+    clock = FakeClock()
+    pool = AgentPool(["a", "b"], eject_after=1, eject_for=10, clock=clock)
+    a, b = pool.endpoints
+    a.outstanding = b.outstanding = 1
+    pool.release(b, ok=False)
+    clock.now = 1
+    pool.release(a, ok=False)
+    # Nothing is healthy, use the worker due back first.
+    assert pool.acquire() is b
+
+
+def test_standby_takes_traffic_only_while_a_worker_is_out():
+    pool = AgentPool(["a", "b"], clock=FakeClock(), standby_urls=["s"])
+    assert {pool.acquire().url for _ in range(10)} == {"a", "b"}
+
+    pool.eject("a")
+    assert {pool.acquire().url for _ in range(10)} == {"b", "s"}
+    assert pool.healthy() == ["b", "s"]
+
+    pool.reinstate("a")
+    assert {pool.acquire().url for _ in range(10)} == {"a", "b"}
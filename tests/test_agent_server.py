@@ -0,0 +1,221 @@
+import sys
+import time
+import socket
+import subprocess
+
+import pytest
+
+from neurons import quant_agent_server
+
+# A stand-in for the agent server: chatty on startup, then serves /health.
+FAKE_SERVER = """
+import sys, json, time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"service": "quant-agent-server"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+for i in range(20000):
+    print("warming up", i, file=sys.stderr)
+time.sleep(0.2)
+server = HTTPServer(("127.0.0.1", int(sys.argv[1])), Handler)
+print("Server ready", flush=True)
+server.serve_forever()
+"""
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start(tmp_path, code, port, ready_pattern=None):
+    process = subprocess.Popen(
+        [sys.executable, "-c", code, str(port)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+    )
+    quant_agent_server.quant_agent_pumps[port] = quant_agent_server.OutputPump(
+        process, f"agent_server_{port}", str(tmp_path), 64 * 1024, 2, tail_lines=10, ready_pattern=ready_pattern
+    )
+    return process
+
+
+def stop(process, port):
+    process.kill()
+    process.wait()
+    quant_agent_server.quant_agent_pumps.pop(port).close()
+
+
+def test_backoff_delays_grow_to_the_cap():
+    delays = quant_agent_server.backoff_delays(initial=0.01, maximum=0.1)
+    assert [round(next(delays), 3) for _ in range(6)] == [0.01, 0.02, 0.04, 0.08, 0.1, 0.1]
+
+
+def test_chatty_server_becomes_ready_and_output_is_rotated(tmp_path):
+    port = free_port()
+    process = start(tmp_path, FAKE_SERVER, port, ready_pattern="Server ready")
+    try:
+        start_time = time.monotonic()
+        assert quant_agent_server.wait_for_quant_agent_server(process, port, timeout=20)
+        assert time.monotonic() - start_time < 10
+        assert quant_agent_server.quant_agent_pumps[port].ready.is_set()
+    finally:
+        stop(process, port)
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert files == [f"agent_server_{port}.log", f"agent_server_{port}.log.1", f"agent_server_{port}.log.2"]
+
+
+def test_crash_is_reported_with_recent_output(tmp_path):
+    port = free_port()
+    process = start(tmp_path, "import sys\nprint('boom', file=sys.stderr)\nsys.exit(1)", port)
+    try:
+        assert not quant_agent_server.wait_for_quant_agent_server(process, port, timeout=20)
+        assert "[stderr] boom" in quant_agent_server.agent_server_output(port)
+    finally:
+        stop(process, port)
+
+
+def test_worker_listening_on_another_port_fails_loudly(tmp_path):
+    port, other_port = free_port(), free_port()
+    # Another server answers on the worker's port, the worker ignored it and binds its own.
+    impostor = start(tmp_path, FAKE_SERVER, port)
+    worker = start(tmp_path, FAKE_SERVER, other_port)
+    try:
+        assert quant_agent_server.wait_for_quant_agent_server(impostor, port, timeout=20)
+        assert quant_agent_server.listening_ports(impostor.pid) == {port}
+        with pytest.raises(quant_agent_server.AgentServerPortError, match=f"listens on port\\(s\\) {other_port}"):
+            quant_agent_server.wait_for_quant_agent_server(worker, port, timeout=20)
+        # The misbound worker is stopped.
+        assert worker.wait(5) is not None
+    finally:
+        stop(impostor, port)
+        stop(worker, other_port)
+
+
+def test_pool_urls_cover_the_ports_that_were_set_up():
+    url = quant_agent_server.agent_server_url
+    # Port 5001 is held by another application, 5002 is reused, 5003 is the standby.
+    pool = {5000: None, 5002: None, 5003: None}
+    assert quant_agent_server.pool_urls(pool, 3, 5000) == ([url(5000), url(5002)], [url(5003)])
+    assert quant_agent_server.pool_urls({5003: None}, 3, 5000) == ([url(5003)], [])
+    assert quant_agent_server.pool_urls({}, 3, 5000) == ([], [])
+
+
+def test_listens_on_own_port(monkeypatch):
+    process = FakeProcess()
+    for ports, expected in ((None, True), ({5000, 9000}, True), (set(), False)):
+        monkeypatch.setattr(quant_agent_server, "listening_ports", lambda pid, ports=ports: ports)
+        assert quant_agent_server.listens_on_own_port(process, 5000) is expected
+    monkeypatch.setattr(quant_agent_server, "listening_ports", lambda pid: {5001})
+    with pytest.raises(quant_agent_server.AgentServerPortError):
+        quant_agent_server.listens_on_own_port(process, 5000)
+
+
+class FakeProcess:
+    def __init__(self):
+        self.returncode = None
+        self.pid = 1
+
+    def poll(self):
+        return self.returncode
+
+
+def test_supervisor_restarts_with_backoff_and_detects_crash_loops(monkeypatch):
+    now = [0.0]
+    started, exited, ready = [], [], []
+    monkeypatch.setattr(quant_agent_server, "start_quant_agent_server", lambda port, cpus=None: started.append(port) or FakeProcess())
+    monkeypatch.setattr(quant_agent_server, "probe_quant_agent_server", lambda port, timeout=1.0: True)
+    monkeypatch.setattr(quant_agent_server, "listening_ports", lambda pid: None)
+    monkeypatch.setattr(quant_agent_server.random, "uniform", lambda a, b: 1.0)
+    process = FakeProcess()
+    supervisor = quant_agent_server.AgentServerSupervisor(
+        {5000: process, 5001: None},
+        initial_backoff=1,
+        max_backoff=60,
+        crash_loop_restarts=2,
+        crash_loop_window=100,
+        on_exit=exited.append,
+        on_ready=ready.append,
+        clock=lambda: now[0],
+    )
+
+    delays = []
+    for _ in range(4):
+        supervisor.processes[5000].returncode = 1
+        supervisor.check()
+        delays.append(supervisor.restart_at[5000] - now[0])
+        now[0] = supervisor.restart_at[5000]
+        supervisor.check()
+    # Doubling backoff, then only the slow retry once the worker is crash-looping.
+    assert delays == [1, 2, 60, 60]
+    assert started == [5000] * 4
+    assert exited == [5000] * 4
+    assert ready == [5000] * 4
+
+
+def test_watchdog_drains_and_recycles_one_worker_at_a_time(monkeypatch):
+    now = [0.0]
+    started, exited = [], []
+    monkeypatch.setattr(quant_agent_server, "start_quant_agent_server", lambda port, cpus=None: started.append(port) or FakeProcess())
+    monkeypatch.setattr(quant_agent_server, "probe_quant_agent_server", lambda port, timeout=1.0: False)
+    stats = quant_agent_server.ProcessStats(rss_bytes=2048 * 1024 * 1024, cpu_seconds=0.0, open_fds=10)
+    in_flight = {5000: 2, 5001: 0}
+    processes = {5000: FakeProcess(), 5001: FakeProcess()}
+    for process in processes.values():
+        process.terminate = lambda process=process: setattr(process, "returncode", -15)
+    supervisor = quant_agent_server.AgentServerSupervisor(
+        processes,
+        max_rss_mb=1024,
+        drain_timeout=30,
+        on_exit=exited.append,
+        outstanding=in_flight.get,
+        read_stats=lambda pid: stats,
+        clock=lambda: now[0],
+    )
+
+    supervisor.check()
+    # Both workers are over the limit, only the first one is drained.
+    assert list(supervisor.recycling) == [5000]
+    assert exited == [5000]
+    assert processes[5001].returncode is None
+
+    # It is stopped once its requests are done, then restarted without counting a crash.
+    in_flight[5000] = 0
+    supervisor.check()
+    supervisor.check()
+    supervisor.check()
+    assert started == [5000]
+    assert not supervisor.crashes[5000]
+    # The second worker waits until the first one is back.
+    assert 5001 not in supervisor.recycling
+
+
+def test_cpu_recycle_reports_the_measured_use(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(quant_agent_server.bt.logging, "warning", warnings.append)
+    cpu_seconds = [0.0]
+    supervisor = quant_agent_server.AgentServerSupervisor(
+        {5000: FakeProcess()},
+        max_cpu_percent=50,
+        cpu_window=10,
+        read_stats=lambda pid: quant_agent_server.ProcessStats(
+            rss_bytes=0, cpu_seconds=cpu_seconds[0], open_fds=10
+        ),
+    )
+    assert supervisor.overloaded(5000, FakeProcess(), 0.0) is None
+    cpu_seconds[0] = 8.0
+    assert supervisor.overloaded(5000, FakeProcess(), 10.0) == "cpu"
+    assert "exceeds its cpu limit" in warnings[-1]
+    assert "cpu 80% over 10s" in warnings[-1]
@@ -0,0 +1,193 @@
+import asyncio
+
+from quant.miner.cache import AnswerCache, parse_category_ttls
+from quant.protocol import QuantQuery, QuantResponse
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeAgent:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def query(self, query):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return QuantResponse(
+            response=f"{query.query} #{self.calls}",
+            signature=b"sig",
+            proofs=[],
+            metadata={},
+        )
+
+
+def make_query(text="Should i buy SOL?", user="wallet", **metadata):
+    return QuantQuery(query=text, userID=user, metadata=metadata)
+
+
+def test_fresh_hits_skip_the_agent():
+    agent = FakeAgent()
+    cache = AnswerCache(clock=FakeClock())
+
+    async def run():
+        first = await cache.get_or_fetch(make_query(validator_id="a"), agent.query)
+        # validator_id is not part of the key, other metadata is.
+        second = await cache.get_or_fetch(make_query(validator_id="b"), agent.query)
+        third = await cache.get_or_fetch(make_query(Type="other"), agent.query)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first.response == second.response == "Should i buy SOL? #1"
+    assert third.response == "Should i buy SOL? #2"
+    assert agent.calls == 2
+    assert cache.stats["hits"] == 1
+
+
+def test_cached_answers_are_copies():
+    agent = FakeAgent()
+    cache = AnswerCache(clock=FakeClock())
+
+    async def run():
+        first = await cache.get_or_fetch(make_query(), agent.query)
+        first.metadata["miner_id"] = "mutated"
+        return await cache.get_or_fetch(make_query(), agent.query)
+
+    assert asyncio.run(run()).metadata == {}
+
+
+def test_stale_answer_is_served_while_refreshing():
+    agent = FakeAgent()
+    clock = FakeClock()
+    cache = AnswerCache(
+        clock=clock, category_ttls=parse_category_ttls("investment=10"), stale_ttl=100
+    )
+
+    async def run():
+        await cache.get_or_fetch(make_query(), agent.query)
+        clock.now = 50
+        stale = await cache.get_or_fetch(make_query(), agent.query)
+        # Let the background refresh complete.
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        fresh = await cache.get_or_fetch(make_query(), agent.query)
+        clock.now = 500
+        expired = await cache.get_or_fetch(make_query(), agent.query)
+        return stale, fresh, expired
+
+    stale, fresh, expired = asyncio.run(run())
+    assert stale.response == "Should i buy SOL? #1"
+    assert fresh.response == "Should i buy SOL? #2"
+    assert expired.response == "Should i buy SOL? #3"
+    assert cache.stats["stale_hits"] == 1
+
+
+def test_concurrent_misses_share_one_agent_call():
+    agent = FakeAgent(delay=0.05)
+    cache = AnswerCache()
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_fetch(make_query(), agent.query) for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+    assert agent.calls == 1
+    assert {r.response for r in results} == {"Should i buy SOL? #1"}
+
+
+def test_lru_bound():
+    agent = FakeAgent()
+    cache = AnswerCache(max_entries=2, clock=FakeClock())
+
+    async def run():
+        for text in ("Should i buy SOL?", "Should i buy ETH?", "Should i buy BTC?"):
+            await cache.get_or_fetch(make_query(text), agent.query)
+
+    asyncio.run(run())
+    assert len(cache) == 2
+    assert cache.lookup(make_query("Should i buy SOL?"))[1] == "miss"
+    assert cache.lookup(make_query("Should i buy BTC?"))[1] == "fresh"
+
+
+class Rejected(Exception):
+    pass
+
+
+def test_followers_fetch_again_when_the_leader_is_rejected():
+    agent = FakeAgent(delay=0.02)
+    cache = AnswerCache(caller_errors=(Rejected,))
+
+    async def rejected_fetch(query):
+        await asyncio.sleep(0.01)
+        raise Rejected()
+
+    async def run():
+        leader = asyncio.ensure_future(cache.fetch(make_query(), rejected_fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(cache.fetch(make_query(), agent.query)) for _ in range(3)]
+        results = await asyncio.gather(leader, *followers, return_exceptions=True)
+        return results[0], results[1:]
+
+    leader, followers = asyncio.run(run())
+    assert isinstance(leader, Rejected)
+    # The followers share the one call made by the first of them to retry.
+    assert agent.calls == 1
+    assert {r.response for r in followers} == {"Should i buy SOL? #1"}
+
+
+def test_followers_fetch_again_when_the_leader_is_cancelled():
+    agent = FakeAgent(delay=0.02)
+    cache = AnswerCache()
+
+    async def run():
+        leader = asyncio.ensure_future(cache.fetch(make_query(), FakeAgent(delay=1).query))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.fetch(make_query(), agent.query))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()).response == "Should i buy SOL? #1"
+    assert cache.lookup(make_query())[1] == "fresh"
+
+
+def test_cancelled_follower_does_not_cancel_the_leader():
+    agent = FakeAgent(delay=0.02)
+    cache = AnswerCache()
+
+    async def run():
+        leader = asyncio.ensure_future(cache.fetch(make_query(), agent.query))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.fetch(make_query(), agent.query))
+        await asyncio.sleep(0.005)
+        follower.cancel()
+        return await leader
+
+    assert asyncio.run(run()).response == "Should i buy SOL? #1"
+    assert agent.calls == 1
+
+
+def test_agent_errors_are_shared():
+    cache = AnswerCache(caller_errors=(Rejected,))
+    calls = []
+
+    async def failing_fetch(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("agent down")
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.fetch(make_query(), failing_fetch) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
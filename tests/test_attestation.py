@@ -0,0 +1,156 @@
+import re
+import time
+import random
+import threading
+
+from quant.validator.attestation.attestation import (
+    GOLDEN_MEASUREMENTS,
+    SUCCESS_STRINGS,
+    AttestationParser,
+    AttestationService,
+    generate_nonce,
+    parse_gpu_attestation,
+    validate_attestation,
+)
+
+
+def attestation_doc(measurements=GOLDEN_MEASUREMENTS):
+    blocks = "\n".join(
+        f"Measurement Block index : {index}\nDMTFSpecMeasurementValue     : {value}"
+        for index, value in enumerate(measurements)
+    )
+    return blocks + "\n" + "\n".join(SUCCESS_STRINGS)
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+        self.encoding = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for start in range(0, len(self.text), chunk_size):
+            yield self.text[start:start + chunk_size]
+
+
+class FakeSession:
+    def __init__(self, status_code=200, text=None, delay=0.0):
+        self.status_code = status_code
+        self.text = attestation_doc() if text is None else text
+        self.delay = delay
+        self.nonces = []
+
+    def post(self, url, headers=None, json=None, timeout=None, stream=False):
+        assert timeout is not None
+        self.nonces.append(json["nonce"])
+        time.sleep(self.delay)
+        return FakeResponse(self.status_code, self.text)
+
+
+def test_generate_nonce_changes_hourly():
+    assert generate_nonce(3600 * 5) == generate_nonce(3600 * 5 + 3599) == f"{5:016x}"
+    assert generate_nonce(3600 * 6) != generate_nonce(3600 * 5)
+
+
+def test_result_is_fetched_once_per_nonce():
+    session = FakeSession()
+    service = AttestationService(session=session)
+    assert all(service.is_valid("a") for _ in range(10))
+    assert service.is_valid("b")
+    assert session.nonces == ["a", "b"]
+
+
+def test_concurrent_callers_share_one_request():
+    session = FakeSession(delay=0.2)
+    service = AttestationService(session=session)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.is_valid("a"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True] * 8
+    assert session.nonces == ["a"]
+
+
+def test_failures_are_cached_briefly():
+    now = [0.0]
+    session = FakeSession(status_code=500)
+    service = AttestationService(session=session, error_ttl=60, clock=lambda: now[0])
+    attestation, valid, error = service.result("a")
+    assert attestation is None and not valid and isinstance(error, RuntimeError)
+    service.result("a")
+    assert len(session.nonces) == 1
+
+    now[0] = 60
+    session.status_code = 200
+    assert service.is_valid("a")
+    assert len(session.nonces) == 2
+
+
+def legacy_parse(raw_attestation_doc):
+    blocks = re.findall(
+        r"Measurement Block index : (\d+).*?DMTFSpecMeasurementValue     : ([0-9a-fA-F]+)",
+        raw_attestation_doc, re.DOTALL)
+    return [block[1] for block in blocks], {s: (s in raw_attestation_doc) for s in SUCCESS_STRINGS}
+
+
+def test_parser_matches_the_regex_parser_on_any_chunking():
+    rng = random.Random(0)
+    doc = (
+        "header\nDMTFSpecMeasurementValue     : ff\n"
+        "Measurement Block index : 1\nMeasurement Block index : 2\nsome field : 1\n"
+        "DMTFSpecMeasurementValue     : \nDMTFSpecMeasurementValue     : abc123\n"
+        + attestation_doc()
+        + "\nMeasurement Block index : 9 DMTFSpecMeasurementValue     : 42 trailing"
+    )
+    # A success string is also checked for when it is missing.
+    for doc in (doc, doc.replace(SUCCESS_STRINGS[2], "")):
+        measurements, checks = legacy_parse(doc)
+        for _ in range(20):
+            parser = AttestationParser()
+            position = 0
+            while position < len(doc):
+                size = rng.randint(1, 64)
+                parser.feed(doc[position:position + size])
+                position += size
+            result = parser.result()
+            assert result["measurements"] == measurements
+            assert result["checks"] == checks
+    assert not checks[SUCCESS_STRINGS[2]]
+
+
+def test_validation_uses_the_golden_digest():
+    assert validate_attestation(parse_gpu_attestation(attestation_doc()))
+    assert not validate_attestation(parse_gpu_attestation(attestation_doc(GOLDEN_MEASUREMENTS[:-1])))
+    # Attestations built without the parser are still compared.
+    assert validate_attestation({"measurements": list(GOLDEN_MEASUREMENTS), "overall_success": True})
+
+
+def test_importing_the_reward_code_starts_nothing():
+    import quant.validator.reward  # noqa: F401
+
+    assert not [thread for thread in threading.enumerate() if thread.name == "attestation"]
+
+
+def test_periodic_checks_are_jittered_and_stoppable():
+    from quant.validator.attestation.periodic import PeriodicAttestationService
+
+    service = PeriodicAttestationService(
+        service=AttestationService(session=FakeSession()), max_jitter=300, clock=lambda: 3600 * 10 + 600
+    )
+    delays = {service.seconds_until_next_check() for _ in range(20)}
+    assert all(3000 <= delay <= 3300 for delay in delays) and len(delays) > 1
+    assert service.check()
+
+    service.start()
+    assert service.thread.is_alive()
+    thread = service.thread
+    service.stop()
+    assert not thread.is_alive()
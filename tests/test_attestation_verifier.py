@@ -0,0 +1,88 @@
+import asyncio
+
+import numpy as np
+from aiohttp import web
+
+from quant.validator.attestation.verifier import AttestationVerifier
+from tests.test_attestation import attestation_doc
+
+
+async def serve(handler):
+    app = web.Application()
+    app.router.add_post("/attest/gpu", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/attest/gpu"
+
+
+def test_verify_returns_a_mask_and_caches_verdicts():
+    requests = []
+
+    async def good(request):
+        requests.append((await request.json())["nonce"])
+        await asyncio.sleep(0.05)
+        return web.Response(text=attestation_doc())
+
+    async def run():
+        runner, url = await serve(good)
+        try:
+            verifier = AttestationVerifier(max_concurrency=2)
+            hotkeys = ["hk0", "hk1", "hk2", "hk3"]
+            targets = [(0, url), (1, None), (2, url), (3, "http://127.0.0.1:1/attest/gpu")]
+            first = await verifier.verify(targets, hotkeys, nonce="n")
+            second = await verifier.verify(targets, hotkeys, nonce="n")
+            verifier.close()
+            return verifier, first, second
+        finally:
+            await runner.cleanup()
+
+    verifier, first, second = asyncio.run(run())
+    np.testing.assert_array_equal(first, [1, 0, 1, 0])
+    np.testing.assert_array_equal(second, first)
+    # One request per reachable miner, the verdicts are reused.
+    assert requests == ["n", "n"]
+    # The unreachable miner got no verdict, it is asked again next time.
+    assert list(verifier._verdicts) == [("hk0", "n"), ("hk2", "n")]
+
+
+def test_failed_fetch_is_retried():
+    calls = []
+
+    async def flaky(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return web.Response(status=503)
+        return web.Response(text=attestation_doc())
+
+    async def run():
+        runner, url = await serve(flaky)
+        try:
+            verifier = AttestationVerifier()
+            masks = [await verifier.verify([(0, url)], ["hk0"], nonce="n") for _ in range(3)]
+            verifier.close()
+            return masks
+        finally:
+            await runner.cleanup()
+
+    failed, recovered, cached = asyncio.run(run())
+    np.testing.assert_array_equal(failed, [0])
+    np.testing.assert_array_equal(recovered, [1])
+    np.testing.assert_array_equal(cached, [1])
+    assert len(calls) == 2
+
+
+def test_invalid_measurements_fail():
+    async def tampered(request):
+        return web.Response(text=attestation_doc(measurements=["00"]))
+
+    async def run():
+        runner, url = await serve(tampered)
+        try:
+            return await AttestationVerifier().verify([(0, url)], ["hk0"], nonce="n")
+        finally:
+            await runner.cleanup()
+
+    np.testing.assert_array_equal(asyncio.run(run()), [0])
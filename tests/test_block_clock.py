@@ -0,0 +1,64 @@
+from quant.utils.block_clock import BlockClock
+
+
+class FakeChain:
+    """A chain producing a block every 12 seconds of fake time."""
+
+    def __init__(self, start_block=100, phase=0.0):
+        self.now = 0.0
+        self.start_block = start_block
+        self.phase = phase
+        self.fetches = 0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def get_current_block(self):
+        self.fetches += 1
+        return self.start_block + int((self.now + self.phase) // 12)
+
+
+def make_clock(chain, **kwargs):
+    return BlockClock(chain.get_current_block, clock=chain.clock, sleep=chain.sleep, **kwargs)
+
+
+def test_block_is_extrapolated_without_fetching():
+    chain = FakeChain()
+    clock = make_clock(chain, sync_interval=600)
+    assert clock.block == 100
+    for _ in range(60):
+        chain.now += 5
+        assert clock.block == 100 + int(chain.now // 12)
+    assert chain.fetches == 1
+
+
+def test_drift_is_corrected_on_fetch():
+    chain = FakeChain(phase=11.0)
+    clock = make_clock(chain, sync_interval=30)
+    assert clock.block == 100
+    chain.now = 1.5
+    # The clock anchored mid-block and lags, the chain has moved on.
+    assert clock.block == 100
+    chain.now = 31.0
+    assert clock.block == chain.get_current_block()
+
+
+def test_wait_until_sleeps_to_the_target():
+    chain = FakeChain()
+    clock = make_clock(chain, sync_interval=600)
+    assert clock.wait_until(110) == 110
+    assert 120.0 <= chain.now < 123.0
+    # Fetched once to anchor and once to confirm the target.
+    assert chain.fetches == 2
+
+
+def test_wait_until_can_be_aborted():
+    chain = FakeChain()
+    clock = make_clock(chain)
+    calls = []
+    block = clock.wait_until(1000, should_exit=lambda: calls.append(1) or len(calls) > 3)
+    assert block < 1000
+    assert chain.now == 3.0
@@ -0,0 +1,166 @@
+import json
+import time
+import asyncio
+import types
+
+from quant.api.bulk import AsyncRateLimiter, BulkQueryRunner, completed_indices, read_jsonl
+from quant.protocol import QuantResponse
+
+
+def fake_synapse(query, status_code=200):
+    return types.SimpleNamespace(
+        dendrite=types.SimpleNamespace(status_code=status_code, status_message="OK", process_time=0.01),
+        deserialize=lambda: QuantResponse(response=f"answer to {query}", signature=b"", proofs=[], metadata={}),
+    )
+
+
+class FakeAPI:
+    def __init__(self, delay=0.01, status_codes=None, fail_on=None):
+        self.delay = delay
+        # Status codes returned by successive calls, 200 once exhausted.
+        self.status_codes = list(status_codes or [])
+        self.fail_on = fail_on
+        self.calls = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self.max_inflight_by_uid = {}
+        self._inflight_by_uid = {}
+
+    def get_uids(self, k=3, exclude=None, order="stake"):
+        return list(range(k))
+
+    async def aquery(self, uids, query, userID, metadata, timeout=12.0, deserialize=True):
+        (uid,) = uids
+        self.calls.append((uid, query))
+        self.inflight += 1
+        self._inflight_by_uid[uid] = self._inflight_by_uid.get(uid, 0) + 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        self.max_inflight_by_uid[uid] = max(self.max_inflight_by_uid.get(uid, 0), self._inflight_by_uid[uid])
+        try:
+            await asyncio.sleep(self.delay)
+            if query == self.fail_on:
+                raise RuntimeError("interrupted")
+            status_code = self.status_codes.pop(0) if self.status_codes else 200
+            return uids, [fake_synapse(query, status_code)]
+        finally:
+            self.inflight -= 1
+            self._inflight_by_uid[uid] -= 1
+
+
+def write_lines(path, lines):
+    path.write_text("".join(line + "\n" for line in lines))
+    return str(path)
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_rate_limiter_spaces_acquisitions():
+    async def run():
+        limiter = AsyncRateLimiter(rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(12):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    # The burst is immediate, the other 10 tokens come at 50 per second.
+    elapsed = asyncio.run(run())
+    assert 0.19 <= elapsed < 0.5
+
+
+def test_rate_limiter_disabled():
+    async def run():
+        limiter = AsyncRateLimiter(rate=0)
+        start = time.monotonic()
+        for _ in range(1000):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.1
+
+
+def test_runner_bounds_concurrency(tmp_path):
+    api = FakeAPI(delay=0.02)
+    runner = BulkQueryRunner(api, k=1, max_concurrency=3, per_axon_concurrency=100, rate_limit=0)
+    output = str(tmp_path / "out.jsonl")
+    summary = asyncio.run(runner.run(({"query": f"q{i}"} for i in range(20)), output))
+    assert summary == {"completed": 20, "answered": 20, "failed": 0, "skipped": 0}
+    assert api.max_inflight == 3
+
+    api = FakeAPI(delay=0.02)
+    runner = BulkQueryRunner(api, k=3, max_concurrency=10, per_axon_concurrency=2, rate_limit=0)
+    asyncio.run(runner.run(({"query": f"q{i}"} for i in range(10)), str(tmp_path / "out2.jsonl")))
+    assert max(api.max_inflight_by_uid.values()) == 2
+
+
+def test_runner_retries_transient_status_codes(tmp_path):
+    api = FakeAPI(delay=0, status_codes=[503, 200])
+    runner = BulkQueryRunner(api, k=1, rate_limit=0, max_retries=2, retry_backoff=0)
+    output = str(tmp_path / "out.jsonl")
+    asyncio.run(runner.run([{"query": "q"}], output))
+    (record,) = read_records(output)
+    assert record["responses"] == [
+        {"uid": 0, "attempts": 2, "status_code": 200, "status_message": "OK", "process_time": 0.01,
+         "response": "answer to q", "metadata": {}}
+    ]
+
+
+def test_malformed_lines_are_reported(tmp_path):
+    path = write_lines(tmp_path / "in.jsonl", [
+        '{"query": "q0"}',
+        "",
+        "{not json",
+        '["a list"]',
+        '{"userID": "no query"}',
+        '{"query": "q1", "userID": "u"}',
+    ])
+    requests = list(read_jsonl(path))
+    assert requests[0] == {"query": "q0"} and requests[-1] == {"query": "q1", "userID": "u"}
+    assert requests[1]["error"].startswith("Invalid JSON on line 3")
+    assert requests[2] == {"error": "Line 4 has no query"}
+    assert requests[3] == {"error": "Line 5 has no query"}
+
+    api = FakeAPI(delay=0)
+    output = str(tmp_path / "out.jsonl")
+    summary = asyncio.run(BulkQueryRunner(api, k=1, rate_limit=0).run(read_jsonl(path), output))
+    assert summary["completed"] == 5 and summary["answered"] == 2 and summary["failed"] == 3
+    assert sorted(r["index"] for r in read_records(output) if "error" in r) == [1, 2, 3]
+    assert len(api.calls) == 2
+
+
+def test_interrupted_run_is_resumed(tmp_path):
+    requests = [{"query": f"q{i}"} for i in range(6)]
+    output = tmp_path / "out.jsonl"
+
+    # A previous run completed requests 0 and 2, and was killed while writing request 4.
+    output.write_text(
+        json.dumps({"index": 0, "query": "q0", "responses": []}) + "\n"
+        + json.dumps({"index": 2, "query": "q2", "responses": []}) + "\n"
+        + '{"index": 4, "query": "q4", "respo'
+    )
+    assert completed_indices(str(output)) == {0, 2}
+
+    api = FakeAPI(delay=0)
+    summary = asyncio.run(BulkQueryRunner(api, k=1, rate_limit=0).run(requests, str(output), resume=True))
+    assert summary["skipped"] == 2 and summary["completed"] == 4
+    assert sorted(query for _, query in api.calls) == ["q1", "q3", "q4", "q5"]
+
+    lines = output.read_text().splitlines()
+    assert lines[2] == '{"index": 4, "query": "q4", "respo'
+    assert completed_indices(str(output)) == set(range(6))
+
+    # Nothing left to do.
+    summary = asyncio.run(BulkQueryRunner(FakeAPI(), k=1, rate_limit=0).run(requests, str(output), resume=True))
+    assert summary["skipped"] == 6 and summary["completed"] == 0
+
+
+def test_failed_requests_are_written(tmp_path):
+    api = FakeAPI(delay=0, fail_on="q1")
+    output = str(tmp_path / "out.jsonl")
+    runner = BulkQueryRunner(api, k=1, rate_limit=0, max_retries=1, retry_backoff=0)
+    summary = asyncio.run(runner.run([{"query": "q0"}, {"query": "q1"}], output))
+    assert summary["answered"] == 1 and summary["failed"] == 1
+    failed = next(r for r in read_records(output) if r["index"] == 1)
+    assert failed["responses"][0]["status_message"] == "interrupted" and failed["responses"][0]["attempts"] == 2
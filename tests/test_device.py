@@ -0,0 +1,50 @@
+import pytest
+
+from quant.utils import device
+
+
+@pytest.fixture(autouse=True)
+def fresh_device(monkeypatch):
+    monkeypatch.delenv(device.DEVICE_ENV, raising=False)
+    monkeypatch.setattr(device, "_device", None)
+
+
+def test_probe_result_is_cached_on_disk(tmp_path, monkeypatch):
+    probes = []
+    monkeypatch.setattr(device, "probe_device", lambda: probes.append(1) or "cuda")
+    cache_path = str(tmp_path / "device_cache.json")
+
+    assert device.get_device(cache_path) == "cuda"
+    assert device.get_device(cache_path) == "cuda"
+    assert len(probes) == 1
+
+    # A new process finds the result on disk.
+    monkeypatch.setattr(device, "_device", None)
+    assert device.get_device(cache_path) == "cuda"
+    assert len(probes) == 1
+
+    # Another host, or a changed driver, probes again.
+    monkeypatch.setattr(device, "_device", None)
+    monkeypatch.setattr(device, "host_fingerprint", lambda: "other")
+    assert device.get_device(cache_path) == "cuda"
+    assert len(probes) == 2
+
+
+def test_environment_overrides_the_probe(monkeypatch):
+    monkeypatch.setattr(device, "probe_device", lambda: pytest.fail("probed"))
+    monkeypatch.setenv(device.DEVICE_ENV, "cuda:1")
+    assert device.resolve_device(device.AUTO) == "cuda:1"
+
+
+def test_explicit_device_is_not_probed(monkeypatch):
+    monkeypatch.setattr(device, "probe_device", lambda: pytest.fail("probed"))
+    assert device.resolve_device("cpu") == "cpu"
+
+
+def test_config_remembers_its_neuron_class():
+    from quant.base.miner import BaseMinerNeuron
+    from quant.utils.config import config
+
+    built = config(BaseMinerNeuron)
+    assert built.neuron.device == device.AUTO
+    assert getattr(built, "_neuron_class") is BaseMinerNeuron
@@ -0,0 +1,59 @@
+import gzip
+import json
+import logging
+import os
+
+import numpy as np
+
+from quant.utils import logging as events
+from quant.utils.logging import EVENTS_LEVEL_NUM, EventsWriter
+
+
+def record(message, *args):
+    return logging.LogRecord("event", EVENTS_LEVEL_NUM, __file__, 1, message, args, None)
+
+
+def read_lines(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_events_are_written_as_jsonl_with_compressed_rotation(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    writer = EventsWriter(path, max_bytes=4096, backup_count=3, batch_size=16)
+    writer.start()
+    for step in range(100):
+        writer.queue_handler.handle(
+            record({"event": "reward", "step": step, "uid": np.int64(3), "reward": np.float32(0.5), "latency": None})
+        )
+    writer.queue_handler.handle(record("%s done", "forward"))
+    writer.stop()
+
+    rotated = sorted(name for name in os.listdir(tmp_path) if name.endswith(".gz"))
+    assert rotated == ["events.jsonl.1.gz", "events.jsonl.2.gz", "events.jsonl.3.gz"]
+    lines = read_lines(path)
+    assert lines[-1]["message"] == "forward done"
+    assert lines[-2]["event"] == "reward" and lines[-2]["step"] == 99
+    assert lines[-2]["uid"] == 3 and lines[-2]["reward"] == 0.5 and lines[-2]["level"] == "EVENT"
+
+    # Oldest rotated events are dropped, the others are in order.
+    steps = [line["step"] for name in reversed(rotated) for line in read_lines(str(tmp_path / name))]
+    steps += [line["step"] for line in lines if "step" in line]
+    assert steps == list(range(100 - len(steps), 100))
+
+
+def test_full_queue_drops_events_without_blocking(tmp_path):
+    writer = EventsWriter(str(tmp_path / "events.jsonl"), max_bytes=0, queue_size=2)
+    for step in range(5):
+        writer.queue_handler.handle(record({"step": step}))
+    assert writer.dropped == 3
+
+    writer.start()
+    writer.stop()
+    assert [line["step"] for line in read_lines(str(tmp_path / "events.jsonl"))] == [0, 1]
+
+
+def test_log_event_is_a_no_op_without_events_logger(monkeypatch):
+    monkeypatch.setattr(events, "_events_writer", None)
+    events.log_event("reward", step=1)
@@ -0,0 +1,68 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from quant.validator import archive
+from quant.validator.archive import ForwardArchive, archive_files, load_bodies, load_forwards
+
+FORMATS = [False] + ([True] if archive.pa is not None else [])
+
+
+def record(forward_archive, step, uids):
+    forward_archive.record(
+        step=step,
+        block=1000 + step,
+        query_id=f"query-{step}",
+        uids=uids,
+        rewards=[uid / 10 for uid in uids],
+        latencies=[0.5] * (len(uids) - 1) + [None],
+        status_codes=[200] * (len(uids) - 1) + [None],
+        response_lengths=[len(f"answer {uid}") for uid in uids],
+        bodies=[f"answer {uid}" for uid in uids],
+    )
+
+
+@pytest.mark.parametrize("use_arrow", FORMATS)
+def test_forwards_are_archived_and_loaded(tmp_path, use_arrow):
+    directory = str(tmp_path / "forwards")
+    forward_archive = ForwardArchive(directory, keep_bodies=True, flush_rows=6, use_arrow=use_arrow)
+    forward_archive.start()
+    for step in range(5):
+        record(forward_archive, step, [1, 2, 3])
+    forward_archive.stop()
+
+    # Flushed every two forwards, then the rest on stop.
+    files = list(archive_files(directory))
+    assert len(files) == 3
+    assert all(f"date={datetime.datetime.now(datetime.timezone.utc).date()}" in path for path in files)
+
+    forwards = load_forwards(directory)
+    assert forwards["step"].tolist() == [step for step in range(5) for _ in range(3)]
+    assert forwards["block"][0] == 1000 and forwards["query_id"][-1] == "query-4"
+    np.testing.assert_allclose(forwards["reward"][:3], [0.1, 0.2, 0.3])
+    assert np.isnan(forwards["latency"][2]) and forwards["latency"][0] == 0.5
+    assert forwards["status_code"][:3].tolist() == [200, 200, -1]
+    assert forwards["response_length"][:3].tolist() == [8, 8, 8]
+
+    selected = load_forwards(directory, columns=["step", "reward"], uids=[2])
+    assert set(selected) == {"step", "reward"}
+    assert selected["step"].tolist() == list(range(5))
+
+    bodies = list(load_bodies(directory))
+    assert bodies[0] == {"step": 0, "uid": 1, "body": "answer 1"} and len(bodies) == 15
+
+
+def test_days_are_filtered_and_missing_archive_is_empty(tmp_path):
+    directory = str(tmp_path / "forwards")
+    assert load_forwards(directory)["uid"].size == 0
+
+    forward_archive = ForwardArchive(directory, use_arrow=False)
+    forward_archive.start()
+    record(forward_archive, 0, [1])
+    forward_archive.stop()
+
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    assert load_forwards(directory, start=today)["uid"].tolist() == [1]
+    assert load_forwards(directory, end=today - datetime.timedelta(days=1))["uid"].size == 0
+    assert list(load_bodies(directory)) == []
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from quant.api.gateway import GatewayOverloaded, QuantGateway
+from quant.protocol import QuantResponse
+
+
+class FakeAPI:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    def get_uids(self, k=3, exclude=None, order="stake"):
+        return list(range(k))
+
+    async def aquery(self, uids, query, userID, metadata, timeout=12.0):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        response = QuantResponse(
+            response=f"answer to {query}", signature=b"sig", proofs=[], metadata={}
+        )
+        return uids, [response, None]
+
+
+def test_identical_requests_are_coalesced():
+    api = FakeAPI()
+    gateway = QuantGateway(api, cache_ttl=0)
+
+    async def run():
+        return await asyncio.gather(
+            *(gateway.answer("Should i buy SOL?", "user") for _ in range(10))
+        )
+
+    results = asyncio.run(run())
+    assert api.calls == 1
+    assert sorted(r["outcome"] for r in results) == ["coalesced"] * 9 + ["miss"]
+    assert results[0]["responses"] == [
+        {"response": "answer to Should i buy SOL?", "signature": "736967", "metadata": {}}
+    ]
+
+
+def test_answers_are_served_from_cache():
+    api = FakeAPI(delay=0)
+    gateway = QuantGateway(api, cache_ttl=60)
+
+    async def run():
+        first = await gateway.answer("q", "user")
+        second = await gateway.answer("q", "user")
+        other_user = await gateway.answer("q", "other")
+        return first, second, other_user
+
+    first, second, other_user = asyncio.run(run())
+    assert (first["outcome"], second["outcome"], other_user["outcome"]) == ("miss", "hit", "miss")
+    assert api.calls == 2
+    assert gateway.stats()["hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_overloaded_gateway_rejects():
+    api = FakeAPI(delay=0.05)
+    gateway = QuantGateway(api, cache_ttl=0, max_inflight=1, max_waiting=1)
+
+    async def run():
+        return await asyncio.gather(
+            *(gateway.answer(f"q{i}", "user") for i in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert sum(isinstance(r, GatewayOverloaded) for r in results) == 1
+    assert gateway.stats()["counters"]["rejected"] == 1
+
+
+def test_followers_are_answered_when_the_leader_is_cancelled():
+    api = FakeAPI(delay=0.1)
+    gateway = QuantGateway(api, cache_ttl=60)
+
+    async def run():
+        leader = asyncio.ensure_future(gateway.answer("q", "user"))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.ensure_future(gateway.answer("q", "user")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results, await gateway.answer("q", "user")
+
+    results, cached = asyncio.run(run())
+    assert [r["outcome"] for r in results] == ["coalesced"] * 3
+    assert all(r["responses"][0]["response"] == "answer to q" for r in results)
+    assert cached["outcome"] == "hit"
+    assert api.calls == 1 and gateway.stats()["inflight"] == 0
+
+
+def test_failed_fan_out_reaches_followers():
+    class FailingAPI(FakeAPI):
+        async def aquery(self, *args, **kwargs):
+            await asyncio.sleep(self.delay)
+            raise RuntimeError("network down")
+
+    gateway = QuantGateway(FailingAPI(), cache_ttl=60)
+
+    async def run():
+        return await asyncio.gather(*(gateway.answer("q", "user") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert gateway.stats()["counters"]["error"] == 3
@@ -0,0 +1,160 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from neurons.miner import PRIORITY, Miner
+from quant.utils.uids import HotkeyIndex
+
+
+class FakeMetagraph:
+    def __init__(self, hotkeys, stakes, permits):
+        self.hotkeys = list(hotkeys)
+        self.S = np.asarray(stakes, dtype=np.float32)
+        self.validator_permit = np.asarray(permits, dtype=bool)
+        self.next = None
+        self.syncs = 0
+
+    def sync(self, subtensor=None):
+        """Take the state of `next`, as a resync would."""
+        self.syncs += 1
+        if self.next is not None:
+            self.hotkeys, self.S, self.validator_permit = self.next.hotkeys, self.next.S, self.next.validator_permit
+
+
+def make_miner(metagraph, force_validator_permit=True, allow_non_registered=False):
+    # Only the state the request vetting and the resync use, without connecting to a chain.
+    miner = Miner.__new__(Miner)
+    miner.metagraph = metagraph
+    miner.subtensor = None
+    miner.wallet = SimpleNamespace(hotkey=SimpleNamespace(ss58_address="miner"))
+    miner.config = SimpleNamespace(
+        mock=True,
+        blacklist=SimpleNamespace(
+            force_validator_permit=force_validator_permit,
+            allow_non_registered=allow_non_registered,
+        ),
+        neuron=SimpleNamespace(metagraph_snapshot_off=True),
+    )
+    miner.hotkey_index = HotkeyIndex(metagraph)
+    return miner
+
+
+def request(hotkey):
+    return SimpleNamespace(dendrite=SimpleNamespace(hotkey=hotkey))
+
+
+def metagraph():
+    return FakeMetagraph(["miner", "validator", "other"], [0.0, 1000.0, 5.0], [False, True, False])
+
+
+def test_index_lookups():
+    index = HotkeyIndex(metagraph())
+    assert len(index) == 3
+    assert "validator" in index and "stranger" not in index
+    assert index.uid("validator") == 1 and index.uid("stranger") is None
+    assert index.has_validator_permit(1) and not index.has_validator_permit(2)
+    assert index.stake_of(1) == 1000.0
+
+
+def test_decisions_are_memoized_for_registered_callers():
+    miner = make_miner(metagraph())
+
+    async def run():
+        return [await miner.blacklist(request(hotkey)) for hotkey in ("validator", "other", "validator")]
+
+    assert asyncio.run(run()) == [
+        (False, "Hotkey recognized!"),
+        (True, "Non-validator hotkey"),
+        (False, "Hotkey recognized!"),
+    ]
+    assert miner.hotkey_index.blacklist == {
+        "validator": (False, "Hotkey recognized!"),
+        "other": (True, "Non-validator hotkey"),
+    }
+    assert asyncio.run(miner.priority(request("validator"))) == 1000.0
+    assert miner.hotkey_index.priority == {"validator": 1000.0}
+
+    # A memoized decision is served as is.
+    miner.hotkey_index.priority["validator"] = 7.0
+    assert asyncio.run(miner.priority(request("validator"))) == 7.0
+
+
+def test_only_the_axon_lookup_is_counted():
+    miner = make_miner(metagraph())
+    computed, memoized = PRIORITY.value(lookup="computed"), PRIORITY.value(lookup="memoized")
+    assert asyncio.run(miner.priority(request("validator"))) == 1000.0
+    # forward() reads the priority the axon already looked up, without counting it again.
+    assert miner._priority_of(request("validator")) == (1000.0, "memoized")
+    assert PRIORITY.value(lookup="computed") == computed + 1
+    assert PRIORITY.value(lookup="memoized") == memoized
+
+
+@pytest.mark.parametrize("allow_non_registered,force_validator_permit,expected", [
+    (False, False, (True, "Unrecognized hotkey")),
+    (True, True, (True, "Non-validator hotkey")),
+    (True, False, (False, "Hotkey allowed")),
+])
+def test_unregistered_callers_are_not_memoized(allow_non_registered, force_validator_permit, expected):
+    miner = make_miner(metagraph(), force_validator_permit, allow_non_registered)
+    assert asyncio.run(miner.blacklist(request("stranger"))) == expected
+    assert asyncio.run(miner.priority(request("stranger"))) == 0.0
+    # Arbitrary callers must not grow the memo.
+    assert miner.hotkey_index.blacklist == {} and miner.hotkey_index.priority == {}
+
+
+def test_missing_hotkey():
+    miner = make_miner(metagraph())
+    assert asyncio.run(miner.blacklist(SimpleNamespace(dendrite=None))) == (True, "Missing dendrite or hotkey")
+    assert asyncio.run(miner.priority(SimpleNamespace(dendrite=None, axon_info=None))) == 0.0
+
+
+def test_resync_drops_memoized_decisions():
+    graph = metagraph()
+    miner = make_miner(graph)
+    assert asyncio.run(miner.priority(request("validator"))) == 1000.0
+    assert asyncio.run(miner.blacklist(request("other")))[0]
+
+    # "validator" lost stake and its permit, "other" gained both.
+    graph.next = FakeMetagraph(["miner", "validator", "other"], [0.0, 10.0, 2000.0], [False, False, True])
+    miner.resync_metagraph()
+    assert graph.syncs == 1
+
+    assert asyncio.run(miner.priority(request("validator"))) == 10.0
+    assert asyncio.run(miner.priority(request("other"))) == 2000.0
+    assert asyncio.run(miner.blacklist(request("validator"))) == (True, "Non-validator hotkey")
+    assert asyncio.run(miner.blacklist(request("other"))) == (False, "Hotkey recognized!")
+
+
+def test_metagraph_update_swaps_the_index_at_once():
+    graph = metagraph()
+    miner = make_miner(graph)
+    old = miner.hotkey_index
+    asyncio.run(miner.priority(request("validator")))
+
+    # A hotkey deregistered and its UID taken by a new one.
+    graph.hotkeys = ["miner", "newcomer", "other"]
+    graph.S = np.asarray([0.0, 3.0, 5.0], dtype=np.float32)
+    miner.metagraph_updated()
+
+    new = miner.hotkey_index
+    assert new is not old
+    assert new.uid("newcomer") == 1 and new.uid("validator") is None
+    assert new.priority == {} and new.blacklist == {}
+    assert miner.uid == 0
+    # A request holding the previous snapshot keeps seeing it whole.
+    assert old.uid("validator") == 1 and old.stake_of(1) == 1000.0 and old.priority == {"validator": 1000.0}
+
+    assert asyncio.run(miner.priority(request("validator"))) == 0.0
+    assert asyncio.run(miner.blacklist(request("validator"))) == (True, "Unrecognized hotkey")
+
+
+def test_failed_rebuild_keeps_the_previous_index():
+    graph = metagraph()
+    miner = make_miner(graph)
+    old = miner.hotkey_index
+    graph.S = ["not a stake"]
+    with pytest.raises(ValueError):
+        miner.metagraph_updated()
+    assert miner.hotkey_index is old
@@ -0,0 +1,106 @@
+import types
+import concurrent.futures
+
+import numpy as np
+import bittensor as bt
+
+from quant.utils.metagraph_snapshot import load_metagraph_snapshot, metagraph_diff, save_metagraph_snapshot
+
+ENDPOINT = "ws://127.0.0.1:9944"
+
+
+def axon(hotkey, ip="1.2.3.4", port=8091):
+    return bt.AxonInfo(
+        version=1, ip=ip, port=port, ip_type=4, hotkey=hotkey, coldkey="coldkey",
+        protocol=4, placeholder1=0, placeholder2=0,
+    )
+
+
+def metagraph(axons, block=100):
+    metagraph = bt.metagraph(netuid=2, network=ENDPOINT, sync=False)
+    n = len(axons)
+    metagraph.axons = axons
+    metagraph.n = np.array([n])
+    metagraph.block = np.array([block])
+    metagraph.uids = np.arange(n)
+    metagraph.stake = metagraph.alpha_stake = metagraph.total_stake = np.arange(n, dtype=np.float32) * 10
+    metagraph.tao_stake = np.zeros(n, dtype=np.float32)
+    metagraph.validator_permit = np.arange(n) % 2 == 0
+    metagraph.last_update = np.full(n, block - 5)
+    return metagraph
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "metagraph.npz")
+    saved = metagraph([axon(f"hotkey-{uid}") for uid in range(4)])
+    save_metagraph_snapshot(saved, path, ENDPOINT)
+
+    loaded = load_metagraph_snapshot(path, 2, ENDPOINT, max_age=60)
+    assert loaded.hotkeys == saved.hotkeys
+    assert loaded.axons == saved.axons
+    assert int(loaded.n[0]) == 4 and int(loaded.block[0]) == 100
+    np.testing.assert_array_equal(loaded.S, saved.S)
+    np.testing.assert_array_equal(loaded.validator_permit, saved.validator_permit)
+    np.testing.assert_array_equal(loaded.last_update, saved.last_update)
+
+
+def test_unusable_snapshots_are_ignored(tmp_path):
+    path = str(tmp_path / "metagraph.npz")
+    assert load_metagraph_snapshot(path, 2, ENDPOINT, max_age=60) is None
+
+    save_metagraph_snapshot(metagraph([axon("hotkey")]), path, ENDPOINT)
+    assert load_metagraph_snapshot(path, 3, ENDPOINT, max_age=60) is None
+    assert load_metagraph_snapshot(path, 2, "ws://elsewhere:9944", max_age=60) is None
+    assert load_metagraph_snapshot(path, 2, ENDPOINT, max_age=0) is None
+
+    with open(path, "wb") as f:
+        f.write(b"truncated")
+    assert load_metagraph_snapshot(path, 2, ENDPOINT, max_age=60) is None
+
+
+def test_diff():
+    before = metagraph([axon("a"), axon("b"), axon("c")])
+    after = metagraph([axon("a"), axon("x"), axon("c", port=9000), axon("d")])
+    diff = metagraph_diff(before, after)
+    assert (diff.replaced, diff.added, diff.axons) == ([1], [3], [2])
+    assert not metagraph_diff(before, before)
+
+
+def test_fresh_metagraph_is_swapped_in_once_fetched():
+    from quant.base.neuron import BaseNeuron
+
+    updates = []
+    neuron = types.SimpleNamespace(
+        metagraph=metagraph([axon("a")]),
+        metagraph_refresh=concurrent.futures.Future(),
+        metagraph_updated=updates.append,
+    )
+    assert BaseNeuron.apply_metagraph_refresh(neuron)
+
+    fresh = metagraph([axon("a"), axon("b")], block=200)
+    neuron.metagraph_refresh.set_result(fresh)
+    snapshot = neuron.metagraph
+    assert not BaseNeuron.apply_metagraph_refresh(neuron)
+    assert neuron.metagraph is fresh and neuron.metagraph_refresh is None
+    assert updates == [snapshot]
+    assert not BaseNeuron.apply_metagraph_refresh(neuron)
+
+
+def test_validator_update_without_the_previous_metagraph():
+    from quant.base.validator import BaseValidatorNeuron
+
+    class Validator(BaseValidatorNeuron):
+        async def forward(self):
+            pass
+
+    validator = Validator.__new__(Validator)
+    validator.metagraph = metagraph([axon("v"), axon("x"), axon("c")])
+    validator.wallet = types.SimpleNamespace(hotkey=types.SimpleNamespace(ss58_address="v"))
+    validator.config = types.SimpleNamespace(mock=True)
+    validator.hotkeys = ["v", "b"]
+    validator.scores = np.array([1.0, 2.0])
+
+    # Every UID is checked: the replaced hotkey is reset and the new UID gets a score.
+    validator.metagraph_updated()
+    assert validator.hotkeys == ["v", "x", "c"]
+    np.testing.assert_array_equal(validator.scores, [1.0, 0.0, 0.0])
@@ -0,0 +1,60 @@
+import urllib.request
+
+import pytest
+
+from quant.utils.metrics import MetricsRegistry, _Metric, start_metrics_server
+
+
+def test_counter_and_gauge():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("outcome",))
+    requests.inc(outcome="ok")
+    requests.inc(2, outcome="ok")
+    requests.inc(outcome="error")
+    assert requests.value(outcome="ok") == 3
+    # The same name returns the same metric.
+    assert registry.counter("requests_total", "Requests.", ("outcome",)) is requests
+
+    depth = registry.gauge("queue_depth", "Queue depth.")
+    depth.set_function(lambda: 7)
+    assert depth.value() == 7
+
+    with pytest.raises(ValueError):
+        requests.inc(result="ok")
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests.")
+
+
+def test_metric_types_must_define_samples():
+    class Untyped(_Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Untyped("untyped", "No samples.")
+
+
+def test_histogram_render():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_count 4" in lines
+    assert latency.to_dict()["buckets"] == {"le_0.1": 1, "le_1.0": 2, "le_inf": 1}
+
+
+def test_metrics_server():
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits.").inc()
+    server = start_metrics_server(0, registry=registry)
+    try:
+        port = server.server_address[1]
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode()
+        assert "hits_total 1.0" in body
+    finally:
+        server.shutdown()
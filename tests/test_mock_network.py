@@ -0,0 +1,22 @@
+import bittensor as bt
+from bittensor_wallet.mock import get_mock_wallet
+
+from quant.mock import MockDendrite, MockMetagraph, MockSubtensor
+
+
+def test_mock_network_registers_the_wallet_and_miners():
+    bt.MockSubtensor().reset()
+    wallet = get_mock_wallet()
+    subtensor = MockSubtensor(netuid=1, n=4, wallet=wallet)
+    assert subtensor.subnet_exists(1) and not subtensor.subnet_exists(2)
+    assert subtensor.is_hotkey_registered(netuid=1, hotkey_ss58=wallet.hotkey.ss58_address)
+
+    metagraph = MockMetagraph(netuid=1, subtensor=subtensor)
+    assert metagraph.n == 5 and len(metagraph.S) == 5
+    assert metagraph.hotkeys[0] == wallet.hotkey.ss58_address
+    assert metagraph.hotkeys[1:] == [f"miner-hotkey-{i}" for i in range(1, 5)]
+    assert all(axon.port == 8091 for axon in metagraph.axons)
+
+    # Serving and the dendrite stay offline.
+    assert subtensor.serve_axon(netuid=1, axon=None)
+    assert MockDendrite(wallet).external_ip == "127.0.0.1"
@@ -0,0 +1,165 @@
+import time
+import asyncio
+
+from quant.miner.cache import AnswerCache
+from quant.miner.prewarm import PrewarmScheduler, parse_user_ids
+from quant.protocol import QuantQuery, QuantResponse
+from quant.utils.questions import default_user_id, question_categories, validator_query_metadata
+
+# Only trading and investment answers are cached, the other categories are never warmed.
+TTLS = {"trading": 60.0, "investment": 100.0, "other": 0.0}
+TRADING = question_categories["trading"]
+INVESTMENT = question_categories["investment"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeAgent:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.inflight = 0
+        self.max_inflight = 0
+        self.closed = False
+
+    async def query(self, query):
+        self.calls += 1
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.inflight -= 1
+        return QuantResponse(response=query.query, signature=b"", proofs=[], metadata={})
+
+    async def aclose(self):
+        self.closed = True
+
+
+def answer(text):
+    return QuantResponse(response=text, signature=b"", proofs=[], metadata={})
+
+
+def make_scheduler(cache, agent, **kwargs):
+    kwargs.setdefault("poll_interval", 0.01)
+    kwargs.setdefault("load", lambda: 0.0)
+    return PrewarmScheduler(cache, agent, user_ids=["wallet"], **kwargs)
+
+
+def test_parse_user_ids(monkeypatch):
+    monkeypatch.delenv("SOLANA_WALLET", raising=False)
+    assert parse_user_ids(None) == [default_user_id]
+    assert parse_user_ids(" a, ,b ") == ["a", "b"]
+    monkeypatch.setenv("SOLANA_WALLET", "mine")
+    assert parse_user_ids("") == ["mine"]
+
+
+def test_queries_share_the_cache_keys_of_validator_queries():
+    scheduler = make_scheduler(AnswerCache(), FakeAgent())
+    queries = scheduler.queries()
+    assert len(queries) == sum(len(category) for category in question_categories.values())
+
+    # What quant/validator/forward.py sends: validator_id is not part of the cache key.
+    sent = QuantQuery(
+        query=queries[0].query,
+        userID="wallet",
+        metadata={**validator_query_metadata, "validator_id": "hotkey"},
+    )
+    assert AnswerCache.key(sent) == AnswerCache.key(queries[0])
+
+    # Every query gets its own metadata, the shared defaults are never mutated.
+    queries[0].metadata["Type"] = "changed"
+    assert validator_query_metadata == {"Create_Proof": "True", "Type": "Validator_Test"}
+    assert queries[1].metadata == validator_query_metadata
+
+
+def test_due_is_stalest_first():
+    clock = FakeClock()
+    cache = AnswerCache(category_ttls=dict(TTLS), clock=clock)
+    scheduler = make_scheduler(cache, FakeAgent(), refresh_ahead=0.8)
+    by_text = {query.query: query for query in scheduler.queries()}
+
+    for text in TRADING + INVESTMENT[1:]:
+        cache.put(by_text[text], answer(text))
+    clock.now = 50.0
+    cache.put(by_text[TRADING[0]], answer(TRADING[0]))
+
+    # Missing answer first, then trading at 85/60 of its TTL, then investment at 85/100.
+    # The trading answer refreshed at 50 is at 35/60, below refresh_ahead.
+    clock.now = 85.0
+    due = [query.query for query in scheduler.due()]
+    assert due == [INVESTMENT[0]] + TRADING[1:] + INVESTMENT[1:]
+
+    clock.now = 40.0
+    assert [query.query for query in scheduler.due()] == [INVESTMENT[0]]
+
+
+def test_warming_backs_off_while_busy_or_loaded():
+    agent = FakeAgent(delay=0.01)
+    cache = AnswerCache(category_ttls={"trading": 60.0, "other": 0.0}, clock=FakeClock())
+    state = {"busy": True, "load": 0.0}
+    scheduler = make_scheduler(
+        cache, agent, concurrency=2, max_load=0.75,
+        is_busy=lambda: state["busy"], load=lambda: state["load"],
+    )
+
+    async def run():
+        task = asyncio.ensure_future(scheduler.run_once())
+        await asyncio.sleep(0.05)
+        busy_calls = agent.calls
+        state.update(busy=False, load=2.0)
+        await asyncio.sleep(0.05)
+        loaded_calls = agent.calls
+        state["load"] = 0.5
+        return busy_calls, loaded_calls, await task
+
+    busy_calls, loaded_calls, due = asyncio.run(run())
+    assert busy_calls == loaded_calls == 0
+    assert due == agent.calls == len(TRADING)
+    assert agent.max_inflight == 2
+    assert all(entry["ok"] for entry in scheduler.freshness.values())
+    assert scheduler.due() == []
+
+
+def test_stop_while_backing_off_skips_the_agent():
+    agent = FakeAgent()
+    cache = AnswerCache(category_ttls={"trading": 60.0, "other": 0.0}, clock=FakeClock())
+    scheduler = make_scheduler(cache, agent, is_busy=lambda: True)
+
+    async def run():
+        task = asyncio.ensure_future(scheduler.run_once())
+        await asyncio.sleep(0.03)
+        scheduler.should_exit = True
+        return await task
+
+    assert asyncio.run(run()) == len(TRADING)
+    assert agent.calls == 0 and scheduler.freshness == {}
+
+
+def test_start_and_stop_the_background_thread():
+    agent = FakeAgent()
+    cache = AnswerCache(category_ttls={"trading": 60.0, "other": 0.0}, clock=FakeClock())
+    scheduler = make_scheduler(cache, agent, interval=0.05)
+
+    scheduler.start()
+    thread = scheduler.thread
+    scheduler.start()
+    assert scheduler.thread is thread and thread.name == "prewarm"
+
+    deadline = time.monotonic() + 5
+    while agent.calls < len(TRADING) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert agent.calls == len(TRADING)
+    assert thread.is_alive()
+
+    scheduler.stop()
+    assert not thread.is_alive() and scheduler.thread is None
+    # The client is closed on the scheduler's own event loop, and nothing was warmed twice.
+    assert agent.closed
+    assert agent.calls == len(TRADING)
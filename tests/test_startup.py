@@ -0,0 +1,45 @@
+import json
+import types
+
+from quant.utils.startup import StartupProfiler, write_startup_report
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_phases_are_timed_from_the_process_start():
+    clock = FakeClock()
+    profiler = StartupProfiler(clock=clock, age=2.0)
+    with profiler.phase("neuron"):
+        clock.now += 1
+        with profiler.phase("metagraph"):
+            clock.now += 3
+    profiler.record("start", clock.now - 0.5)
+
+    report = profiler.report()
+    assert report["total"] == 6.0
+    assert [(p["name"], p["start"], p["duration"], p["depth"]) for p in report["phases"]] == [
+        ("neuron", 2.0, 4.0, 0),
+        ("metagraph", 3.0, 3.0, 1),
+        ("start", 5.5, 0.5, 0),
+    ]
+
+
+def test_report_is_written_only_when_profiling(tmp_path):
+    profiler = StartupProfiler(age=0.0)
+    with profiler.phase("config"):
+        pass
+    config = types.SimpleNamespace(
+        neuron=types.SimpleNamespace(profile_startup=False, profile_startup_path=None, full_path=str(tmp_path))
+    )
+    assert write_startup_report(config, profiler) is None
+
+    config.neuron.profile_startup = True
+    path = write_startup_report(config, profiler)
+    with open(path) as f:
+        assert [phase["name"] for phase in json.load(f)["phases"]] == ["config"]
@@ -0,0 +1,55 @@
+import asyncio
+
+from quant.protocol import (
+    QuantQuery,
+    QuantResponse,
+    QuantStreamingSynapse,
+    encode_stream_chunk,
+    encode_stream_final,
+)
+
+
+class FakeContent:
+    def __init__(self, body, size):
+        self.body = body
+        self.size = size
+
+    async def iter_any(self):
+        for i in range(0, len(self.body), self.size):
+            yield self.body[i : i + self.size]
+
+
+class FakeResponse:
+    def __init__(self, body, size=7):
+        self.content = FakeContent(body, size)
+
+
+def consume(synapse, body, size=7):
+    async def run():
+        return [text async for text in synapse.process_streaming_response(FakeResponse(body, size))]
+
+    return asyncio.run(run())
+
+
+def make_synapse():
+    return QuantStreamingSynapse(query=QuantQuery(query="q", userID="u", metadata={}))
+
+
+def test_chunks_and_final_response_round_trip():
+    response = QuantResponse(
+        response="Buy\nSOL", signature=b"\x00sig", proofs=[b"p1"], metadata={"miner_id": "m"}
+    )
+    body = encode_stream_chunk("Buy\n") + encode_stream_chunk("SOL") + encode_stream_final(response)
+    synapse = make_synapse()
+
+    # Events are split across network reads at arbitrary offsets.
+    assert consume(synapse, body, size=5) == ["Buy\n", "SOL"]
+    assert synapse.completion == "Buy\nSOL"
+    assert synapse.deserialize() == response
+
+
+def test_truncated_stream_keeps_partial_answer():
+    synapse = make_synapse()
+    consume(synapse, encode_stream_chunk("partial") + b'{"type": "fin')
+    assert synapse.response is None
+    assert synapse.deserialize().response == "partial"
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from quant.api.quantapi import QuantAPI
+from quant.api.uid_index import UIDRankingIndex
+
+
+def make_metagraph(stakes, invalid=()):
+    axons = [
+        SimpleNamespace(ip="0.0.0.0" if uid in invalid else "1.2.3.4", port=8091)
+        for uid in range(len(stakes))
+    ]
+    for uid in invalid:
+        axons[uid].port = 0
+    n = len(stakes)
+    return SimpleNamespace(
+        axons=axons,
+        S=np.asarray(stakes, dtype=np.float32),
+        I=np.arange(n, dtype=np.float32),
+        Tv=np.zeros(n, dtype=np.float32),
+    )
+
+
+def build_index(metagraph):
+    index = UIDRankingIndex()
+    index.rebuild(metagraph, QuantAPI(wallet=None)._is_axon_valid)
+    return index
+
+
+def test_top_k_by_stake():
+    index = build_index(make_metagraph([5, 50, 1, 20, 30], invalid=(4,)))
+    assert len(index) == 4
+    assert index.top_k(2) == [1, 3]
+    assert index.top_k(10) == [1, 3, 0, 2]
+
+
+def test_top_k_with_exclude():
+    index = build_index(make_metagraph([5, 50, 1, 20, 30]))
+    assert index.top_k(2, exclude=[1, 4]) == [3, 0]
+    assert index.top_k(3, exclude={0, 1, 2, 3, 4}) == []
+
+
+def test_alternate_orderings():
+    index = build_index(make_metagraph([5, 50, 1, 20]))
+    assert index.top_k(2, order="incentive") == [3, 2]
+    # Ties keep the lowest UIDs first.
+    assert index.top_k(2, order="validator_trust") == [0, 1]
+    with pytest.raises(ValueError):
+        index.top_k(1, order="unknown")
+
+
+def test_latency_ordering_puts_unobserved_last():
+    index = build_index(make_metagraph([5, 50, 1, 20]))
+    index.record_latency(2, 0.5)
+    index.record_latency(0, 0.1)
+    assert index.top_k(4, order="latency") == [0, 2, 1, 3]
+    index.record_latency(0, 10.0)
+    assert index.top_k(2, order="latency") == [2, 0]
+
+
+def test_get_uids_uses_index():
+    api = QuantAPI(wallet=None)
+    api.metagraph = make_metagraph([5, 50, 1, 20])
+    assert api.get_uids(k=2) == [1, 3]
+    assert api.get_uids(k=2, exclude=[1]) == [3, 0]